@@ -0,0 +1,134 @@
+"""
+Temporal smoothing of per-frame fire verdicts
+
+A single bright frame (a flicker, a reflection) should not cost a GCS
+upload, a Firestore event and a push notification, and a real fire should
+not produce one of each every frame. AlertSmoother turns a camera's stream
+of (fire_detected, confidence) verdicts into an alarm state with
+hysteresis, and reports only the transitions:
+
+- "ema": exponential moving average of confidence; the alarm is raised when
+  the average reaches on_threshold and cleared when it falls below
+  off_threshold.
+- "kofn": the alarm is raised when at least k of the last n frames were fire
+  and cleared when at most clear_k of the last n were.
+"""
+
+from collections import deque
+from typing import Optional, Tuple
+
+RAISED = "raised"
+CLEARED = "cleared"
+
+MODES = ("ema", "kofn")
+
+
+class AlertSmoother:
+    def __init__(
+        self,
+        mode: str = "ema",
+        alpha: float = 0.4,
+        on_threshold: float = 0.5,
+        off_threshold: float = 0.2,
+        k: int = 3,
+        n: int = 5,
+        clear_k: int = 0
+    ):
+        """
+        Initialize the smoother for one camera
+
+        Args:
+            mode: "ema" or "kofn"
+            alpha: EMA weight of the newest frame (0-1)
+            on_threshold: EMA value that raises the alarm
+            off_threshold: EMA value below which the alarm clears (<= on_threshold)
+            k: Fire frames among the last n that raise the alarm
+            n: k-of-n window length in frames
+            clear_k: The alarm clears once the window has at most this many fire frames
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown smoothing mode '{mode}'. Choose from: {', '.join(MODES)}")
+        if off_threshold > on_threshold:
+            raise ValueError("off_threshold must not exceed on_threshold")
+        if not 0 <= clear_k < k <= n:
+            raise ValueError("k-of-n needs 0 <= clear_k < k <= n")
+
+        self.mode = mode
+        self.alpha = alpha
+        self.on_threshold = on_threshold
+        self.off_threshold = off_threshold
+        self.k = k
+        self.clear_k = clear_k
+
+        self.alarm = False
+        self.score = 0.0
+        self.peak_confidence = 0.0     # Highest confidence since the alarm was raised
+        self._window = deque(maxlen=n)
+
+        self.frames = 0
+        self.fire_frames = 0
+        self.raised = 0
+        self.cleared = 0
+
+    def update(self, fire_detected: bool, confidence: float) -> Optional[str]:
+        """
+        Feed one frame's verdict
+
+        Returns:
+            RAISED or CLEARED when the alarm state changes, otherwise None
+        """
+        self.frames += 1
+        if fire_detected:
+            self.fire_frames += 1
+
+        if self.mode == "ema":
+            self.score = self.alpha * (confidence if fire_detected else 0.0) + (1 - self.alpha) * self.score
+            raise_alarm = self.score >= self.on_threshold
+            clear_alarm = self.score < self.off_threshold
+        else:
+            self._window.append(bool(fire_detected))
+            positives = sum(self._window)
+            self.score = positives / self._window.maxlen
+            raise_alarm = positives >= self.k
+            clear_alarm = positives <= self.clear_k
+
+        if self.alarm:
+            self.peak_confidence = max(self.peak_confidence, confidence if fire_detected else 0.0)
+
+        if not self.alarm and raise_alarm:
+            self.alarm = True
+            self.peak_confidence = confidence if fire_detected else 0.0
+            self.raised += 1
+            return RAISED
+        if self.alarm and clear_alarm:
+            self.alarm = False
+            self.cleared += 1
+            return CLEARED
+        return None
+
+    def metrics(self) -> dict:
+        return {
+            "frames": self.frames,
+            "fire_frames": self.fire_frames,
+            "raised": self.raised,
+            "cleared": self.cleared,
+            # Fire frames that did not each turn into an upload + event
+            "suppressed": self.fire_frames - self.raised,
+            "alarm": self.alarm,
+        }
+
+
+def replay(verdicts, **params) -> Tuple[list, AlertSmoother]:
+    """
+    Run a recorded sequence of (fire_detected, confidence) through a smoother
+
+    Returns:
+        ([(frame_index, transition), ...], smoother)
+    """
+    smoother = AlertSmoother(**params)
+    transitions = []
+    for index, (fire_detected, confidence) in enumerate(verdicts):
+        transition = smoother.update(fire_detected, confidence)
+        if transition:
+            transitions.append((index, transition))
+    return transitions, smoother
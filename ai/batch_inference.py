@@ -0,0 +1,139 @@
+"""
+Batching inference stage for the fire detection system
+
+Collects frames submitted from the capture loop and runs them through the
+model as one batch. A batch is flushed when it reaches max_batch_size or when
+the oldest frame has waited max_wait seconds, whichever comes first. Every
+submit() returns a Future that resolves to that frame's own result.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+_STOP = object()
+
+
+class FrameBatcher:
+    def __init__(
+        self,
+        infer_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait: float = 0.05,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            infer_batch: Runs the model on a list of frames, returning one result per frame
+            max_batch_size: Flush as soon as this many frames are waiting
+            max_wait: Flush after the first frame of a batch has waited this long (seconds)
+            max_pending: Max queued frames before submit() blocks (default: 4 batches)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.infer_batch = infer_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending = queue.Queue(maxsize=max_pending or 4 * max_batch_size)
+        self._thread: Optional[threading.Thread] = None
+
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.frames = 0
+        self.errors = 0
+        self.last_batch_size = 0
+        self.last_batch_time = 0.0
+
+    def start(self):
+        """Start the background batching thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="batcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Flush whatever is queued and stop the batching thread"""
+        if self._thread is not None:
+            self._pending.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, frame: Any) -> Future:
+        """Queue a frame for the next batch; blocks while the queue is full"""
+        future = Future()
+        self._pending.put((frame, future))
+        return future
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._pending.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        """Run one batch and resolve each frame's future with its own result"""
+        frames = [frame for frame, _ in batch]
+        futures = [future for _, future in batch]
+
+        started = time.monotonic()
+        try:
+            results = self.infer_batch(frames)
+            if len(results) != len(frames):
+                raise RuntimeError(f"Expected {len(frames)} results, got {len(results)}")
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            for future in futures:
+                future.set_exception(e)
+            return
+        finally:
+            with self._lock:
+                self.batches += 1
+                self.frames += len(frames)
+                self.last_batch_size = len(frames)
+                self.last_batch_time = time.monotonic() - started
+
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+    def metrics(self) -> dict:
+        """Batch counters and the number of frames waiting"""
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "frames": self.frames,
+                "errors": self.errors,
+                "avg_batch_size": round(self.frames / self.batches, 2) if self.batches else 0.0,
+                "last_batch_size": self.last_batch_size,
+                "last_batch_ms": round(self.last_batch_time * 1000, 1),
+                "pending": self._pending.qsize(),
+            }
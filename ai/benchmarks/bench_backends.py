@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: inference backends (PyTorch, ONNX Runtime, OpenVINO, TorchScript)
+
+Runs the same image set through detect_fire_yolo on each backend and reports
+per-frame latency plus agreement with the PyTorch results (same fire verdict,
+mean absolute confidence difference). Exports are cached next to the model,
+so only the first run pays the export cost.
+
+Usage:
+    python benchmarks/bench_backends.py [--images <dir>] [--backends torch,onnx,openvino,torchscript]
+                                        [--imgsz 640] [--repeat 3] [--json]
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+from common import make_test_image, print_report, summarize_ms
+
+import yolo_fire_wrapper
+from image_decode import load_image
+
+
+def load_image_set(args):
+    """Decoded frames from --images, or a small synthetic fire/clear set"""
+    if args.images:
+        paths = sorted(
+            p for p in Path(args.images).iterdir()
+            if p.suffix.lower() in (".jpg", ".jpeg", ".png")
+        )
+    else:
+        paths = [make_test_image(fire=i % 2 == 0, size=(640 + 64 * i, 480 + 48 * i)) for i in range(6)]
+    return [(str(p), load_image(str(p))) for p in paths]
+
+
+def run_backend(backend: str, images, args):
+    """Latency samples and per-image results for one backend"""
+    detect = lambda frame: yolo_fire_wrapper.detect_fire_yolo(
+        frame, args.model, args.conf, backend=backend, imgsz=args.imgsz
+    )
+    
+    # First call loads (and if needed exports) the model
+    start = time.perf_counter()
+    detect(images[0][1])
+    load_time = time.perf_counter() - start
+    
+    samples = []
+    results = {}
+    for _ in range(args.repeat):
+        for path, frame in images:
+            t0 = time.perf_counter()
+            results[path] = detect(frame)
+            samples.append(time.perf_counter() - t0)
+    return load_time, samples, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare YOLO inference backends on CPU")
+    parser.add_argument("--images", default=None, help="Directory of JPEG/PNG frames")
+    parser.add_argument("--backends", default="torch,onnx,openvino,torchscript", help="Comma-separated backends")
+    parser.add_argument("--model", default=None, help="Path to YOLO model file")
+    parser.add_argument("--conf", type=float, default=0.5, help="Confidence threshold")
+    parser.add_argument("--imgsz", type=int, default=640, help="Model input resolution")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the image set")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    if not yolo_fire_wrapper.YOLO_AVAILABLE:
+        print("YOLO not installed. Run: pip install ultralytics", file=sys.stderr)
+        sys.exit(1)
+    
+    images = load_image_set(args)
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if "torch" not in backends:
+        backends.insert(0, "torch")  # Reference for agreement
+    
+    report = {"images": len(images), "imgsz": args.imgsz, "backends": {}}
+    reference = None
+    for backend in backends:
+        try:
+            load_time, samples, results = run_backend(backend, images, args)
+        except Exception as e:
+            report["backends"][backend] = {"error": str(e)}
+            continue
+        
+        entry = {"load_ms": round(load_time * 1000, 1), "latency": summarize_ms(samples)}
+        if backend == "torch":
+            reference = results
+        elif reference:
+            agree = sum(results[p]["fire"] == reference[p]["fire"] for p in reference)
+            conf_diff = sum(abs(results[p]["confidence"] - reference[p]["confidence"]) for p in reference)
+            entry["verdict_agreement"] = round(agree / len(reference), 3)
+            entry["mean_conf_diff"] = round(conf_diff / len(reference), 4)
+        report["backends"][backend] = entry
+    
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
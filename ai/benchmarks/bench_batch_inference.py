@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batched YOLO inference on CPU
+
+Pushes the same set of frames through FrameBatcher + detect_fire_yolo_batch
+at several batch sizes and reports throughput and per-frame latency
+(submit to result) for each size.
+
+Usage:
+    python benchmarks/bench_batch_inference.py [--frames 64] [--batch-sizes 1,2,4,8,16] [--json]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# CPU-only hosts are the target; hide any GPU before torch is imported
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+from common import make_test_image, print_report, summarize_ms
+
+import yolo_fire_wrapper
+from batch_inference import FrameBatcher
+from image_decode import load_image
+
+
+def run_sweep_point(frames, batch_size: int, args) -> dict:
+    """Time all frames through a batcher of the given size"""
+    infer = lambda batch: yolo_fire_wrapper.detect_fire_yolo_batch(batch, args.model, args.conf)
+    submitted = {}
+    latencies = []
+    
+    with FrameBatcher(infer, max_batch_size=batch_size, max_wait=args.max_wait,
+                      max_pending=len(frames)) as batcher:
+        start = time.perf_counter()
+        futures = []
+        for frame in frames:
+            future = batcher.submit(frame)
+            submitted[future] = time.perf_counter()
+            future.add_done_callback(
+                lambda f: latencies.append(time.perf_counter() - submitted[f])
+            )
+            futures.append(future)
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+        stats = batcher.metrics()
+    
+    return {
+        "frames_per_sec": round(len(frames) / elapsed, 2),
+        "avg_batch_size": stats["avg_batch_size"],
+        "latency": summarize_ms(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep YOLO batch sizes on CPU")
+    parser.add_argument("--frames", type=int, default=64, help="Frames per sweep point")
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16", help="Comma-separated batch sizes")
+    parser.add_argument("--max-wait", type=float, default=0.05, help="Batch flush timeout in seconds")
+    parser.add_argument("--image", default=None, help="Image to use (default: synthetic frame)")
+    parser.add_argument("--model", default=None, help="Path to YOLO model file")
+    parser.add_argument("--conf", type=float, default=0.5, help="Confidence threshold")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    if not yolo_fire_wrapper.YOLO_AVAILABLE:
+        print("YOLO not installed. Run: pip install ultralytics", file=sys.stderr)
+        sys.exit(1)
+    
+    frame = load_image(args.image or make_test_image())
+    frames = [frame.copy() for _ in range(args.frames)]
+    
+    # Warm up the model so the first sweep point isn't charged for loading it
+    yolo_fire_wrapper.detect_fire_yolo_batch(frames[:2], args.model, args.conf)
+    
+    sweep = {}
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        sweep[f"batch_{batch_size}"] = run_sweep_point(frames, batch_size, args)
+    
+    print_report({
+        "frames": args.frames,
+        "frame_shape": list(frame.shape),
+        "device": "cpu",
+        "sweep": sweep,
+    }, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: brightness fire detection, float reference vs uint8 fast path
+
+For each resolution, decodes a synthetic (or given) JPEG and reports time and
+peak allocation per call for the float reference mask, the uint8 mask with
+reused scratch buffers, and the uint8 mask on a draft-mode reduced decode.
+Also checks that the fast mask matches the reference pixel for pixel.
+
+Usage:
+    python benchmarks/bench_brightness.py [--repeat 20] [--reduce 4] [--image <path>] [--json]
+"""
+
+import time
+import argparse
+import tracemalloc
+
+from common import make_test_image, print_report
+
+from fire_mask import count_fire_pixels, count_fire_pixels_reference
+from image_decode import load_image
+
+RESOLUTIONS = {"480p": (640, 480), "720p": (1280, 720), "1080p": (1920, 1080)}
+
+
+def measure(fn, repeat: int) -> dict:
+    """Mean time and peak traced allocation of fn() over repeat calls"""
+    fn()  # Warm up (allocates the scratch buffers once)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"result": result, "ms": round(elapsed * 1000, 3), "peak_alloc_kb": round(peak / 1024, 1)}
+
+
+def bench_image(path: str, args) -> dict:
+    with open(path, "rb") as f:
+        data = f.read()
+    frame = load_image(data)
+    
+    reference = measure(lambda: count_fire_pixels_reference(frame), args.repeat)
+    fast = measure(lambda: count_fire_pixels(frame), args.repeat)
+    reduced = measure(lambda: count_fire_pixels(load_image(data, args.reduce)), args.repeat)
+    decode_full = measure(lambda: count_fire_pixels(load_image(data)), args.repeat)
+    
+    ratio = lambda counts: counts[0] / counts[1]
+    return {
+        "shape": list(frame.shape),
+        "reference_ms": reference["ms"],
+        "reference_peak_alloc_kb": reference["peak_alloc_kb"],
+        "fast_ms": fast["ms"],
+        "fast_peak_alloc_kb": fast["peak_alloc_kb"],
+        "fast_matches_reference": fast["result"] == reference["result"],
+        "decode_full_plus_fast_ms": decode_full["ms"],
+        f"decode_reduce{args.reduce}_plus_fast_ms": reduced["ms"],
+        "fire_ratio_full": round(ratio(fast["result"]), 5),
+        f"fire_ratio_reduce{args.reduce}": round(ratio(reduced["result"]), 5),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark brightness fire detection paths")
+    parser.add_argument("--repeat", type=int, default=20, help="Calls per measurement")
+    parser.add_argument("--reduce", type=int, default=4, help="Downscale factor for the reduced decode")
+    parser.add_argument("--image", default=None, help="Benchmark this image instead of synthetic frames")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    if args.image:
+        report = {args.image: bench_image(args.image, args)}
+    else:
+        report = {name: bench_image(make_test_image(size=size), args) for name, size in RESOLUTIONS.items()}
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
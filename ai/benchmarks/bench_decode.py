@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-resolution vs reduced-scale JPEG decode for the detectors
+
+For each resolution, decodes a synthetic (or given) JPEG the way the
+detectors do before inference (decode + RGB->BGR for YOLO, then the
+brightness check on the same array) at full resolution and with
+target=imgsz (JPEG draft decode at the smallest scale whose long side is
+still >= imgsz). Reports the decoded shape, time per frame, and the peak RSS
+of a fresh process decoding that frame repeatedly, plus its growth over the
+process after imports (each case runs in its own subprocess so the
+high-water marks don't mix).
+
+Usage:
+    python benchmarks/bench_decode.py [--resolutions 640x480,1600x1200,2592x1944] [--imgsz 640,320]
+    python benchmarks/bench_decode.py --image frame.jpg --repeat 50 --json
+"""
+
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+from common import make_test_image, print_report
+
+
+def peak_rss_mb() -> float:
+    """Process memory high-water mark (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(path: str, target: int, repeat: int) -> dict:
+    """Decode + prepare one frame repeat times in this process (subprocess entry point)"""
+    import numpy as np
+    from fire_mask import count_fire_pixels
+    from image_decode import decode_image_bytes, rgb_to_bgr
+
+    with open(path, "rb") as f:
+        data = f.read()
+    baseline = peak_rss_mb()
+
+    decode_s, prepare_s = 0.0, 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frame = decode_image_bytes(data, target=target or None)
+        decoded = time.perf_counter()
+        rgb_to_bgr(frame)                 # What YOLO is handed
+        fire_pixels, total = count_fire_pixels(frame)  # Brightness check on the same array
+        prepare_s += time.perf_counter() - decoded
+        decode_s += decoded - start
+    return {
+        "shape": "x".join(str(v) for v in frame.shape[1::-1]),
+        "decode_ms": round(decode_s / repeat * 1000, 2),
+        "prepare_ms": round(prepare_s / repeat * 1000, 2),
+        "fire_ratio": round(float(np.float64(fire_pixels) / total), 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_growth_mb": round(peak_rss_mb() - baseline, 1),
+    }
+
+
+def measure(path: str, target: int, repeat: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--case", path, "--target", str(target), "--repeat", str(repeat)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reduced-scale JPEG decoding")
+    parser.add_argument("--resolutions", default="640x480,1280x720,1600x1200,1920x1080,2592x1944",
+                        help="Comma-separated synthetic frame sizes (WxH)")
+    parser.add_argument("--imgsz", default="640,320", help="Comma-separated model input sizes to decode for")
+    parser.add_argument("--image", default=None, help="Use this JPEG instead of synthetic frames")
+    parser.add_argument("--repeat", type=int, default=20, help="Decodes per case")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--case", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--target", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args.target, args.repeat)))
+        return
+
+    if args.image:
+        frames = {"image": args.image}
+    else:
+        frames = {}
+        for size in args.resolutions.split(","):
+            width, height = (int(v) for v in size.lower().split("x"))
+            frames[size] = make_test_image(size=(width, height), fire=True)
+
+    targets = [int(v) for v in args.imgsz.split(",") if v.strip()]
+    report = {}
+    for name, path in frames.items():
+        full = measure(path, 0, args.repeat)
+        results = {"full": full}
+        for target in targets:
+            reduced = measure(path, target, args.repeat)
+            reduced["speedup"] = round(
+                (full["decode_ms"] + full["prepare_ms"]) / max(reduced["decode_ms"] + reduced["prepare_ms"], 1e-6), 2
+            )
+            results[f"imgsz_{target}"] = reduced
+        report[name] = results
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark: multi-process inference pool scaling
+
+Runs the same frames through InferencePool with 1, 2, ... N worker processes
+and reports frames/sec, speedup over one worker and parallel efficiency,
+next to an in-process baseline (what FireDetectionAI does without a pool).
+Worker startup (spawn + model load) is reported separately and not counted
+in the throughput.
+
+The brightness detector needs no model and is CPU-bound (decode + color
+mask), so it shows the pool's scaling on any host; pass --model to measure
+YOLO. --kill-worker SIGKILLs one worker halfway through the largest run to
+check that its frames are re-dispatched and the worker restarted.
+
+Usage:
+    python benchmarks/bench_inference_pool.py [--workers 4] [--frames 64] [--size 1920x1080]
+    python benchmarks/bench_inference_pool.py --model fire_model.pt --imgsz 640 --workers 8 --json
+"""
+
+import os
+import time
+import signal
+import argparse
+
+from common import make_test_image, print_report
+
+from inference_pool import InferencePool
+from structured_log import configure_logging
+
+
+def load_frames(count: int, size) -> list:
+    with open(make_test_image(size=size, fire=True), "rb") as f:
+        fire = f.read()
+    with open(make_test_image(size=size, fire=False), "rb") as f:
+        clear = f.read()
+    return [fire if i % 2 else clear for i in range(count)]
+
+
+def bench_in_process(frames: list, args) -> dict:
+    """Sequential detection in this process, as FireDetectionAI runs without a pool"""
+    if args.model:
+        from image_decode import decode_image_bytes, rgb_to_bgr
+        from model_backends import load_model
+        from inference_pool import parse_fire_result
+
+        model = load_model(args.model, args.backend, args.imgsz)
+        detect = lambda data: parse_fire_result(
+            model([rgb_to_bgr(decode_image_bytes(data))], imgsz=args.imgsz, verbose=False)[0]
+        )
+    else:
+        from yolo_fire_wrapper import detect_fire_brightness
+        detect = lambda data: detect_fire_brightness(data)
+
+    detect(frames[0])  # Warm up
+    start = time.perf_counter()
+    for frame in frames:
+        detect(frame)
+    elapsed = time.perf_counter() - start
+    return {"fps": round(len(frames) / elapsed, 2)}
+
+
+def bench_pool(frames: list, workers: int, args, kill: bool = False) -> dict:
+    pool = InferencePool(
+        workers,
+        detector="yolo" if args.model else "brightness",
+        model_path=args.model,
+        backend=args.backend,
+        imgsz=args.imgsz,
+        threads_per_worker=args.threads,
+        slots_per_worker=args.slots
+    )
+    start = time.perf_counter()
+    pool.start()
+    startup = time.perf_counter() - start
+    try:
+        pool.detect_batch(frames[:workers])  # Warm up every worker
+        warmup = {wid: w["processed"] for wid, w in pool.metrics()["workers"].items()}
+
+        start = time.perf_counter()
+        futures = []
+        for index, frame in enumerate(frames):
+            if kill and index == len(frames) // 2:
+                os.kill(pool._workers[0].process.pid, signal.SIGKILL)
+            futures.append(pool.submit(frame))
+        results = [future.exception() is None for future in futures]
+        elapsed = time.perf_counter() - start
+        stats = pool.metrics()
+    finally:
+        pool.stop()
+
+    report = {
+        "startup_s": round(startup, 2),
+        "fps": round(len(frames) / elapsed, 2),
+        "completed": sum(results),
+        "per_worker": [w["processed"] - warmup[wid] for wid, w in stats["workers"].items()],
+    }
+    if kill:
+        report["restarts"] = sum(w["restarts"] for w in stats["workers"].values())
+        report["redispatched"] = stats["redispatched"]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inference pool scaling")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Largest pool size to test")
+    parser.add_argument("--frames", type=int, default=64, help="Frames per run")
+    parser.add_argument("--size", default="1920x1080", help="Synthetic frame size (WxH)")
+    parser.add_argument("--model", default=None, help="YOLO model (default: brightness detector)")
+    parser.add_argument("--backend", default="torch", help="Inference backend for --model")
+    parser.add_argument("--imgsz", type=int, default=640, help="Model input resolution")
+    parser.add_argument("--threads", type=int, default=1, help="Intra-op threads per worker")
+    parser.add_argument("--slots", type=int, default=2, help="Shared memory frame slots per worker")
+    parser.add_argument("--kill-worker", action="store_true", help="Kill one worker mid-run in the largest pool")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    configure_logging(level="ERROR")
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    frames = load_frames(args.frames, (width, height))
+
+    report = {
+        "cpu_count": os.cpu_count(),
+        "detector": "yolo" if args.model else "brightness",
+        "frames": len(frames),
+        "in_process": bench_in_process(frames, args),
+        "pool": {},
+    }
+    base_fps = None
+    for workers in range(1, args.workers + 1):
+        result = bench_pool(frames, workers, args, kill=args.kill_worker and workers == args.workers)
+        base_fps = base_fps or result["fps"]
+        result["speedup"] = round(result["fps"] / base_fps, 2)
+        result["efficiency"] = round(result["speedup"] / workers, 2)
+        report["pool"][workers] = result
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Load test: max sustainable frames/sec through capture, detection, upload and event writes
+
+Runs FireDetectionAI.run_multi_camera end to end with no hardware:
+
+- local_fakes.FakeCamera servers answer /capture over HTTP (with an optional
+  sensor readout delay), polled at the offered rate split across --cameras
+- the seeded SyntheticDetector stands in for the model (fire rate, bursts and
+  latency distribution are configurable and reproducible)
+- FakeBucket and FakeFirestore take the uploads and DANGER events, with
+  optional per-call latency to mimic the network
+
+Each offered rate runs for --duration seconds, including the time to drain
+the upload and Firestore queues afterwards. A rate counts as sustained when
+at least 95% of the offered frames reach a verdict, no capture tick is
+skipped, no frame is dropped from a full queue, and the queues drain
+within a second. The rate doubles until it is no longer sustained and is
+then bisected --refine times. The report gives the highest sustained rate.
+
+Usage:
+    python benchmarks/bench_load.py [--cameras 4] [--latency-ms 20] [--fire-rate 0.05] [--duration 5]
+    python benchmarks/bench_load.py --burst-rate 0.02 --upload-ms 80 --firestore-ms 30 --batch-events --json
+    python benchmarks/bench_load.py --rates 10,20,40 --spool-uploads
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import argparse
+import threading
+from typing import List, Optional
+
+from common import make_test_image, print_report
+
+from fire_detection import FireDetectionAI
+from local_fakes import FakeBucket, FakeCamera, FakeFirestore
+from structured_log import configure_logging
+from synthetic_detector import LATENCY_DISTRIBUTIONS
+
+
+class LoadDetectionAI(FireDetectionAI):
+    """FireDetectionAI that writes to local fakes and keeps its pipeline counters"""
+
+    def __init__(self, upload_latency: float = 0.0, firestore_latency: float = 0.0):
+        self.upload_latency = upload_latency
+        self.firestore_latency = firestore_latency
+        self.pipeline_stats: dict = {}
+        super().__init__(
+            esp32_cam_url="http://127.0.0.1/capture",
+            gcs_bucket_name="load-bucket",
+            gcs_service_account_path=""
+        )
+
+    def _init_gcs_client(self, service_account_path: str):
+        self.bucket = FakeBucket(self.gcs_bucket_name, latency=self.upload_latency)
+
+    def _init_firebase(self, credentials_path: Optional[str]):
+        self.db = FakeFirestore(latency=self.firestore_latency)
+
+    def _load_model(self, model_path: Optional[str]):
+        return None
+
+    def stop_pipeline(self):
+        pipeline = self.pipeline
+        super().stop_pipeline()
+        if pipeline is not None:
+            self.pipeline_stats = pipeline.metrics()
+
+
+def run_rate(rate: float, frames: List[bytes], args) -> dict:
+    """Offer `rate` frames/sec for args.duration seconds and measure what got through"""
+    cameras = [FakeCamera(frames, capture_latency=args.capture_ms / 1000).start() for _ in range(args.cameras)]
+    spool_dir = tempfile.mkdtemp(prefix="fire_load_spool_") if args.spool_uploads else None
+    detector = LoadDetectionAI(args.upload_ms / 1000, args.firestore_ms / 1000)
+    detector.enable_synthetic_detector(
+        seed=args.seed,
+        fire_rate=args.fire_rate,
+        burst_rate=args.burst_rate,
+        burst_length=args.burst_length,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        latency_dist=args.latency_dist,
+        cpu_bound=args.cpu_bound
+    )
+    if args.batch_events:
+        detector.enable_event_writer()
+    if spool_dir:
+        detector.enable_upload_manager(spool_dir)
+
+    stopped_at = {}
+
+    def stop():
+        stopped_at["t"] = time.perf_counter()
+        detector.scheduler.stop()
+
+    timer = threading.Timer(args.duration, stop)
+    try:
+        start = time.perf_counter()
+        timer.start()
+        detector.run_multi_camera(
+            [camera.capture_url for camera in cameras],
+            interval=args.cameras / rate,
+            batch_size=args.batch_size
+        )
+        finished = time.perf_counter()
+    finally:
+        timer.cancel()
+        for camera in cameras:
+            camera.stop()
+        if spool_dir:
+            shutil.rmtree(spool_dir, ignore_errors=True)
+
+    duration = stopped_at.get("t", finished) - start
+    cameras_stats = detector.scheduler.metrics()["cameras"].values()
+    frames_done = detector.frames_total.value()
+    alerts = detector.alerts_total.value()
+    events = detector.db.all("events")
+    drops = sum(stats["dropped"] for stats in detector.pipeline_stats.values())
+    skipped = sum(stats["skipped"] for stats in cameras_stats)
+    dropped = sum(stats["dropped"] for stats in cameras_stats)
+    drain = finished - stopped_at.get("t", finished)
+    stage = lambda name: round(detector.stage_seconds.snapshot(stage=name)["p95"] * 1000, 1)
+
+    result = {
+        "offered_fps": round(rate, 2),
+        "capture_fps": round(sum(camera.captures for camera in cameras) / duration, 2),
+        "verdict_fps": round(frames_done / duration, 2),
+        "alerts": int(alerts),
+        "uploads_per_s": round(detector.bucket.uploads / duration, 2),
+        "event_docs": len(events),
+        "firestore_round_trips": detector.db.round_trips,
+        "skipped_ticks": skipped,
+        "dropped_frames": dropped + drops,
+        "drain_s": round(drain, 2),
+        "p95_ms": {name: stage(name) for name in ("capture", "inference", "upload", "firestore")},
+    }
+    result["sustained"] = (
+        frames_done >= 0.95 * rate * duration
+        and skipped == 0
+        and dropped + drops == 0
+        and drain < 1.0
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the max sustainable end-to-end frame rate")
+    parser.add_argument("--cameras", type=int, default=4, help="Fake cameras polled concurrently")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per offered rate")
+    parser.add_argument("--rates", default=None, help="Comma-separated offered frames/sec (default: doubling search)")
+    parser.add_argument("--start-rate", type=float, default=5.0, help="First rate of the doubling search")
+    parser.add_argument("--max-rate", type=float, default=640.0, help="Stop the doubling search here")
+    parser.add_argument("--refine", type=int, default=3, help="Bisection steps after the doubling search")
+    parser.add_argument("--capture-ms", type=float, default=0.0, help="Fake camera sensor readout per /capture")
+    parser.add_argument("--size", default="800x600", help="Served frame size (WxH)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic detector seed")
+    parser.add_argument("--fire-rate", type=float, default=0.05, help="Probability that a frame is fire")
+    parser.add_argument("--burst-rate", type=float, default=0.0, help="Per-frame probability of a fire burst")
+    parser.add_argument("--burst-length", type=int, default=10, help="Fire frames per burst")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mean synthetic inference latency")
+    parser.add_argument("--latency-jitter-ms", type=float, default=5.0, help="Latency standard deviation")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="normal",
+                        help="Latency distribution")
+    parser.add_argument("--cpu-bound", action="store_true", help="Spin the CPU for the latency instead of sleeping")
+    parser.add_argument("--batch-size", type=int, default=1, help="Frames per batched detector call")
+    parser.add_argument("--upload-ms", type=float, default=0.0, help="Fake GCS latency per upload")
+    parser.add_argument("--firestore-ms", type=float, default=0.0, help="Fake Firestore latency per write")
+    parser.add_argument("--batch-events", action="store_true", help="Write events through the batching writer")
+    parser.add_argument("--spool-uploads", action="store_true", help="Upload through the spooled upload manager")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    configure_logging(level="ERROR")
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    frames = []
+    for fire in (False, True):
+        with open(make_test_image(size=(width, height), fire=fire), "rb") as f:
+            frames.append(f.read())
+
+    runs = {}
+
+    def run(rate: float) -> bool:
+        result = run_rate(rate, frames, args)
+        runs[f"{rate:g}"] = result
+        return result["sustained"]
+
+    if args.rates:
+        for rate in (float(v) for v in args.rates.split(",")):
+            run(rate)
+    else:
+        low, high = None, None
+        rate = args.start_rate
+        while rate <= args.max_rate:
+            if not run(rate):
+                high = rate
+                break
+            low = rate
+            rate *= 2
+        if low is not None and high is not None:
+            for _ in range(args.refine):
+                middle = (low + high) / 2
+                if run(middle):
+                    low = middle
+                else:
+                    high = middle
+
+    sustained = [result for result in runs.values() if result["sustained"]]
+    best = max(sustained, key=lambda r: r["offered_fps"]) if sustained else None
+    report = {
+        "cpu_count": os.cpu_count(),
+        "cameras": args.cameras,
+        "detector": {
+            "seed": args.seed, "fire_rate": args.fire_rate, "burst_rate": args.burst_rate,
+            "latency_ms": args.latency_ms, "latency_dist": args.latency_dist,
+        },
+        "runs": runs,
+        "max_sustainable_fps": best["verdict_fps"] if best else 0.0,
+        "max_sustainable_offered_fps": best["offered_fps"] if best else 0.0,
+    }
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Replay benchmark: recorded frames through the FireDetectionAI pipeline
+
+Feeds a directory of JPEGs, or a recorded sensor stream such as
+data/local-buffer.ndjson, through FireDetectionAI.process_frame with GCS and
+Firestore replaced by local_fakes, once per detector (yolo, brightness,
+mock). Reports frames/sec, p50/p95/p99 latency per stage (capture, detect,
+upload, firestore, total), the process memory high-water mark, and how
+often the detectors agree with each other (and with the sensor risk level
+when replaying a sensor stream).
+
+Sensor records carry no image, so each one is replayed as a synthetic frame:
+a fire scene when its risk_level is not NORMAL, a clear scene otherwise.
+
+Usage:
+    python benchmarks/bench_replay.py --frames captures/ [--detectors brightness,mock]
+    python benchmarks/bench_replay.py --sensor-log ../data/local-buffer.ndjson --json
+    python benchmarks/bench_replay.py --frames captures/ --detectors yolo,brightness --model fire.pt \\
+                                      --output replay-report.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import subprocess
+import contextlib
+from datetime import datetime, timezone
+from itertools import combinations
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+from common import AI_DIR, make_test_image, print_report, summarize_ms
+
+from fire_detection import FireDetectionAI, YOLO_AVAILABLE
+from local_fakes import FakeBucket, FakeFirestore
+from structured_log import configure_logging
+
+# (name, image_bytes, label); label is None when the source has no ground truth
+Frame = Tuple[str, bytes, Optional[bool]]
+
+STAGES = ("capture", "detect", "upload", "firestore", "total")
+
+
+class ReplayDetectionAI(FireDetectionAI):
+    """FireDetectionAI that captures from a frame list and writes to local fakes"""
+
+    def __init__(self, frames: List[Frame], detector: str, model_path: Optional[str] = None,
+                 conf: float = 0.5, backend: str = "torch", imgsz: int = 640):
+        self.frames = frames
+        self.detector = detector
+        self.conf = conf
+        self.position = 0
+        self.current: Optional[Frame] = None
+        self.timings = {stage: [] for stage in STAGES}
+        self.verdicts: List[bool] = []
+        super().__init__(
+            esp32_cam_url="replay://frames",
+            gcs_bucket_name="replay-bucket",
+            gcs_service_account_path="",
+            model_path=model_path,
+            backend=backend,
+            imgsz=imgsz
+        )
+
+    def _init_gcs_client(self, service_account_path: str):
+        self.bucket = FakeBucket(self.gcs_bucket_name)
+
+    def _init_firebase(self, credentials_path: Optional[str]):
+        self.db = FakeFirestore()
+
+    def _load_model(self, model_path: Optional[str]):
+        if self.detector != "yolo":
+            return None
+        return super()._load_model(model_path)
+
+    def capture_image(self, camera_url: Optional[str] = None) -> Optional[bytes]:
+        start = time.perf_counter()
+        if self.position >= len(self.frames):
+            return None
+        self.current = self.frames[self.position]
+        self.position += 1
+        self.timings["capture"].append(time.perf_counter() - start)
+        return self.current[1]
+
+    def detect_fire(self, image_bytes: bytes) -> Tuple[bool, float]:
+        start = time.perf_counter()
+        verdict = self.detect_fire_batch([image_bytes])[0]
+        self.timings["detect"].append(time.perf_counter() - start)
+        self.verdicts.append(verdict[0])
+        return verdict
+
+    def detect_fire_batch(self, images: List[bytes]) -> List[Tuple[bool, float]]:
+        import yolo_fire_wrapper
+
+        if self.detector == "yolo":
+            return super().detect_fire_batch(images)
+        if self.detector == "brightness":
+            results = [yolo_fire_wrapper.detect_fire_brightness(image, self.conf) for image in images]
+        else:
+            # The mock detector decides by file name
+            results = [yolo_fire_wrapper.detect_fire_mock(self.current[0], self.conf) for _ in images]
+        return [(bool(r["fire"]), float(r["confidence"])) for r in results]
+
+    def upload_to_gcs(self, image_bytes: bytes, filename: str, content_type: str = "image/jpeg") -> Optional[str]:
+        start = time.perf_counter()
+        url = super().upload_to_gcs(image_bytes, filename, content_type)
+        self.timings["upload"].append(time.perf_counter() - start)
+        return url
+
+    def write_danger_event(self, *args, **kwargs) -> Optional[str]:
+        start = time.perf_counter()
+        event_id = super().write_danger_event(*args, **kwargs)
+        self.timings["firestore"].append(time.perf_counter() - start)
+        return event_id
+
+
+def load_frame_dir(directory: str) -> List[Frame]:
+    paths = sorted(
+        p for p in Path(directory).iterdir()
+        if p.suffix.lower() in (".jpg", ".jpeg")
+    )
+    return [(p.name, p.read_bytes(), None) for p in paths]
+
+
+def load_sensor_log(path: str) -> Tuple[List[Frame], List[int]]:
+    """Synthetic frames labelled by each record's risk level, plus record timestamps"""
+    with open(make_test_image(fire=True), "rb") as f:
+        fire_jpeg = f.read()
+    with open(make_test_image(fire=False), "rb") as f:
+        clear_jpeg = f.read()
+
+    frames, timestamps = [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            label = record.get("risk_level", "NORMAL") != "NORMAL"
+            name = f"{'fire' if label else 'clear'}_{record.get('node_id', 'node')}_{record['timestamp']}.jpg"
+            frames.append((name, fire_jpeg if label else clear_jpeg, label))
+            timestamps.append(record["timestamp"])
+    return frames, timestamps
+
+
+def peak_rss_mb() -> float:
+    """Process memory high-water mark (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_detector(detector: str, frames: List[Frame], timestamps: Optional[List[int]], args) -> dict:
+    """Replay all frames through process_frame with one detector"""
+    with contextlib.ExitStack() as stack:
+        output = sys.stderr if args.verbose else stack.enter_context(open(os.devnull, "w"))
+        stack.enter_context(contextlib.redirect_stdout(output))
+        configure_logging(stream=output)
+        ai = ReplayDetectionAI(frames, detector, args.model, args.conf, args.backend, args.imgsz)
+        if detector == "yolo" and ai.model is None:
+            return {"skipped": "no YOLO model loaded (install ultralytics and pass --model)"}
+
+        wall_start = time.perf_counter()
+        for index in range(len(frames)):
+            if args.speed and timestamps and index:
+                time.sleep(max(0, timestamps[index] - timestamps[index - 1]) / 1000 / args.speed)
+            start = time.perf_counter()
+            ai.process_frame()
+            ai.timings["total"].append(time.perf_counter() - start)
+        wall = time.perf_counter() - wall_start
+
+    labels = [frame[2] for frame in frames]
+    report = {
+        "frames": len(frames),
+        "fps": round(len(frames) / wall, 2) if wall else 0.0,
+        "fire_frames": sum(ai.verdicts),
+        "uploads": ai.bucket.uploads,
+        "events": len(ai.db.all("events")),
+        "stages": {stage: summarize_ms(samples) for stage, samples in ai.timings.items()},
+        "peak_rss_mb": peak_rss_mb(),
+        "verdicts": ai.verdicts,
+    }
+    if all(label is not None for label in labels):
+        hits = sum(v == label for v, label in zip(ai.verdicts, labels))
+        report["label_agreement"] = round(hits / len(labels), 4) if labels else 0.0
+    return report
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=AI_DIR,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded frames through the detection pipeline")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--frames", help="Directory of JPEG frames (replayed in name order)")
+    source.add_argument("--sensor-log", help="Recorded sensor stream (NDJSON, e.g. data/local-buffer.ndjson)")
+    parser.add_argument("--detectors", default="yolo,brightness,mock", help="Comma-separated detectors to compare")
+    parser.add_argument("--model", default=os.getenv("FIRE_MODEL_PATH"), help="YOLO model for the yolo detector")
+    parser.add_argument("--backend", default="torch", help="Inference backend for the yolo detector")
+    parser.add_argument("--imgsz", type=int, default=640, help="Model input resolution")
+    parser.add_argument("--conf", type=float, default=0.5, help="Confidence threshold for brightness/mock")
+    parser.add_argument("--limit", type=int, help="Replay at most this many frames")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="With --sensor-log, replay at this multiple of recorded time (0 = as fast as possible)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the mock detector")
+    parser.add_argument("--verbose", action="store_true", help="Show the detector's per-frame output on stderr")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    timestamps = None
+    if args.frames:
+        frames = load_frame_dir(args.frames)
+    else:
+        frames, timestamps = load_sensor_log(args.sensor_log)
+    if args.limit:
+        frames = frames[:args.limit]
+        timestamps = timestamps[:args.limit] if timestamps else None
+    if not frames:
+        parser.error("no frames to replay")
+
+    detectors = [d.strip() for d in args.detectors.split(",") if d.strip()]
+    results = {}
+    for detector in detectors:
+        if detector == "yolo" and not YOLO_AVAILABLE:
+            results[detector] = {"skipped": "ultralytics not installed"}
+            continue
+        print(f"Replaying {len(frames)} frames with {detector}...", file=sys.stderr)
+        results[detector] = run_detector(detector, frames, timestamps, args)
+
+    agreement = {}
+    completed = [d for d in detectors if "verdicts" in results[d]]
+    for a, b in combinations(completed, 2):
+        same = sum(x == y for x, y in zip(results[a]["verdicts"], results[b]["verdicts"]))
+        agreement[f"{a}/{b}"] = round(same / len(frames), 4)
+    for detector in completed:
+        del results[detector]["verdicts"]
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "source": args.frames or args.sensor_log,
+        "frames": len(frames),
+        "detectors": results,
+        "agreement": agreement,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark: region-of-interest tiling vs whole-frame inference
+
+Synthesizes high-resolution frames with one small, distant flame (and clear
+frames without one) and compares three ways of feeding them to the model:
+
+- full_downscaled: the whole frame at imgsz (the default path)
+- full_native: the whole frame at its own resolution
+- tiled: native-resolution crops around fire-colored regions (roi_tiling)
+
+Without a model it reports what can be measured on the frames alone: the
+region proposal time, how often the flame lands inside a crop (proposal
+recall), crops on clear frames, model input pixels per frame (the compute
+proxy) and how many pixels wide the flame is at model input. With --model it
+also runs YOLO all three ways and reports latency and fire verdicts.
+
+Usage:
+    python benchmarks/bench_roi_tiling.py [--resolutions 1600x1200,2592x1944] [--flame-px 16]
+    python benchmarks/bench_roi_tiling.py --model fire_model.pt --imgsz 640 --json
+"""
+
+import time
+import random
+import argparse
+from typing import List, Tuple
+
+import numpy as np
+
+from common import print_report, summarize_ms
+
+from roi_tiling import crop_boxes, detect_tiled, propose_regions
+
+
+def make_frame(size: Tuple[int, int], flame_px: int, rng: random.Random, fire: bool = True):
+    """Noisy dim scene with one flame_px-wide flame at a random spot; returns (RGB array, flame box)"""
+    from PIL import Image, ImageDraw
+
+    width, height = size
+    noise = np.random.default_rng(rng.randrange(1 << 30)).integers(30, 70, (height, width, 3), dtype=np.uint8)
+    img = Image.fromarray(noise)
+    if not fire:
+        return np.asarray(img), None
+
+    x = rng.randrange(flame_px, width - 2 * flame_px)
+    y = rng.randrange(flame_px, height - 2 * flame_px)
+    box = (x, y, x + flame_px, y + int(flame_px * 1.5))
+    draw = ImageDraw.Draw(img)
+    draw.ellipse(box, fill=(250, 140, 30))
+    inner = flame_px // 4
+    draw.ellipse((box[0] + inner, box[1] + inner, box[2] - inner, box[3] - inner), fill=(255, 240, 200))
+    return np.asarray(img), box
+
+
+def contains(crop, box) -> bool:
+    return crop[0] <= box[0] and crop[1] <= box[1] and crop[2] >= box[2] and crop[3] >= box[3]
+
+
+def bench_resolution(size: Tuple[int, int], args, model=None) -> dict:
+    rng = random.Random(args.seed)
+    fire_frames = [make_frame(size, args.flame_px, rng) for _ in range(args.frames)]
+    clear_frames = [make_frame(size, args.flame_px, rng, fire=False)[0] for _ in range(args.frames)]
+    width, height = size
+
+    proposal_times, crop_counts, hits, tiled_pixels = [], [], 0, []
+    for frame, box in fire_frames:
+        start = time.perf_counter()
+        crops = crop_boxes(propose_regions(frame, args.reduce, max_regions=args.max_tiles),
+                           frame.shape, args.imgsz)
+        proposal_times.append(time.perf_counter() - start)
+        crop_counts.append(len(crops))
+        hits += any(contains(crop, box) for crop in crops)
+        tiled_pixels.append(sum(max(x2 - x1, args.imgsz) * max(y2 - y1, args.imgsz) for x1, y1, x2, y2 in crops))
+    clear_crops = [len(crop_boxes(propose_regions(frame, args.reduce, max_regions=args.max_tiles),
+                                  frame.shape, args.imgsz)) for frame in clear_frames]
+
+    scale = args.imgsz / max(width, height)
+    report = {
+        "proposal": summarize_ms(proposal_times),
+        "proposal_recall": round(hits / len(fire_frames), 3),
+        "crops_per_fire_frame": round(sum(crop_counts) / len(crop_counts), 2),
+        "clear_frames_with_crops": sum(1 for n in clear_crops if n),
+        "model_pixels_per_frame": {
+            "full_downscaled": args.imgsz * args.imgsz,
+            "full_native": width * height,
+            "tiled_fire_frame": int(sum(tiled_pixels) / len(tiled_pixels)),
+            "tiled_clear_frame": int(sum(n * args.imgsz * args.imgsz for n in clear_crops) / len(clear_crops)),
+        },
+        "flame_px_at_model_input": {
+            "full_downscaled": round(args.flame_px * scale, 1),
+            "full_native": args.flame_px,
+            "tiled": args.flame_px,
+        },
+    }
+    if model is not None:
+        report["yolo"] = bench_model(model, fire_frames, clear_frames, size, args)
+    return report
+
+
+def bench_model(model, fire_frames, clear_frames, size: Tuple[int, int], args) -> dict:
+    """Latency and fire verdicts for the three inference modes"""
+    from image_decode import rgb_to_bgr
+
+    native = max(size)
+    names = model.names
+
+    def is_fire(cls_id: int) -> bool:
+        name = names[cls_id] if cls_id < len(names) else ""
+        return any(keyword in name.lower() for keyword in ("fire", "flame", "smoke", "burn"))
+
+    def run_full(frame, imgsz):
+        result = model([rgb_to_bgr(frame)], imgsz=imgsz, conf=args.conf, verbose=False)[0]
+        return any(is_fire(int(c)) for c in result.boxes.cls.tolist()) if result.boxes is not None else False
+
+    def run_tiled(frame):
+        detections, _ = detect_tiled(model, frame, args.imgsz, args.reduce, args.max_tiles,
+                                     conf=args.conf, verbose=False)
+        return any(is_fire(cls_id) for *_, cls_id in detections)
+
+    modes = {
+        "full_downscaled": lambda frame: run_full(frame, args.imgsz),
+        "full_native": lambda frame: run_full(frame, native),
+        "tiled": run_tiled,
+    }
+    report = {}
+    for name, fn in modes.items():
+        fn(fire_frames[0][0])  # Warm up
+        times: List[float] = []
+        detected = 0
+        for frame, _ in fire_frames:
+            start = time.perf_counter()
+            detected += fn(frame)
+            times.append(time.perf_counter() - start)
+        false_alarms = sum(fn(frame) for frame in clear_frames)
+        report[name] = {
+            "latency": summarize_ms(times),
+            "fire_recall": round(detected / len(fire_frames), 3),
+            "false_alarms": false_alarms,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark region-of-interest tiling")
+    parser.add_argument("--resolutions", default="1600x1200,2592x1944", help="Comma-separated WxH frame sizes")
+    parser.add_argument("--flame-px", type=int, default=16, help="Flame width in native pixels")
+    parser.add_argument("--frames", type=int, default=20, help="Fire frames (and clear frames) per resolution")
+    parser.add_argument("--imgsz", type=int, default=640, help="Model input resolution (and minimum crop size)")
+    parser.add_argument("--reduce", type=int, default=8, help="Subsampling step for the proposal mask")
+    parser.add_argument("--max-tiles", type=int, default=4, help="Maximum crops per frame")
+    parser.add_argument("--model", default=None, help="Also run this YOLO model in all three modes")
+    parser.add_argument("--backend", default="torch", help="Inference backend for --model")
+    parser.add_argument("--conf", type=float, default=0.25, help="YOLO confidence threshold")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for flame placement and noise")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    model = None
+    if args.model:
+        from yolo_fire_wrapper import load_yolo_model
+        model = load_yolo_model(args.model, backend=args.backend, imgsz=args.imgsz)
+
+    report = {}
+    for resolution in args.resolutions.split(","):
+        width, height = (int(v) for v in resolution.lower().split("x"))
+        report[resolution] = bench_resolution((width, height), args, model)
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
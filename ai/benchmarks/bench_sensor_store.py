@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark: columnar sensor store vs parsing the NDJSON buffer
+
+Builds a larger buffer by repeating the recorded gateway stream
+(data/local-buffer.ndjson) for several nodes with shifted timestamps, then
+compares SensorStore with the only option the NDJSON gives us, parsing the
+whole file per question:
+
+- size on disk, full ingest time and incremental ingest of an appended tail
+- "node X between t1 and t2" and a per-window min/max/mean rollup, timed
+  both ways
+- verification: every query's records and rollups must be identical to the
+  NDJSON results (the run fails otherwise)
+
+Usage:
+    python benchmarks/bench_sensor_store.py [--records 200000] [--nodes 8] [--queries 20]
+    python benchmarks/bench_sensor_store.py --log ../data/local-buffer.ndjson --json
+"""
+
+import os
+import json
+import time
+import random
+import shutil
+import tempfile
+import argparse
+from typing import List, Optional
+
+import numpy as np
+
+from common import AI_DIR, print_report, summarize_ms
+
+from sensor_store import SensorStore, window_rollup
+from structured_log import configure_logging
+
+DEFAULT_LOG = AI_DIR.parent / "data" / "local-buffer.ndjson"
+
+
+def synthesize(log_path: str, out_path: str, records: int, nodes: int) -> List[dict]:
+    """Repeat the recording per node, shifted in time, until `records` lines are written"""
+    with open(log_path, "r", encoding="utf-8") as f:
+        base = [json.loads(line) for line in f if line.strip()]
+    first = min(r["timestamp"] for r in base)
+    span = max(r["timestamp"] for r in base) - first + 1000
+    written = []
+    with open(out_path, "w", encoding="utf-8") as f:
+        lap = 0
+        while len(written) < records:
+            for node in range(nodes):
+                for record in base:
+                    if len(written) == records:
+                        break
+                    record = {**record, "node_id": f"node-{node}",
+                              "timestamp": record["timestamp"] + lap * span + node * 7}
+                    f.write(json.dumps(record) + "\n")
+                    written.append(record)
+            lap += 1
+    return written
+
+
+def parse_ndjson(path: str) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def ndjson_query(path: str, start: float, end: float, node: Optional[str]) -> List[dict]:
+    records = [
+        r for r in parse_ndjson(path)
+        if start <= r["timestamp"] < end and (node is None or r.get("node_id") == node)
+    ]
+    return sorted(records, key=lambda r: r["timestamp"])
+
+
+def ndjson_rollup(path: str, field: str, window: float, start: float, end: float, node: Optional[str]) -> dict:
+    records = ndjson_query(path, start, end, node)
+    pairs = [(r["timestamp"], float(r[field])) for r in records
+             if isinstance(r.get(field), (int, float))]
+    return window_rollup(np.array([t for t, _ in pairs], dtype=np.float64),
+                         np.array([v for _, v in pairs], dtype=np.float64), window, start)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the columnar sensor store")
+    parser.add_argument("--log", default=str(DEFAULT_LOG), help="Recorded gateway NDJSON to repeat")
+    parser.add_argument("--records", type=int, default=200000, help="Readings in the synthetic buffer")
+    parser.add_argument("--nodes", type=int, default=8, help="Sensor nodes in the synthetic buffer")
+    parser.add_argument("--queries", type=int, default=20, help="Random range queries to time")
+    parser.add_argument("--window", type=float, default=60000, help="Rollup window in milliseconds")
+    parser.add_argument("--field", default="temp", help="Field to roll up")
+    parser.add_argument("--ndjson-queries", type=int, default=3, help="Of those, how many to also run on the NDJSON")
+    parser.add_argument("--seed", type=int, default=0, help="Query generator seed")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    configure_logging(level="ERROR")
+
+    workdir = tempfile.mkdtemp(prefix="sensor_store_bench_")
+    try:
+        buffer_path = os.path.join(workdir, "local-buffer.ndjson")
+        records = synthesize(args.log, buffer_path, args.records, args.nodes)
+        tail = records[-max(len(records) // 100, 1):]
+        with open(buffer_path, "r+", encoding="utf-8") as f:
+            # Hold back the last 1% to time an incremental ingest
+            lines = f.readlines()
+            f.seek(0)
+            f.writelines(lines[:len(lines) - len(tail)])
+            f.truncate()
+
+        store = SensorStore(os.path.join(workdir, "store"), source=buffer_path)
+        _, full_ingest = timed(store.ingest)
+        with open(buffer_path, "a", encoding="utf-8") as f:
+            f.writelines(lines[len(lines) - len(tail):])
+        added, tail_ingest = timed(store.ingest)
+        _, reopen = timed(lambda: len(SensorStore(store.dir)))
+
+        _, parse_time = timed(parse_ndjson, buffer_path)
+        first, last = records[0]["timestamp"], max(r["timestamp"] for r in records)
+        rng = random.Random(args.seed)
+        store_query, store_rollup, ndjson_query_t, ndjson_rollup_t = [], [], [], []
+        mismatches = 0
+        for i in range(args.queries):
+            start = rng.uniform(first, last)
+            end = start + rng.uniform(0.01, 0.2) * (last - first)
+            node = rng.choice([None] + [f"node-{n}" for n in range(args.nodes)])
+            result, elapsed = timed(store.records, start, end, node)
+            store_query.append(elapsed)
+            rollup, elapsed = timed(store.rollup, args.field, args.window, start, end, node)
+            store_rollup.append(elapsed)
+            if i < args.ndjson_queries:
+                expected, elapsed = timed(ndjson_query, buffer_path, start, end, node)
+                ndjson_query_t.append(elapsed)
+                expected_rollup, elapsed = timed(ndjson_rollup, buffer_path, args.field, args.window, start, end, node)
+                ndjson_rollup_t.append(elapsed)
+                same = result == expected and all(np.array_equal(rollup[k], expected_rollup[k]) for k in rollup)
+                mismatches += not same
+
+        everything = store.records()
+        identical = mismatches == 0 and everything == sorted(parse_ndjson(buffer_path), key=lambda r: r["timestamp"])
+        stats = store.metrics()
+        report = {
+            "records": len(store),
+            "tail_added": added,
+            "ndjson_mb": round(os.path.getsize(buffer_path) / 1e6, 2),
+            "store_mb": round(stats["store_bytes"] / 1e6, 2),
+            "ingest": {
+                "full_s": round(full_ingest, 3),
+                "tail_ms": round(tail_ingest * 1000, 1),
+                "reopen_ms": round(reopen * 1000, 2),
+            },
+            "ndjson_parse_s": round(parse_time, 3),
+            "query": {"store": summarize_ms(store_query), "ndjson": summarize_ms(ndjson_query_t)},
+            "rollup": {"store": summarize_ms(store_rollup), "ndjson": summarize_ms(ndjson_rollup_t)},
+            "identical": identical,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print_report(report, args.json)
+    if not report["identical"]:
+        raise SystemExit("Store results differ from the NDJSON")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: startup and import cost per entry-point mode
+
+Runs each mode in a fresh interpreter with -X importtime and reports the
+process wall time, total import time, and which heavy dependencies were
+actually imported. --mock, --brightness and --help should not import torch,
+ultralytics, Google Cloud or Firebase.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--json]
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+from common import AI_DIR, WRAPPER_PATH, make_test_image, print_report
+
+import yolo_fire_wrapper
+
+HEAVY_MODULES = [
+    "torch", "ultralytics", "numpy", "PIL",
+    "google.cloud.storage", "firebase_admin", "requests",
+]
+
+# Runs the entry point in-process, then reports which heavy modules got imported
+RUNNER = """
+import runpy, sys, json
+sys.argv = {argv!r}
+sys.path.insert(0, {ai_dir!r})
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except SystemExit:
+    pass
+print("HEAVY=" + json.dumps([m for m in {heavy!r} if m in sys.modules]), file=sys.stderr)
+"""
+
+
+def run_mode(argv, runs: int) -> dict:
+    """Median wall time, import time and heavy modules for one command line"""
+    code = RUNNER.format(argv=argv, ai_dir=str(AI_DIR), heavy=HEAVY_MODULES)
+    walls, imports = [], []
+    heavy = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, cwd=str(AI_DIR)
+        )
+        walls.append(time.perf_counter() - start)
+        
+        import_us = 0
+        for line in proc.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                self_us = line.split(":", 1)[1].split("|")[0].strip()
+                if self_us.isdigit():
+                    import_us += int(self_us)
+            elif line.startswith("HEAVY="):
+                heavy = json.loads(line[len("HEAVY="):])
+        imports.append(import_us / 1000)
+    
+    return {
+        "wall_ms": round(statistics.median(walls) * 1000, 1),
+        "import_ms": round(statistics.median(imports), 1),
+        "heavy_imports": heavy,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entry-point startup cost per mode")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per mode (median is reported)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    image = make_test_image()
+    wrapper = str(WRAPPER_PATH)
+    modes = {
+        "wrapper --help": [wrapper, "--help"],
+        "wrapper --mock": [wrapper, image, "--mock", "--no-cache"],
+        "wrapper --brightness": [wrapper, image, "--brightness", "--no-cache"],
+        "fire_detection --help": [str(AI_DIR / "fire_detection.py"), "--help"],
+    }
+    if yolo_fire_wrapper.YOLO_AVAILABLE:
+        modes["wrapper (yolo)"] = [wrapper, image, "--no-cache"]
+    
+    report = {name: run_mode(argv, args.runs) for name, argv in modes.items()}
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
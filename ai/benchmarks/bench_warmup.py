@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark: model warmup, pinned inference threads and the latency budget
+
+Each case runs in a fresh process (a warm process would hide the cold-start
+cost), optionally next to --contention busy-looping processes that stand
+in for the other services on a shared edge host:
+
+- cold start: per-frame latency of the first --frames real frames after
+  the model loads, without warmup and after --warmup dummy calls
+- threads: steady-state per-frame latency for each intra-op thread count
+  in --threads (0 = torch default, one per core), idle and under contention
+- budget: FireDetectionAI.detect_fire_batch under contention with and
+  without --budget-ms; reports latency percentiles, frames per mode and
+  how often the detector fell back
+
+Usage:
+    python benchmarks/bench_warmup.py [--model yolov8n.pt] [--imgsz 640] [--frames 30] [--threads 0,1,2,4]
+    python benchmarks/bench_warmup.py --contention 4 --budget-ms 150 --fallback 320,brightness --json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+from common import make_test_image, print_report, summarize_ms
+
+import yolo_fire_wrapper
+
+
+def load_frames(count: int, size) -> list:
+    frames = []
+    for fire in (False, True):
+        with open(make_test_image(size=size, fire=fire), "rb") as f:
+            frames.append(f.read())
+    return [frames[i % 2] for i in range(count)]
+
+
+def run_model_case(case: dict) -> dict:
+    """Load, optionally warm up, then time frames one by one (subprocess entry point)"""
+    from model_backends import configure_threads, load_model, warmup_model
+    from image_decode import decode_image_bytes, decoded_size, rgb_to_bgr
+
+    threads = configure_threads(case["threads"] or None, case["interop"] or None)
+    started = time.perf_counter()
+    model = load_model(case["model"], case["backend"], case["imgsz"])
+    load_s = time.perf_counter() - started
+
+    size = tuple(case["size"])
+    width, height = decoded_size(size, case["imgsz"])
+    started = time.perf_counter()
+    if case["warmup"]:
+        warmup_model(model, case["imgsz"], (height, width), case["warmup"])
+    warmup_s = time.perf_counter() - started
+
+    samples = []
+    for data in load_frames(case["frames"], size):
+        start = time.perf_counter()
+        model([rgb_to_bgr(decode_image_bytes(data, target=case["imgsz"]))], imgsz=case["imgsz"], verbose=False)
+        samples.append(time.perf_counter() - start)
+    return {
+        "threads": threads,
+        "load_s": round(load_s, 2),
+        "warmup_s": round(warmup_s, 2),
+        "first_ms": round(samples[0] * 1000, 1),
+        "first_5": summarize_ms(samples[:5]),
+        "steady": summarize_ms(samples[len(samples) // 2:]),
+    }
+
+
+def run_budget_case(case: dict) -> dict:
+    """detect_fire_batch frame by frame, with the latency budget if configured (subprocess entry point)"""
+    from fire_detection import FireDetectionAI
+    from local_fakes import FakeBucket, FakeFirestore
+    from structured_log import configure_logging
+
+    configure_logging(level="ERROR")
+
+    class BenchDetectionAI(FireDetectionAI):
+        def _init_gcs_client(self, service_account_path: str):
+            self.bucket = FakeBucket(self.gcs_bucket_name)
+
+        def _init_firebase(self, credentials_path):
+            self.db = FakeFirestore()
+
+    detector = BenchDetectionAI(
+        esp32_cam_url="http://127.0.0.1/capture",
+        gcs_bucket_name="bench-bucket",
+        gcs_service_account_path="",
+        model_path=case["model"],
+        backend=case["backend"],
+        imgsz=case["imgsz"],
+        threads=case["threads"] or None,
+        interop_threads=case["interop"] or None
+    )
+    if case["budget_ms"]:
+        detector.enable_latency_budget(case["budget_ms"], fallback=case["fallback"],
+                                       strikes=case["strikes"], probe_interval=case["probe"])
+    detector.warmup(case["warmup"], frame_size=tuple(case["size"]))
+
+    samples = []
+    fire_frames = 0
+    for data in load_frames(case["frames"], tuple(case["size"])):
+        start = time.perf_counter()
+        fire, _ = detector.detect_fire(data)
+        samples.append(time.perf_counter() - start)
+        fire_frames += fire
+    result = {"latency": summarize_ms(samples), "fire_frames": fire_frames}
+    if detector.latency_budget is not None:
+        stats = detector.latency_budget.metrics()
+        result.update(frames_by_mode=stats["frames"], degradations=stats["degradations"],
+                      restorations=stats["restorations"], final_mode=stats["mode"])
+    return result
+
+
+def measure(case: dict, contention: int) -> dict:
+    """Run a case in a fresh process next to `contention` busy-looping processes"""
+    hogs = [subprocess.Popen([sys.executable, "-c", "while True: pass"]) for _ in range(contention)]
+    try:
+        output = subprocess.run(
+            [sys.executable, __file__, "--case", json.dumps(case)],
+            capture_output=True, text=True, check=True
+        ).stdout
+    finally:
+        for hog in hogs:
+            hog.kill()
+            hog.wait()
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark warmup, thread pinning and the latency budget")
+    parser.add_argument("--model", default=yolo_fire_wrapper.DEFAULT_MODEL, help="Path to YOLO model file")
+    parser.add_argument("--backend", default="torch", choices=["torch", "onnx", "openvino", "torchscript"],
+                        help="Inference backend")
+    parser.add_argument("--imgsz", type=int, default=640, help="Model input resolution")
+    parser.add_argument("--size", default="800x600", help="Camera frame size (WxH)")
+    parser.add_argument("--frames", type=int, default=30, help="Frames timed per case")
+    parser.add_argument("--warmup", type=int, default=3, help="Dummy calls in the warmed-up cases")
+    parser.add_argument("--threads", default="0,1,2,4", help="Comma-separated intra-op thread counts (0 = default)")
+    parser.add_argument("--interop", type=int, default=1, help="Inter-op threads for the thread cases (0 = default)")
+    parser.add_argument("--contention", type=int, default=os.cpu_count() or 1,
+                        help="Busy-looping processes for the contended cases")
+    parser.add_argument("--budget-ms", type=float, default=0.0,
+                        help="Per-frame budget (default: 1.5x the uncontended steady p50)")
+    parser.add_argument("--fallback", default="brightness", help="Comma-separated fallback modes for the budget")
+    parser.add_argument("--strikes", type=int, default=3, help="Over-budget frames before falling back")
+    parser.add_argument("--probe", type=float, default=2.0, help="Seconds between restore attempts")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--case", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        case = json.loads(args.case)
+        run = run_budget_case if case["kind"] == "budget" else run_model_case
+        print(json.dumps(run(case)))
+        return
+
+    if not yolo_fire_wrapper.YOLO_AVAILABLE:
+        print("YOLO not installed. Run: pip install ultralytics", file=sys.stderr)
+        sys.exit(1)
+
+    base = {
+        "kind": "model", "model": args.model, "backend": args.backend, "imgsz": args.imgsz,
+        "size": [int(v) for v in args.size.lower().split("x")], "frames": args.frames,
+        "threads": 0, "interop": 0, "warmup": 0,
+    }
+    report = {"cpu_count": os.cpu_count(), "contention": args.contention}
+
+    # Cold start: the first frames with and without warmup
+    report["cold_start"] = {
+        "no_warmup": measure(base, 0),
+        f"warmup_{args.warmup}": measure({**base, "warmup": args.warmup}, 0),
+    }
+
+    # Thread pinning, idle and next to busy processes
+    threads = {}
+    for count in (int(v) for v in args.threads.split(",") if v.strip()):
+        case = {**base, "threads": count, "interop": args.interop, "warmup": args.warmup}
+        threads[f"intra_{count or 'default'}"] = {
+            "idle": measure(case, 0)["steady"],
+            "contended": measure(case, args.contention)["steady"],
+        }
+    report["threads"] = threads
+
+    # Latency budget under contention
+    budget_ms = args.budget_ms or round(report["cold_start"][f"warmup_{args.warmup}"]["steady"]["p50_ms"] * 1.5, 1)
+    budget_case = {
+        **base, "kind": "budget", "warmup": args.warmup, "budget_ms": 0.0,
+        "fallback": [v.strip() for v in args.fallback.split(",") if v.strip()],
+        "strikes": args.strikes, "probe": args.probe,
+    }
+    report["budget"] = {
+        "budget_ms": budget_ms,
+        "off": measure(budget_case, args.contention),
+        "on": measure({**budget_case, "budget_ms": budget_ms}, args.contention),
+    }
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
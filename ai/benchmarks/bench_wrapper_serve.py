@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: yolo_fire_wrapper.py spawn-per-image vs --serve
+
+Measures per-frame latency of the current Node integration path (one
+`python3 yolo_fire_wrapper.py <image>` process per frame) against a single
+long-lived `--serve` process answering NDJSON requests on stdin.
+
+Usage:
+    python benchmarks/bench_wrapper_serve.py [--frames 20] [--image <path>] [--mock] [--json]
+"""
+
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+from common import WRAPPER_PATH, make_test_image, print_report, summarize_ms
+
+
+def wrapper_args(args):
+    """Flags shared by both invocation modes"""
+    # The same image is sent every frame; measure detection, not cache hits
+    extra = ["--conf", str(args.conf), "--no-cache"]
+    if args.model:
+        extra += ["--model", args.model]
+    if args.mock:
+        extra.append("--mock")
+    return extra
+
+
+def bench_spawn(image_path: str, args):
+    """Launch one wrapper process per frame, as ingestFromEsp32.js does"""
+    samples = []
+    for _ in range(args.frames):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, str(WRAPPER_PATH), image_path] + wrapper_args(args),
+            capture_output=True, text=True, check=True
+        )
+        json.loads(proc.stdout)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_serve(image_path: str, args):
+    """Start one --serve process and send it one request per frame"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(WRAPPER_PATH), "--serve"] + wrapper_args(args),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, bufsize=1
+    )
+    
+    def request(frame_id):
+        proc.stdin.write(json.dumps({"id": frame_id, "image_path": image_path}) + "\n")
+        proc.stdin.flush()
+        return json.loads(proc.stdout.readline())
+    
+    try:
+        # First response includes interpreter start and model load
+        request(-1)
+        startup = time.perf_counter() - start
+        
+        samples = []
+        for frame_id in range(args.frames):
+            t0 = time.perf_counter()
+            request(frame_id)
+            samples.append(time.perf_counter() - t0)
+    finally:
+        proc.stdin.close()
+        proc.wait(timeout=30)
+    return startup, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark wrapper spawn-per-image vs --serve")
+    parser.add_argument("--frames", type=int, default=20, help="Frames per mode")
+    parser.add_argument("--image", default=None, help="Image to detect (default: synthetic frame)")
+    parser.add_argument("--model", default=None, help="Path to YOLO model file")
+    parser.add_argument("--conf", type=float, default=0.5, help="Confidence threshold")
+    parser.add_argument("--mock", action="store_true", help="Benchmark the mock detector")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    image_path = args.image or make_test_image()
+    
+    spawn = summarize_ms(bench_spawn(image_path, args))
+    startup, serve_samples = bench_serve(image_path, args)
+    serve = summarize_ms(serve_samples)
+    
+    report = {
+        "image": image_path,
+        "mode": "mock" if args.mock else "yolo",
+        "spawn_per_image": spawn,
+        "serve": {"startup_ms": round(startup * 1000, 3), **serve},
+        "speedup_p50": round(spawn["p50_ms"] / serve["p50_ms"], 1) if serve["p50_ms"] else None,
+    }
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Shared helpers for the AI module benchmarks
+
+Benchmarks live in ai/benchmarks/ and import the detector modules from ai/,
+so this module puts ai/ on sys.path when imported.
+"""
+
+import os
+import sys
+import json
+import math
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+AI_DIR = Path(__file__).resolve().parent.parent
+if str(AI_DIR) not in sys.path:
+    sys.path.insert(0, str(AI_DIR))
+
+WRAPPER_PATH = AI_DIR / "yolo_fire_wrapper.py"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (pct in 0-100)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_ms(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples given in seconds as milliseconds"""
+    if not samples:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def make_test_image(
+    path: Optional[str] = None,
+    size=(640, 480),
+    fire: bool = True
+) -> str:
+    """
+    Write a synthetic JPEG test frame and return its path
+    
+    With fire=True an orange blob is drawn so the brightness detector fires.
+    """
+    from PIL import Image, ImageDraw
+    
+    if path is None:
+        name = "bench_fire.jpg" if fire else "bench_clear.jpg"
+        path = os.path.join(tempfile.mkdtemp(prefix="fire_bench_"), name)
+    
+    img = Image.new("RGB", size, (40, 45, 50))
+    if fire:
+        draw = ImageDraw.Draw(img)
+        w, h = size
+        draw.ellipse((w * 0.4, h * 0.5, w * 0.6, h * 0.8), fill=(250, 140, 30))
+        draw.ellipse((w * 0.45, h * 0.55, w * 0.55, h * 0.75), fill=(255, 240, 200))
+    img.save(path, format="JPEG", quality=90)
+    return path
+
+
+def print_report(report: dict, as_json: bool = False):
+    """Print a benchmark report as JSON or as indented key/value lines"""
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return
+    
+    def _print(obj, indent=0):
+        for key, value in obj.items():
+            if isinstance(value, dict):
+                print(f"{'  ' * indent}{key}:")
+                _print(value, indent + 1)
+            else:
+                print(f"{'  ' * indent}{key}: {value}")
+    _print(report)
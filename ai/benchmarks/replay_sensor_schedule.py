@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Replay: sensor-driven capture cadence vs a fixed interval
+
+Replays a recorded gateway stream (data/local-buffer.ndjson) through
+SensorSchedule on the recording's own clock and simulates the captures one
+camera would make, compared with polling at a fixed --interval:
+
+- captures and captures/min: the inference CPU spent
+- elevated_share: fraction of captures made while some node was elevated
+  (WARNING/DANGER or flame with low light, plus the hold time)
+- reaction_s: delay from the start of an elevated period to the next capture
+- live_captures: captures while the gateway was reporting (gaps longer than
+  --stale-after use the fixed interval in both modes)
+
+Usage:
+    python benchmarks/replay_sensor_schedule.py --log ../data/local-buffer.ndjson
+    python benchmarks/replay_sensor_schedule.py --log ../data/local-buffer.ndjson \\
+        --normal-interval 60 --alert-interval 0.5 --interval 2 --json
+"""
+
+import json
+import argparse
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+
+from common import AI_DIR, print_report
+
+from sensor_schedule import SensorSchedule, risk_reason
+from structured_log import configure_logging
+
+DEFAULT_LOG = AI_DIR.parent / "data" / "local-buffer.ndjson"
+
+
+def load_records(path: str) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return sorted(records, key=lambda r: r["timestamp"])
+
+
+def elevated_windows(records: List[dict], hold: float, ldr_threshold: float) -> List[Tuple[float, float]]:
+    """Merged [start, end) periods during which some node was elevated"""
+    windows: List[Tuple[float, float]] = []
+    for record in records:
+        if risk_reason(record, ldr_threshold) is None:
+            continue
+        ts = record["timestamp"] / 1000
+        if windows and ts <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], ts + hold)
+        else:
+            windows.append((ts, ts + hold))
+    return windows
+
+
+def stale_windows(records: List[dict], stale_after: float) -> List[Tuple[float, float]]:
+    """Gaps in the recording long enough for the schedule to fall back to the fixed interval"""
+    times = [record["timestamp"] / 1000 for record in records]
+    return [(a + stale_after, b) for a, b in zip(times, times[1:]) if b - a > stale_after]
+
+
+def in_windows(t: float, windows: List[Tuple[float, float]]) -> bool:
+    index = bisect_right(windows, (t, float("inf"))) - 1
+    return index >= 0 and windows[index][0] <= t < windows[index][1]
+
+
+def summarize(captures: List[float], windows, stale, span: float) -> dict:
+    elevated = sum(1 for t in captures if in_windows(t, windows))
+    live = sum(1 for t in captures if not in_windows(t, stale))
+    reactions = []
+    for start, _ in windows:
+        index = bisect_left(captures, start)
+        if index < len(captures):
+            reactions.append(captures[index] - start)
+    return {
+        "captures": len(captures),
+        "captures_per_min": round(len(captures) / span * 60, 2) if span else 0.0,
+        "live_captures": live,
+        "elevated_captures": elevated,
+        "elevated_share": round(elevated / len(captures), 3) if captures else 0.0,
+        "reaction_s": {
+            "mean": round(sum(reactions) / len(reactions), 2) if reactions else None,
+            "max": round(max(reactions), 2) if reactions else None,
+        },
+    }
+
+
+def simulate_adaptive(records: List[dict], args) -> List[float]:
+    """Capture times for one camera driven by SensorSchedule on the recording clock"""
+    schedule = SensorSchedule(
+        args.log,
+        normal_interval=args.normal_interval,
+        alert_interval=args.alert_interval,
+        fallback_interval=args.interval,
+        hold=args.hold,
+        stale_after=args.stale_after,
+        ldr_threshold=args.ldr_threshold,
+        from_start=True
+    )
+    start = records[0]["timestamp"] / 1000
+    end = records[-1]["timestamp"] / 1000
+    captures: List[float] = []
+    next_capture = start
+    for record in records:
+        ts = record["timestamp"] / 1000
+        while next_capture <= ts:
+            captures.append(next_capture)
+            next_capture += schedule.interval(now=next_capture)
+        if schedule.update(record, now=ts):
+            # Escalation: immediate capture, then the fast cadence
+            captures.append(ts)
+            next_capture = ts + schedule.interval(now=ts)
+    while next_capture <= end:
+        captures.append(next_capture)
+        next_capture += schedule.interval(now=next_capture)
+    return sorted(captures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a gateway sensor stream through SensorSchedule")
+    parser.add_argument("--log", default=str(DEFAULT_LOG), help="Gateway NDJSON stream")
+    parser.add_argument("--interval", type=float, default=2.0, help="Fixed-cadence baseline (and stale fallback)")
+    parser.add_argument("--normal-interval", type=float, default=30.0, help="Capture period while NORMAL")
+    parser.add_argument("--alert-interval", type=float, default=0.5, help="Capture period while elevated")
+    parser.add_argument("--hold", type=float, default=60.0, help="Seconds to stay fast after an elevated reading")
+    parser.add_argument("--stale-after", type=float, default=120.0, help="Seconds without readings before fallback")
+    parser.add_argument("--ldr-threshold", type=float, default=200, help="Raw LDR threshold for flame readings")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    configure_logging(level="ERROR")
+
+    records = load_records(args.log)
+    if not records:
+        parser.error("no records in the sensor log")
+    start = records[0]["timestamp"] / 1000
+    end = records[-1]["timestamp"] / 1000
+    span = end - start
+    windows = elevated_windows(records, args.hold, args.ldr_threshold)
+    stale = stale_windows(records, args.stale_after)
+
+    fixed = [start + i * args.interval for i in range(int(span // args.interval) + 1)]
+    adaptive = simulate_adaptive(records, args)
+
+    report = {
+        "records": len(records),
+        "span_s": round(span, 1),
+        "elevated_periods": len(windows),
+        "elevated_s": round(sum(min(e, end) - s for s, e in windows), 1),
+        "stale_s": round(sum(e - s for s, e in stale), 1),
+        "fixed": summarize(fixed, windows, stale, span),
+        "adaptive": summarize(adaptive, windows, stale, span),
+    }
+    if report["fixed"]["live_captures"]:
+        report["live_capture_ratio"] = round(
+            report["adaptive"]["live_captures"] / report["fixed"]["live_captures"], 3
+        )
+    print_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Replay: temporal alert smoothing over recorded frame sequences
+
+Feeds per-frame verdicts through AlertSmoother and compares the number of
+alerts (upload + Firestore event) with and without smoothing. Verdicts come
+from an NDJSON recording ({"camera": ..., "fire": true, "confidence": 0.8}
+per line), from a directory of JPEG frames scored with the brightness
+detector, or, with no input, from built-in scenarios whose expected alarm
+transitions are checked (exit status 1 on a mismatch).
+
+Usage:
+    python benchmarks/replay_smoothing.py [--mode ema|kofn] [--json]
+    python benchmarks/replay_smoothing.py --sequence verdicts.ndjson
+    python benchmarks/replay_smoothing.py --frames captures/ --mode kofn --k 2 --n 4
+"""
+
+import sys
+import json
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+from common import print_report
+
+from alert_smoother import CLEARED, RAISED, replay
+
+FIRE = (True, 0.85)
+CLEAR = (False, 0.0)
+
+# name -> (verdicts, expected transitions for the default ema and kofn settings)
+SCENARIOS = {
+    "single_flicker": (
+        [CLEAR] * 10 + [FIRE] + [CLEAR] * 10,
+        {"ema": [], "kofn": []},
+    ),
+    "sustained_fire": (
+        [CLEAR] * 5 + [FIRE] * 30 + [CLEAR] * 10,
+        {"ema": [RAISED, CLEARED], "kofn": [RAISED, CLEARED]},
+    ),
+    "flickering_fire": (
+        [CLEAR] * 5 + [FIRE, FIRE, CLEAR] * 10 + [CLEAR] * 10,
+        {"ema": [RAISED, CLEARED], "kofn": [RAISED, CLEARED]},
+    ),
+    "two_fires": (
+        [FIRE] * 10 + [CLEAR] * 15 + [FIRE] * 10 + [CLEAR] * 15,
+        {"ema": [RAISED, CLEARED, RAISED, CLEARED], "kofn": [RAISED, CLEARED, RAISED, CLEARED]},
+    ),
+}
+
+
+def load_sequence(path: str) -> dict:
+    """camera -> [(fire, confidence), ...] from an NDJSON recording"""
+    sequences = defaultdict(list)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                sequences[record.get("camera", "default")].append(
+                    (bool(record["fire"]), float(record.get("confidence", 0.0)))
+                )
+    return dict(sequences)
+
+
+def score_frames(directory: str) -> dict:
+    """Score JPEG frames (in name order) with the brightness detector"""
+    from yolo_fire_wrapper import detect_fire_brightness
+
+    verdicts = []
+    for path in sorted(Path(directory).glob("*.jp*g")):
+        result = detect_fire_brightness(str(path))
+        verdicts.append((bool(result.get("fire")), float(result.get("confidence", 0.0))))
+    return {directory: verdicts}
+
+
+def summarize(verdicts, params: dict) -> dict:
+    transitions, smoother = replay(verdicts, **params)
+    stats = smoother.metrics()
+    return {
+        "frames": stats["frames"],
+        "fire_frames": stats["fire_frames"],
+        "alerts_unsmoothed": stats["fire_frames"],
+        "alerts_smoothed": stats["raised"],
+        "transitions": [f"{kind}@{index}" for index, kind in transitions],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay frame verdicts through alert smoothing")
+    parser.add_argument("--sequence", help="NDJSON file of recorded verdicts")
+    parser.add_argument("--frames", help="Directory of JPEG frames to score with the brightness detector")
+    parser.add_argument("--mode", choices=["ema", "kofn"], default="ema", help="Smoothing mode")
+    parser.add_argument("--alpha", type=float, default=0.4, help="EMA weight of the newest frame")
+    parser.add_argument("--on", type=float, default=0.5, help="EMA value that raises the alarm")
+    parser.add_argument("--off", type=float, default=0.2, help="EMA value below which the alarm clears")
+    parser.add_argument("--k", type=int, default=3, help="Fire frames among the last n that raise the alarm")
+    parser.add_argument("--n", type=int, default=5, help="k-of-n window length")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    params = {
+        "mode": args.mode, "alpha": args.alpha, "on_threshold": args.on,
+        "off_threshold": args.off, "k": args.k, "n": args.n,
+    }
+
+    if args.sequence:
+        sequences = load_sequence(args.sequence)
+    elif args.frames:
+        sequences = score_frames(args.frames)
+    else:
+        sequences = None
+
+    report = {"params": params, "sequences": {}}
+    failures = []
+    if sequences is not None:
+        for name, verdicts in sequences.items():
+            report["sequences"][name] = summarize(verdicts, params)
+    else:
+        for name, (verdicts, expected) in SCENARIOS.items():
+            summary = summarize(verdicts, params)
+            kinds = [t.split("@")[0] for t in summary["transitions"]]
+            summary["expected"] = expected[args.mode]
+            summary["ok"] = kinds == expected[args.mode]
+            if not summary["ok"]:
+                failures.append(name)
+            report["sequences"][name] = summary
+
+    print_report(report, args.json)
+    if failures:
+        print(f"✗ Unexpected transitions in: {', '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Multi-camera capture scheduler for the fire detection system
+
+Captures from many ESP32-CAMs concurrently on a fixed cadence per camera and
+feeds every frame into one shared inference stage. A slow /capture on one
+camera only delays that camera; the others keep their schedule.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from structured_log import get_logger, log_event
+
+log = get_logger("scheduler")
+
+
+class CameraStats:
+    """Per-camera counters and lag measurements"""
+
+    def __init__(self):
+        self.captures = 0
+        self.failures = 0
+        self.skipped = 0       # Ticks missed because the previous capture was still running
+        self.dropped = 0       # Frames dropped because the inference queue was full
+        self.last_lag = 0.0    # Seconds between scheduled tick and capture start
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.last_capture_time = 0.0
+
+    def as_dict(self) -> dict:
+        ticks = self.captures + self.failures
+        return {
+            "captures": self.captures,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "dropped": self.dropped,
+            "last_lag_ms": round(self.last_lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "avg_lag_ms": round(self.total_lag / ticks * 1000, 1) if ticks else 0.0,
+            "last_capture_ms": round(self.last_capture_time * 1000, 1),
+        }
+
+
+class CameraScheduler:
+    def __init__(
+        self,
+        camera_urls: List[str],
+        capture_fn: Callable[[str], Optional[bytes]],
+        handle_fn: Callable[[str, bytes], object],
+        interval: float = 2.0,
+        max_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        interval_fn: Optional[Callable[[str], float]] = None
+    ):
+        """
+        Initialize the scheduler
+
+        Args:
+            camera_urls: ESP32-CAM /capture endpoint URLs
+            capture_fn: Fetches one frame from a camera URL (None on failure)
+            handle_fn: Shared inference stage, called as handle_fn(camera_url, image_bytes)
+            interval: Capture period per camera in seconds
+            max_workers: Capture threads (default: one per camera)
+            queue_size: Max frames waiting for inference (default: 2 per camera)
+            interval_fn: Per-camera capture period, re-read after every tick
+                (default: the fixed interval)
+        """
+        if not camera_urls:
+            raise ValueError("At least one camera URL is required")
+
+        self.camera_urls = list(camera_urls)
+        self.capture_fn = capture_fn
+        self.handle_fn = handle_fn
+        self.interval = interval
+        self.interval_fn = interval_fn or (lambda url: self.interval)
+        self.max_workers = max_workers or len(self.camera_urls)
+        self.frames = queue.Queue(maxsize=queue_size or 2 * len(self.camera_urls))
+
+        self.stats: Dict[str, CameraStats] = {url: CameraStats() for url in self.camera_urls}
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._captures_done = threading.Event()
+        self._wake = threading.Event()
+        self._triggered = set()
+
+    def _capture(self, url: str, scheduled: float):
+        """Capture one frame and hand it to the inference stage"""
+        started = time.monotonic()
+        image_bytes = None
+        try:
+            image_bytes = self.capture_fn(url)
+        finally:
+            elapsed = time.monotonic() - started
+            lag = started - scheduled
+            with self._lock:
+                stats = self.stats[url]
+                stats.last_lag = lag
+                stats.max_lag = max(stats.max_lag, lag)
+                stats.total_lag += lag
+                stats.last_capture_time = elapsed
+                if image_bytes:
+                    stats.captures += 1
+                else:
+                    stats.failures += 1
+                self._in_flight.discard(url)
+
+        if image_bytes:
+            try:
+                self.frames.put_nowait((url, image_bytes))
+            except queue.Full:
+                with self._lock:
+                    self.stats[url].dropped += 1
+
+    def _inference_loop(self):
+        """Single consumer running the shared inference stage"""
+        while not self._captures_done.is_set() or not self.frames.empty():
+            try:
+                url, image_bytes = self.frames.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                self.handle_fn(url, image_bytes)
+            except Exception as e:
+                log_event(log, "frame_failed", f"✗ Error processing frame from {url}: {e}",
+                          level=logging.ERROR, camera_url=url, error=str(e))
+            finally:
+                self.frames.task_done()
+
+    def run(self, duration: Optional[float] = None):
+        """
+        Run the capture schedule until stop() is called or duration elapses
+
+        Each camera is due every `interval` seconds from its own start time.
+        A camera whose previous capture is still running skips that tick
+        instead of queueing captures behind it.
+        """
+        self._stop.clear()
+        self._captures_done.clear()
+        worker = threading.Thread(target=self._inference_loop, name="inference", daemon=True)
+        worker.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="capture") as pool:
+                self._schedule(pool, duration)
+        finally:
+            # In-flight captures have finished; let the inference stage drain
+            self._stop.set()
+            self._captures_done.set()
+            worker.join()
+
+    def _schedule(self, pool: ThreadPoolExecutor, duration: Optional[float]):
+        """Submit captures on each camera's fixed grid until stopped"""
+        start = time.monotonic()
+        next_due = {url: start for url in self.camera_urls}
+
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if duration is not None and now - start >= duration:
+                break
+
+            self._wake.clear()
+            with self._lock:
+                triggered, self._triggered = self._triggered, set()
+            for url in triggered & next_due.keys():
+                next_due[url] = min(next_due[url], now)
+
+            for url in self.camera_urls:
+                due = next_due[url]
+                if now < due:
+                    continue
+
+                with self._lock:
+                    busy = url in self._in_flight
+                    if busy:
+                        self.stats[url].skipped += 1
+                    else:
+                        self._in_flight.add(url)
+                if not busy:
+                    pool.submit(self._capture, url, due)
+
+                # Stay on the camera's grid; count whole periods we fell behind
+                interval = self.interval_fn(url)
+                missed = int((now - due) // interval)
+                if missed:
+                    with self._lock:
+                        self.stats[url].skipped += missed
+                next_due[url] = due + (missed + 1) * interval
+
+            wait = min(next_due.values()) - time.monotonic()
+            if wait > 0:
+                self._wake.wait(wait)
+
+    def trigger(self, url: Optional[str] = None):
+        """Capture from a camera (None = every camera) now instead of at its next tick"""
+        with self._lock:
+            self._triggered.update(self.camera_urls if url is None else [url])
+        self._wake.set()
+
+    def stop(self):
+        """Stop scheduling new captures; queued frames are still processed"""
+        self._stop.set()
+        self._wake.set()
+
+    def metrics(self) -> dict:
+        """Per-camera lag and counter snapshot plus the inference queue depth"""
+        with self._lock:
+            cameras = {url: stats.as_dict() for url, stats in self.stats.items()}
+        return {
+            "queue_depth": self.frames.qsize(),
+            "cameras": cameras,
+        }
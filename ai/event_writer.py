@@ -0,0 +1,202 @@
+"""
+Batched, coalescing Firestore event writer
+
+A sustained fire produces a DANGER event every few seconds per camera, all
+nearly identical. EventWriter takes events off the detection loop, merges
+consecutive events from the same camera into one incident document (with a
+count and first/last timestamps), and writes everything with Firestore
+batch commits, flushed when the batch is full or every flush_interval
+seconds.
+"""
+
+import itertools
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from structured_log import get_logger, log_event
+
+log = get_logger("events")
+
+
+class _Incident:
+    """One coalesced event document and its unwritten changes"""
+
+    def __init__(self, ref, data: dict):
+        self.ref = ref
+        self.data = data
+        self.written = False
+        self.dirty = False  # Queued in EventWriter._dirty
+
+
+class EventWriter:
+    def __init__(
+        self,
+        db,
+        collection: str = "events",
+        max_batch: int = 20,
+        flush_interval: float = 1.0,
+        coalesce_window: float = 30.0
+    ):
+        """
+        Initialize the writer
+
+        Args:
+            db: Firestore client (or local_fakes.FakeFirestore)
+            collection: Target collection
+            max_batch: Flush as soon as this many documents have pending changes
+            flush_interval: Flush pending changes at least this often (seconds)
+            coalesce_window: Events from the same camera less than this many
+                seconds apart are merged into one incident document
+        """
+        self.db = db
+        self.collection = collection
+        self.max_batch = max(1, min(max_batch, 500))  # Firestore batch limit
+        self.flush_interval = flush_interval
+        self.coalesce_window_ms = int(coalesce_window * 1000)
+
+        self._incidents: Dict[Optional[str], _Incident] = {}
+        self._dirty: List[_Incident] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.commits = 0
+        self.documents_written = 0
+        self.errors = 0
+
+    def start(self) -> "EventWriter":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Flush everything pending and stop the writer thread"""
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def submit(self, event_data: dict, camera: Optional[str] = None) -> str:
+        """
+        Queue a DANGER event without blocking on Firestore
+
+        Returns:
+            ID of the document the event was written or merged into
+        """
+        timestamp = event_data["timestamp"]
+        with self._lock:
+            self.submitted += 1
+            incident = self._incidents.get(camera)
+            if incident and timestamp - incident.data["last_timestamp"] <= self.coalesce_window_ms:
+                self._merge(incident, event_data)
+                self.coalesced += 1
+            else:
+                data = {
+                    **event_data,
+                    "count": 1,
+                    "first_timestamp": timestamp,
+                    "last_timestamp": timestamp,
+                }
+                ref = self.db.collection(self.collection).document()
+                incident = self._incidents[camera] = _Incident(ref, data)
+            self._mark_dirty(incident)
+            full = len(self._dirty) >= self.max_batch
+
+        if full:
+            self._wake.set()
+        return incident.ref.id
+
+    def update(self, doc_id: str, fields: dict) -> bool:
+        """
+        Patch fields of an already submitted event (e.g. a late image URL)
+
+        Returns:
+            False if the document is no longer tracked by this writer
+        """
+        with self._lock:
+            # An incident replaced by a newer one may still be waiting in _dirty
+            for incident in itertools.chain(self._incidents.values(), self._dirty):
+                if incident.ref.id == doc_id:
+                    incident.data.update(fields)
+                    self._mark_dirty(incident)
+                    return True
+        return False
+
+    def _mark_dirty(self, incident: _Incident):
+        if not incident.dirty:
+            incident.dirty = True
+            self._dirty.append(incident)
+
+    @staticmethod
+    def _merge(incident: _Incident, event_data: dict):
+        data = incident.data
+        data["count"] += 1
+        data["last_timestamp"] = max(data["last_timestamp"], event_data["timestamp"])
+        data["ai_confidence"] = max(data.get("ai_confidence") or 0.0, event_data.get("ai_confidence") or 0.0)
+        # Keep the incident's first frame and pre-fire clip; fill them in if it had none
+        for field in ("image_url", "clip_url"):
+            if not data.get(field) and event_data.get(field):
+                data[field] = event_data[field]
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Commit pending changes in batches of at most max_batch documents"""
+        while True:
+            with self._lock:
+                batch_items = self._dirty[:self.max_batch]
+                if not batch_items:
+                    return
+                ops = []
+                for incident in batch_items:
+                    ops.append((incident, incident.written, dict(incident.data)))
+                    incident.dirty = False
+                del self._dirty[:len(batch_items)]
+
+            batch = self.db.batch()
+            for incident, written, data in ops:
+                if written:
+                    batch.update(incident.ref, data)
+                else:
+                    batch.set(incident.ref, data)
+            try:
+                batch.commit()
+            except Exception as e:
+                log_event(log, "event_commit_failed", f"✗ Failed to commit {len(ops)} events to Firestore: {e}",
+                          level=logging.ERROR, events=len(ops), error=str(e))
+                with self._lock:
+                    self.errors += 1
+                    for incident, _, _ in ops:
+                        self._mark_dirty(incident)
+                # Retry on the next flush instead of spinning
+                return
+
+            with self._lock:
+                self.commits += 1
+                self.documents_written += len(ops)
+                for incident, _, _ in ops:
+                    incident.written = True
+            log_event(log, "events_committed", f"✓ {len(ops)} DANGER event(s) committed to Firestore", events=len(ops))
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "commits": self.commits,
+                "documents_written": self.documents_written,
+                "pending": len(self._dirty),
+                "errors": self.errors,
+            }
@@ -10,27 +10,43 @@ This script:
 
 import os
 import time
+import threading
+import logging
 import requests
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+import importlib.util
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
 
-# Google Cloud Storage
-from google.cloud import storage
-from google.oauth2 import service_account
+from alert_smoother import CLEARED, RAISED, AlertSmoother
+from batch_inference import FrameBatcher
+from camera_scheduler import CameraScheduler
+from event_writer import EventWriter
+from frame_ring import FrameRing
+from inference_pool import InferencePool, parse_fire_boxes, parse_fire_result
+from latency_budget import BRIGHTNESS, LatencyBudget
+from metrics import MetricsRegistry, MetricsServer
+from mjpeg_stream import MJPEGStream, stream_url_for
+from pipeline import Pipeline, Stage
+from sensor_schedule import SensorSchedule
+from structured_log import configure_logging, get_logger, log_event
+from synthetic_detector import LATENCY_DISTRIBUTIONS, SyntheticDetector
+from upload_manager import UploadManager
 
-# Firebase
-import firebase_admin
-from firebase_admin import credentials, firestore
+# Heavy dependencies (Google Cloud, Firebase Admin, ultralytics/torch, and
+# NumPy/PIL for decoding) are imported on the code path that needs them, so
+# --help and health checks don't pay seconds of import time.
+if TYPE_CHECKING:
+    from motion_gate import MotionGate
+
+log = get_logger("detection")
 
 # AI Model (example with YOLO - adjust based on your model)
-try:
-    from ultralytics import YOLO
-    YOLO_AVAILABLE = True
-except ImportError:
-    YOLO_AVAILABLE = False
-    print("Warning: YOLO not available. Install with: pip install ultralytics")
+YOLO_AVAILABLE = importlib.util.find_spec("ultralytics") is not None
+if not YOLO_AVAILABLE:
+    log_event(log, "yolo_unavailable", "Warning: YOLO not available. Install with: pip install ultralytics",
+              level=logging.WARNING)
 
 
 class FireDetectionAI:
@@ -40,7 +56,11 @@ class FireDetectionAI:
         gcs_bucket_name: str,
         gcs_service_account_path: str,
         firebase_credentials_path: Optional[str] = None,
-        model_path: Optional[str] = None
+        model_path: Optional[str] = None,
+        backend: str = "torch",
+        imgsz: int = 640,
+        threads: Optional[int] = None,
+        interop_threads: Optional[int] = None
     ):
         """
         Initialize Fire Detection AI System
@@ -51,10 +71,67 @@ class FireDetectionAI:
             gcs_service_account_path: Path to GCS service account JSON file
             firebase_credentials_path: Path to Firebase service account JSON (optional, uses default if None)
             model_path: Path to fire detection model file (optional)
+            backend: Inference backend: torch, onnx, openvino or torchscript.
+                Non-torch backends export the model once and reuse the cached export.
+            imgsz: Model input resolution
+            threads: Intra-op inference threads (None = one per core)
+            interop_threads: Inter-op inference threads (None = library default)
         """
         self.esp32_cam_url = esp32_cam_url
         self.gcs_bucket_name = gcs_bucket_name
         
+        # Always-on counters and stage latency histograms
+        self._init_metrics()
+        
+        # Reuse HTTP connections to the cameras across frames
+        self.session = requests.Session()
+        self.scheduler: Optional[CameraScheduler] = None
+        
+        # MJPEG stream readers per camera URL (None config = poll /capture)
+        self.stream_config: Optional[dict] = None
+        self.streams: Dict[str, MJPEGStream] = {}
+        
+        # Background upload/Firestore stages while a continuous loop is running
+        self.pipeline: Optional[Pipeline] = None
+        
+        # Capture cadence driven by the gateway sensor stream (None = fixed interval)
+        self.sensor_schedule: Optional[SensorSchedule] = None
+        self._capture_wake = threading.Event()
+        
+        # Seeded stand-in for the model in load tests (None = real model)
+        self.synthetic_detector: Optional[SyntheticDetector] = None
+        
+        # Worker processes with their own models (None = in-process inference)
+        self.inference_pool: Optional[InferencePool] = None
+        
+        # Per-frame inference budget with cheaper fallback modes (None = always the full model)
+        self.latency_budget: Optional[LatencyBudget] = None
+        self.fallback_models: Dict[int, object] = {}
+        
+        # Dummy inference runs at startup (None = the first frames pay for lazy init)
+        self.warmup_config: Optional[dict] = None
+        
+        # Region-of-interest tiling (None = whole frame at imgsz)
+        self.tiling_config: Optional[dict] = None
+        
+        # Per-camera motion gates (None = every frame runs inference)
+        self.motion_gate_config: Optional[dict] = None
+        self.motion_gates: Dict[Optional[str], "MotionGate"] = {}
+        
+        # Per-camera alarm state machines (None = every fire frame alerts)
+        self.smoothing_config: Optional[dict] = None
+        self.smoothers: Dict[Optional[str], AlertSmoother] = {}
+        
+        # Per-camera rings of recent frames for pre-fire clips (None = upload only the fire frame)
+        self.clip_config: Optional[dict] = None
+        self.frame_rings: Dict[Optional[str], FrameRing] = {}
+        
+        # Batched, coalescing Firestore writes (None = one add() per event)
+        self.event_writer: Optional[EventWriter] = None
+        
+        # Spooled background GCS uploads (None = synchronous upload_to_gcs)
+        self.uploader: Optional[UploadManager] = None
+        
         # Initialize GCS client
         self._init_gcs_client(gcs_service_account_path)
         
@@ -62,10 +139,128 @@ class FireDetectionAI:
         self._init_firebase(firebase_credentials_path)
         
         # Initialize AI model
+        self.backend = backend
+        self.imgsz = imgsz
+        self.model_path = model_path
+        # Decode JPEGs at reduced scale down to the model input size (None = full resolution)
+        self.decode_size: Optional[int] = imgsz
+        # Pin the inference thread pools before the model load imports torch
+        self.thread_config: Optional[dict] = None
+        if threads or interop_threads:
+            from model_backends import configure_threads
+            self.thread_config = configure_threads(threads, interop_threads)
+            log_event(
+                log, "inference_threads",
+                f"🧵 Inference threads: {self.thread_config['intra_op'] or 'default'} intra-op, "
+                f"{self.thread_config['inter_op'] or 'default'} inter-op",
+                **self.thread_config
+            )
         self.model = self._load_model(model_path)
     
+    def _init_metrics(self):
+        """Create the metrics registry, hot-path counters and stage histograms"""
+        self.metrics = MetricsRegistry()
+        self.metrics_server: Optional[MetricsServer] = None
+        self.stage_seconds = self.metrics.histogram(
+            "fire_stage_seconds", "Time spent per stage (capture, decode, inference, upload, firestore)"
+        )
+        self.captures_total = self.metrics.counter("fire_captures_total", "Frames captured, by source")
+        self.frames_total = self.metrics.counter("fire_frames_total", "Frames that reached a fire verdict")
+        self.detections_total = self.metrics.counter("fire_detections_total", "Frames with fire detected")
+        self.alerts_total = self.metrics.counter("fire_alerts_total", "Fire frames uploaded and logged as DANGER events")
+        self.errors_total = self.metrics.counter("fire_errors_total", "Failures, by stage")
+        self.sensor_escalations_total = self.metrics.counter(
+            "fire_sensor_escalations_total", "Switches to fast capture driven by sensor readings, by reason"
+        )
+        self.tiles_total = self.metrics.counter("fire_roi_crops_total", "Native-resolution crops run with --tiled")
+        self.clips_total = self.metrics.counter("fire_clips_total", "Pre-fire clips uploaded with DANGER events")
+        self.metrics.register_collector(self._collect_component_metrics)
+    
+    def _collect_component_metrics(self):
+        """Scrape-time samples from components that keep their own counters"""
+        skipped = ("fire_frames_skipped_total", "counter", "Frames not run through inference, by reason")
+        for camera_url, gate in list(self.motion_gates.items()):
+            yield (*skipped, {"reason": "motion", "camera": camera_url or ""}, gate.skipped)
+        if self.scheduler is not None:
+            for camera_url, stats in self.scheduler.metrics()["cameras"].items():
+                yield (*skipped, {"reason": "capture_overrun", "camera": camera_url}, stats["skipped"])
+                yield (*skipped, {"reason": "inference_queue_full", "camera": camera_url}, stats["dropped"])
+        for camera_url, stream in list(self.streams.items()):
+            yield (*skipped, {"reason": "stream_stale", "camera": camera_url}, stream.metrics()["frames_dropped"])
+        
+        pipeline = self.pipeline
+        if pipeline is not None:
+            for name, stats in pipeline.metrics().items():
+                if name == "detect":
+                    yield (*skipped, {"reason": "pipeline_full", "camera": ""}, stats["dropped"])
+                yield ("fire_queue_depth", "gauge", "Items waiting per pipeline stage", {"stage": name}, stats["depth"])
+        
+        schedule = self.sensor_schedule
+        if schedule is not None:
+            cameras = self.scheduler.camera_urls if self.scheduler is not None else [self.esp32_cam_url]
+            for camera_url in cameras:
+                yield ("fire_capture_interval_seconds", "gauge", "Current capture period per camera",
+                       {"camera": camera_url}, schedule.interval(camera_url))
+        
+        retries = ("fire_retries_total", "counter", "Failed attempts that will be retried, by component")
+        uploader = self.uploader
+        if uploader is not None:
+            stats = uploader.metrics()
+            yield (*retries, {"component": "upload"}, stats["failed_attempts"])
+            yield ("fire_upload_spool_pending", "gauge", "Frames waiting in the upload spool", {}, stats["pending"])
+        for camera_url, ring in list(self.frame_rings.items()):
+            yield ("fire_clip_buffer_bytes", "gauge", "Frame bytes held for pre-fire clips",
+                   {"camera": camera_url or ""}, ring.metrics()["bytes_used"])
+        
+        event_writer = self.event_writer
+        if event_writer is not None:
+            stats = event_writer.metrics()
+            yield (*retries, {"component": "firestore"}, stats["errors"])
+            yield ("fire_events_pending", "gauge", "Event documents waiting for a batch commit", {}, stats["pending"])
+        
+        budget = self.latency_budget
+        if budget is not None:
+            stats = budget.metrics()
+            yield ("fire_inference_fallback_level", "gauge", "Latency budget fallback level (0 = full model)",
+                   {"mode": stats["mode"]}, stats["fallback_level"])
+            yield ("fire_inference_degradations_total", "counter", "Steps down to a cheaper mode after blowing the latency budget",
+                   {}, stats["degradations"])
+            for mode, frames in stats["frames"].items():
+                yield ("fire_inference_frames_total", "counter", "Frames run under the latency budget, by mode",
+                       {"mode": mode}, frames)
+    
+    def start_metrics_server(self, port: int = 9108, host: str = "127.0.0.1") -> MetricsServer:
+        """Serve the metrics in Prometheus text format at http://host:port/metrics"""
+        self.stop_metrics_server()
+        self.metrics_server = MetricsServer(self.metrics, port=port, host=host).start()
+        log_event(log, "metrics_server", f"📈 Metrics endpoint: {self.metrics_server.url}", url=self.metrics_server.url)
+        return self.metrics_server
+    
+    def stop_metrics_server(self):
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+    
+    def print_stage_metrics(self):
+        """Log per-stage latency percentiles (bucket estimates) for the run"""
+        for stage in ("capture", "decode", "inference", "upload", "firestore"):
+            stats = self.stage_seconds.snapshot(stage=stage)
+            if not stats["count"]:
+                continue
+            log_event(
+                log, "stage_summary",
+                f"⏱ {stage}: {stats['count']} call(s), mean {stats['mean'] * 1000:.1f} ms, "
+                f"p95 <= {stats['p95'] * 1000:g} ms",
+                stage=stage, count=stats["count"], mean_ms=round(stats["mean"] * 1000, 2),
+                p50_ms=round(stats["p50"] * 1000, 3), p95_ms=round(stats["p95"] * 1000, 3),
+                p99_ms=round(stats["p99"] * 1000, 3)
+            )
+    
     def _init_gcs_client(self, service_account_path: str):
         """Initialize Google Cloud Storage client"""
+        from google.cloud import storage
+        from google.oauth2 import service_account
+        
         if not os.path.exists(service_account_path):
             raise FileNotFoundError(
                 f"GCS service account file not found: {service_account_path}\n"
@@ -80,14 +275,18 @@ class FireDetectionAI:
             project=credentials.project_id
         )
         self.bucket = self.gcs_client.bucket(self.gcs_bucket_name)
-        print(f"✓ GCS client initialized. Bucket: {self.gcs_bucket_name}")
+        log_event(log, "gcs_ready", f"✓ GCS client initialized. Bucket: {self.gcs_bucket_name}",
+                  bucket=self.gcs_bucket_name)
     
     def _init_firebase(self, credentials_path: Optional[str]):
         """Initialize Firebase Admin SDK"""
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+        
         try:
             # Check if Firebase is already initialized
             firebase_admin.get_app()
-            print("✓ Firebase already initialized")
+            log_event(log, "firebase_ready", "✓ Firebase already initialized")
         except ValueError:
             # Initialize Firebase
             if credentials_path and os.path.exists(credentials_path):
@@ -97,42 +296,117 @@ class FireDetectionAI:
                 cred = credentials.ApplicationDefault()
             
             firebase_admin.initialize_app(cred)
-            print("✓ Firebase initialized")
+            log_event(log, "firebase_ready", "✓ Firebase initialized")
         
         self.db = firestore.client()
     
     def _load_model(self, model_path: Optional[str]):
         """Load fire detection model"""
         if not YOLO_AVAILABLE:
-            print("⚠ YOLO not available. Using mock detection.")
+            log_event(log, "mock_detection", "⚠ YOLO not available. Using mock detection.", level=logging.WARNING)
             return None
         
         if model_path and os.path.exists(model_path):
-            model = YOLO(model_path)
-            print(f"✓ Fire detection model loaded: {model_path}")
+            from model_backends import load_model
+            model = load_model(model_path, self.backend, self.imgsz)
+            log_event(log, "model_loaded", f"✓ Fire detection model loaded: {model_path} ({self.backend}, imgsz={self.imgsz})",
+                      model_path=model_path, backend=self.backend, imgsz=self.imgsz)
             return model
         else:
             # Try to use a pre-trained fire detection model
             try:
                 # Example: Use a general YOLO model and fine-tune for fire detection
                 # Or use a specific fire detection model
-                print("⚠ No model path provided. Using default YOLO model.")
-                print("  For production, use a trained fire detection model.")
+                log_event(log, "no_model", "⚠ No model path provided. Using default YOLO model.\n"
+                          "  For production, use a trained fire detection model.", level=logging.WARNING)
                 return None
             except Exception as e:
-                print(f"⚠ Could not load model: {e}")
+                log_event(log, "model_error", f"⚠ Could not load model: {e}", level=logging.ERROR, error=str(e))
                 return None
     
-    def capture_image(self) -> Optional[bytes]:
-        """Capture image from ESP32-CAM"""
+    def capture_image(self, camera_url: Optional[str] = None) -> Optional[bytes]:
+        """
+        Capture image from ESP32-CAM (defaults to esp32_cam_url)
+        
+        With streaming enabled this returns the newest frame of the camera's
+        MJPEG stream, falling back to a /capture request when the stream has
+        no fresh frame.
+        """
+        url = camera_url or self.esp32_cam_url
+        start = time.perf_counter()
+        if self.stream_config is not None:
+            image_bytes = self._stream_for(url).read(timeout=self.stream_config["read_timeout"])
+            if image_bytes:
+                self.stage_seconds.observe(time.perf_counter() - start, stage="capture")
+                self.captures_total.inc(source="stream")
+                return image_bytes
+            log_event(log, "stream_fallback", f"⚠ No fresh frame on MJPEG stream for {url}, falling back to /capture",
+                      level=logging.WARNING, camera_url=url)
         try:
-            response = requests.get(self.esp32_cam_url, timeout=5)
+            response = self.session.get(url, timeout=5)
             response.raise_for_status()
+            self.stage_seconds.observe(time.perf_counter() - start, stage="capture")
+            self.captures_total.inc(source="capture")
             return response.content
         except requests.exceptions.RequestException as e:
-            print(f"✗ Failed to capture image from ESP32-CAM: {e}")
+            self.errors_total.inc(stage="capture")
+            log_event(log, "capture_failed", f"✗ Failed to capture image from ESP32-CAM {url}: {e}",
+                      level=logging.ERROR, camera_url=url, error=str(e))
             return None
     
+    def enable_streaming(
+        self,
+        stream_urls: Optional[Dict[str, str]] = None,
+        port: int = 81,
+        max_age: float = 2.0,
+        read_timeout: float = 1.0
+    ):
+        """
+        Capture from each camera's MJPEG stream instead of polling /capture
+        
+        Each camera gets one persistent stream connection, opened on first
+        capture. Frames arriving faster than they are captured are dropped so
+        detection always sees the newest one.
+        
+        Args:
+            stream_urls: Stream URL per capture URL; cameras not listed use
+                http://<camera host>:<port>/stream
+            port: Stream port of the ESP32-CAM firmware (CameraWebServer uses 81)
+            max_age: Never hand out stream frames older than this (seconds)
+            read_timeout: Wait this long for a fresh frame before falling back to /capture
+        """
+        self.stop_streams()
+        self.stream_config = {
+            "urls": dict(stream_urls or {}),
+            "port": port,
+            "max_age": max_age,
+            "read_timeout": read_timeout,
+        }
+    
+    def _stream_for(self, camera_url: str) -> MJPEGStream:
+        """Stream reader for a camera, connected on first use"""
+        stream = self.streams.get(camera_url)
+        if stream is None:
+            config = self.stream_config
+            url = config["urls"].get(camera_url) or stream_url_for(camera_url, config["port"])
+            # Own session: a long-lived stream must not hold a /capture pool slot
+            stream = self.streams[camera_url] = MJPEGStream(url, max_age=config["max_age"]).start()
+        return stream
+    
+    def stop_streams(self):
+        """Close all MJPEG stream connections and print their counters"""
+        for camera_url, stream in self.streams.items():
+            stream.stop()
+            stats = stream.metrics()
+            log_event(
+                log, "stream_summary",
+                f"📡 Stream [{stream.url}]: {stats['frames_received']} frames received, "
+                f"{stats['frames_read']} used, {stats['frames_dropped']} dropped, "
+                f"{stats['connects']} connects, {stats['errors']} errors",
+                stream_url=stream.url, **stats
+            )
+        self.streams = {}
+    
     def detect_fire(self, image_bytes: bytes) -> Tuple[bool, float]:
         """
         Detect fire in image using AI model
@@ -140,77 +414,185 @@ class FireDetectionAI:
         Returns:
             Tuple of (fire_detected: bool, confidence: float)
         """
+        return self.detect_fire_batch([image_bytes])[0]
+    
+    def detect_fire_batch(self, images: List[bytes]) -> List[Tuple[bool, float]]:
+        """
+        Detect fire in several images with one batched model call
+        
+        Returns:
+            List of (fire_detected: bool, confidence: float), one per image, in order
+        """
+        if self.synthetic_detector is not None:
+            with self.stage_seconds.time(stage="inference"):
+                return self.synthetic_detector.detect_batch(images)
+        
         if self.model is None:
             # Mock detection for testing
             # In production, replace with actual model inference
-            print("⚠ Using mock detection. Install YOLO for real detection.")
-            return False, 0.0
+            log_event(log, "mock_detection", "⚠ Using mock detection. Install YOLO for real detection.",
+                      level=logging.WARNING)
+            return [(False, 0.0) for _ in images]
+        
+        if self.inference_pool is not None:
+            # Frames run in parallel in the worker processes
+            with self.stage_seconds.time(stage="inference"):
+                return self.inference_pool.detect_batch(images)
+        
+        from image_decode import decode_image_bytes, rgb_to_bgr
         
+        # Over its latency budget the detector runs a smaller input size or brightness detection
+        mode = self.latency_budget.choose() if self.latency_budget is not None else str(self.imgsz)
+        brightness = mode == BRIGHTNESS
+        imgsz = self.imgsz if brightness else int(mode)
+        detections = [(False, 0.0) for _ in images]
+        tiled = self.tiling_config is not None and not brightness
+        decode_size = min(self.decode_size, imgsz) if self.decode_size else None
         try:
-            # Save image temporarily for model inference
-            temp_path = "/tmp/fire_detection_temp.jpg"
-            with open(temp_path, "wb") as f:
-                f.write(image_bytes)
-            
-            # Run inference
-            results = self.model(temp_path)
-            
-            # Process results (adjust based on your model output)
-            # Example: Check if fire class is detected with confidence > threshold
-            fire_detected = False
-            confidence = 0.0
-            
-            for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    # Adjust class_id based on your model (e.g., class 0 = fire)
-                    if box.cls == 0 and box.conf > 0.5:  # Fire class with >50% confidence
-                        fire_detected = True
-                        confidence = float(box.conf)
-                        break
+            # Decode in memory and run inference on the arrays (no temp file)
+            # A frame that fails to decode is skipped without failing the batch
+            frames, indexes = [], []
+            for index, image_bytes in enumerate(images):
+                start = time.perf_counter()
+                try:
+                    # Tiling crops native-resolution regions, so only whole frames decode reduced
+                    frame = decode_image_bytes(image_bytes, target=None if tiled else decode_size)
+                    # Tiling crops the RGB frame and converts only the crops; brightness reads RGB
+                    frames.append(frame if tiled or brightness else rgb_to_bgr(frame))
+                    indexes.append(index)
+                    self.stage_seconds.observe(time.perf_counter() - start, stage="decode")
+                except Exception as e:
+                    self.errors_total.inc(stage="decode")
+                    log_event(log, "decode_failed", f"✗ Could not decode frame: {e}", level=logging.ERROR, error=str(e))
             
-            # Clean up temp file
-            os.remove(temp_path)
+            started = time.perf_counter()
+            if frames and brightness:
+                from yolo_fire_wrapper import detect_fire_brightness
+                
+                for index, frame in zip(indexes, frames):
+                    result = detect_fire_brightness(frame)
+                    detections[index] = (bool(result["fire"]), float(result["confidence"]))
+                self.stage_seconds.observe(time.perf_counter() - started, stage="inference")
+            elif frames and tiled:
+                from roi_tiling import detect_tiled
+                
+                for index, frame in zip(indexes, frames):
+                    start = time.perf_counter()
+                    boxes, crops = detect_tiled(self._model_for(imgsz), frame, imgsz, **self.tiling_config)
+                    detections[index] = self._parse_boxes(boxes)
+                    self.tiles_total.inc(len(crops))
+                    self.stage_seconds.observe(time.perf_counter() - start, stage="inference")
+            elif frames:
+                results = self._model_for(imgsz)(frames, imgsz=imgsz)
+                for index, result in zip(indexes, results):
+                    detections[index] = self._parse_result(result)
+                self.stage_seconds.observe(time.perf_counter() - started, stage="inference")
+            if frames:
+                self._record_latency(mode, time.perf_counter() - started, len(frames))
             
-            return fire_detected, confidence
+            return detections
             
         except Exception as e:
-            print(f"✗ Error during fire detection: {e}")
-            return False, 0.0
+            self.errors_total.inc(stage="inference")
+            log_event(log, "inference_failed", f"✗ Error during fire detection: {e}", level=logging.ERROR, error=str(e))
+            return [(False, 0.0) for _ in images]
+    
+    def _model_for(self, imgsz: int):
+        """Model to call at imgsz (exported backends are fixed to the size they were exported at)"""
+        if imgsz == self.imgsz or self.backend == "torch":
+            return self.model
+        return self.fallback_models[imgsz]
+    
+    def _record_latency(self, mode: str, seconds: float, frames: int):
+        """Feed the latency budget and log when it changes the detection mode"""
+        if self.latency_budget is None:
+            return
+        change = self.latency_budget.record(mode, seconds, frames)
+        if change is None:
+            return
+        previous, current = change
+        label = lambda m: m if m == BRIGHTNESS else f"imgsz {m}"
+        stats = self.latency_budget.metrics()
+        fields = dict(from_mode=previous, to_mode=current, latency_ms=stats["last_latency_ms"], budget_ms=stats["budget_ms"])
+        if self.latency_budget.modes.index(current) > self.latency_budget.modes.index(previous):
+            log_event(
+                log, "inference_degraded",
+                f"⚠ Inference over its {stats['budget_ms']:g}ms budget ({stats['last_latency_ms']:g}ms/frame): "
+                f"falling back from {label(previous)} to {label(current)}",
+                level=logging.WARNING, **fields
+            )
+        else:
+            log_event(
+                log, "inference_restored",
+                f"✓ Inference back within its {stats['budget_ms']:g}ms budget ({stats['last_latency_ms']:g}ms/frame): "
+                f"restored {label(current)}",
+                **fields
+            )
+    
+    def _parse_result(self, result) -> Tuple[bool, float]:
+        """Extract (fire_detected, confidence) from one model result"""
+        # Shared with the inference pool workers (adjust there for your model output)
+        return parse_fire_result(result)
     
-    def upload_to_gcs(self, image_bytes: bytes, filename: str) -> Optional[str]:
+    def _parse_boxes(self, boxes) -> Tuple[bool, float]:
+        """_parse_result for tiled (x1, y1, x2, y2, confidence, class_id) detections"""
+        return parse_fire_boxes(boxes)
+    
+    def upload_to_gcs(self, image_bytes: bytes, filename: str, content_type: str = "image/jpeg") -> Optional[str]:
         """
         Upload image to Google Cloud Storage
         
+        Args:
+            content_type: Object content type (application/zip for pre-fire clips)
+        
         Returns:
             Public URL of uploaded image, or None if upload failed
         """
         try:
             blob = self.bucket.blob(filename)
-            blob.upload_from_string(image_bytes, content_type="image/jpeg")
+            blob.upload_from_string(image_bytes, content_type=content_type)
             
             # Make blob publicly accessible (optional, adjust based on your security needs)
             # blob.make_public()
             
             # Return public URL
             url = f"https://storage.googleapis.com/{self.gcs_bucket_name}/{filename}"
-            print(f"✓ Image uploaded to GCS: {url}")
+            log_event(log, "image_uploaded", f"✓ {'Clip' if content_type == 'application/zip' else 'Image'} uploaded to GCS: {url}",
+                      image_url=url, content_type=content_type)
             return url
             
         except Exception as e:
-            print(f"✗ Failed to upload to GCS: {e}")
+            self.errors_total.inc(stage="upload")
+            log_event(log, "upload_failed", f"✗ Failed to upload to GCS: {e}", level=logging.ERROR,
+                      filename=filename, error=str(e))
             return None
     
     def write_danger_event(
         self,
         ai_fire_detected: bool,
         ai_confidence: float,
-        image_url: Optional[str] = None
-    ):
-        """Write DANGER event to Firestore events collection"""
+        image_url: Optional[str] = None,
+        camera_url: Optional[str] = None,
+        timestamp: Optional[int] = None,
+        clip_url: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Write DANGER event to Firestore events collection
+        
+        With the event writer enabled the event is queued (and possibly merged
+        into the camera's open incident) instead of written immediately.
+        
+        Args:
+            timestamp: Detection time in milliseconds (defaults to now)
+            clip_url: GCS URL of the pre-fire clip, if one was uploaded
+        
+        Returns:
+            Firestore document ID, or None if the write failed
+        """
+        start = time.perf_counter()
         try:
             event_data = {
-                "timestamp": int(time.time() * 1000),  # Milliseconds
+                "timestamp": timestamp or int(time.time() * 1000),  # Milliseconds
                 "event_type": "DANGER",
                 "reason": "AI fire detection" if ai_fire_detected else "Manual trigger",
                 "ai_fire_detected": ai_fire_detected,
@@ -218,13 +600,26 @@ class FireDetectionAI:
                 "image_url": image_url,
                 "acknowledged": False
             }
+            if camera_url:
+                event_data["camera_url"] = camera_url
+            if clip_url:
+                event_data["clip_url"] = clip_url
             
-            # Add to events collection
-            doc_ref = self.db.collection("events").add(event_data)
-            print(f"✓ DANGER event written to Firestore: {doc_ref[1].id}")
+            if self.event_writer is not None:
+                event_id = self.event_writer.submit(event_data, camera=camera_url)
+            else:
+                # Add to events collection
+                event_id = self.db.collection("events").add(event_data)[1].id
+                log_event(log, "event_written", f"✓ DANGER event written to Firestore: {event_id}",
+                          event_id=event_id, camera_url=camera_url)
+            self.stage_seconds.observe(time.perf_counter() - start, stage="firestore")
+            return event_id
             
         except Exception as e:
-            print(f"✗ Failed to write event to Firestore: {e}")
+            self.errors_total.inc(stage="firestore")
+            log_event(log, "event_failed", f"✗ Failed to write event to Firestore: {e}", level=logging.ERROR,
+                      camera_url=camera_url, error=str(e))
+            return None
     
     def process_frame(self) -> bool:
         """
@@ -238,48 +633,834 @@ class FireDetectionAI:
         if not image_bytes:
             return False
         
+        return self.handle_frame(image_bytes)
+    
+    def handle_frame(self, image_bytes: bytes, camera_url: Optional[str] = None) -> bool:
+        """
+        Detect fire in a captured frame, then upload and log it if fire is found
+        
+        Returns:
+            True if fire was detected, False otherwise
+        """
         # Detect fire
-        fire_detected, confidence = self.detect_fire(image_bytes)
+        fire_detected, confidence = self.detect_fire_gated(image_bytes, camera_url)
+        
+        return self.handle_detection(image_bytes, fire_detected, confidence, camera_url)
+    
+    def handle_detection(
+        self,
+        image_bytes: bytes,
+        fire_detected: bool,
+        confidence: float,
+        camera_url: Optional[str] = None
+    ) -> bool:
+        """
+        Act on a detection result: upload the frame and log a DANGER event on fire
+        
+        With smoothing enabled, only the frame that raises the camera's alarm
+        is uploaded and logged; later fire frames of the same alarm are not.
+        With clip capture enabled, every frame goes into the camera's ring and
+        the frames leading up to an alert are uploaded with it as a clip.
+        
+        Returns:
+            True if fire was detected (with smoothing: the alarm is active), False otherwise
+        """
+        source = f"[{camera_url}] " if camera_url else ""
+        self.frames_total.inc()
+        ring = self._frame_ring(camera_url)
+        if ring is not None:
+            ring.push(image_bytes)
+        if fire_detected:
+            self.detections_total.inc()
+        
+        smoother = self._smoother(camera_url)
+        if smoother is not None:
+            transition = smoother.update(fire_detected, confidence)
+            if transition == CLEARED:
+                log_event(log, "alarm_cleared", f"✓ {source}Fire alarm cleared", camera_url=camera_url)
+            if transition != RAISED:
+                if fire_detected:
+                    state = "alarm active" if smoother.alarm else "waiting for confirmation"
+                    log_event(log, "fire_frame", f"⚠ {source}Fire frame (confidence: {confidence:.2%}), {state}",
+                              camera_url=camera_url, confidence=confidence, alarm=smoother.alarm)
+                else:
+                    log_event(log, "no_fire", f"✓ {source}No fire detected (confidence: {confidence:.2%})",
+                              camera_url=camera_url, confidence=confidence)
+                return smoother.alarm
         
         if fire_detected:
             # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            filename = f"fire_detection_{timestamp}.jpg"
-            
-            # Upload to GCS
-            image_url = self.upload_to_gcs(image_bytes, filename)
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S_%f")
+            detection = {
+                "image_bytes": image_bytes,
+                "filename": f"fire_detection_{timestamp}.jpg",
+                "confidence": confidence,
+                "camera_url": camera_url,
+                "detected_at": int(now.timestamp() * 1000),
+            }
+            if ring is not None:
+                # Frames since the previous alert, ending with this one
+                detection["clip_bytes"] = ring.clip()
+                detection["clip_filename"] = f"fire_clip_{timestamp}.zip"
             
-            # Write DANGER event to Firestore
-            self.write_danger_event(
-                ai_fire_detected=True,
-                ai_confidence=confidence,
-                image_url=image_url
-            )
+            self.alerts_total.inc()
+            log_event(log, "fire_detected", f"🔥 {source}FIRE DETECTED! Confidence: {confidence:.2%}",
+                      level=logging.WARNING, camera_url=camera_url, confidence=confidence,
+                      filename=detection["filename"])
             
-            print(f"🔥 FIRE DETECTED! Confidence: {confidence:.2%}")
+            if self.pipeline is not None:
+                # Upload and Firestore write drain in the background
+                self.pipeline.put("upload", detection)
+            else:
+                self._write_event_stage(self._upload_stage(detection))
             return True
         else:
-            print(f"✓ No fire detected (confidence: {confidence:.2%})")
+            log_event(log, "no_fire", f"✓ {source}No fire detected (confidence: {confidence:.2%})",
+                      camera_url=camera_url, confidence=confidence)
             return False
     
+    def _detect_stage(self, frame: Tuple[Optional[str], bytes]):
+        """Pipeline stage: run detection on a captured (camera_url, image_bytes) frame"""
+        camera_url, image_bytes = frame
+        self.handle_frame(image_bytes, camera_url=camera_url)
+    
+    def _upload_stage(self, detection: dict) -> dict:
+        """Pipeline stage: upload the fire frame to GCS (or spool it for upload)"""
+        image_bytes = detection.pop("image_bytes")
+        clip_bytes = detection.pop("clip_bytes", None)
+        with self.stage_seconds.time(stage="upload"):
+            if clip_bytes:
+                clip_url = self.upload_to_gcs(clip_bytes, detection["clip_filename"], content_type="application/zip")
+                if clip_url:
+                    self.clips_total.inc()
+                detection = {**detection, "clip_url": clip_url}
+            if self.uploader is not None:
+                # The event is written without a URL and patched once the upload lands
+                self.uploader.submit(image_bytes, detection["filename"], {"camera_url": detection["camera_url"]})
+                return {**detection, "image_url": None}
+            image_url = self.upload_to_gcs(image_bytes, detection["filename"])
+        return {**detection, "image_url": image_url}
+    
+    def _write_event_stage(self, detection: dict):
+        """Pipeline stage: write the DANGER event to Firestore"""
+        event_id = self.write_danger_event(
+            ai_fire_detected=True,
+            ai_confidence=detection["confidence"],
+            image_url=detection["image_url"],
+            camera_url=detection["camera_url"],
+            timestamp=detection["detected_at"],
+            clip_url=detection.get("clip_url")
+        )
+        if self.uploader is not None and detection["image_url"] is None and event_id:
+            self.uploader.attach(detection["filename"], event_id=event_id)
+    
+    def _on_uploaded(self, filename: str, url: str, metadata: dict):
+        """UploadManager callback: add the image URL to the event once both exist"""
+        event_id = metadata.get("event_id")
+        if event_id:
+            self.patch_event(event_id, {"image_url": url})
+    
+    def patch_event(self, event_id: str, fields: dict):
+        """Update fields of a DANGER event that has already been written or queued"""
+        if self.event_writer is not None and self.event_writer.update(event_id, fields):
+            return
+        try:
+            self.db.collection("events").document(event_id).update(fields)
+            log_event(log, "event_updated", f"✓ DANGER event updated in Firestore: {event_id}",
+                      event_id=event_id, fields=list(fields))
+        except Exception as e:
+            self.errors_total.inc(stage="firestore")
+            log_event(log, "event_update_failed", f"✗ Failed to update event {event_id} in Firestore: {e}",
+                      level=logging.ERROR, event_id=event_id, error=str(e))
+    
+    def enable_smoothing(self, mode: str = "ema", **params):
+        """
+        Alert only when a camera's smoothed fire state changes
+        
+        Args:
+            mode: "ema" (moving average of confidence) or "kofn" (k of the last n frames)
+            **params: AlertSmoother parameters (alpha, on_threshold, off_threshold, k, n, clear_k)
+        """
+        AlertSmoother(mode, **params)  # Validate before any frame arrives
+        self.smoothing_config = {"mode": mode, **params}
+        self.smoothers = {}
+    
+    def _smoother(self, camera_url: Optional[str]) -> Optional[AlertSmoother]:
+        """Alarm state machine for a camera, created on first use (None if disabled)"""
+        if self.smoothing_config is None:
+            return None
+        smoother = self.smoothers.get(camera_url)
+        if smoother is None:
+            smoother = self.smoothers[camera_url] = AlertSmoother(**self.smoothing_config)
+        return smoother
+    
+    def print_smoothing_metrics(self):
+        """Print how many fire frames each camera's alarm state machine absorbed"""
+        for camera_url, smoother in self.smoothers.items():
+            stats = smoother.metrics()
+            log_event(
+                log, "smoothing_summary",
+                f"🧯 Alerts{f' [{camera_url}]' if camera_url else ''}: "
+                f"{stats['fire_frames']}/{stats['frames']} fire frames -> {stats['raised']} alarms raised, "
+                f"{stats['cleared']} cleared, {stats['suppressed']} fire frames without a new alert",
+                camera_url=camera_url, **stats
+            )
+    
+    def enable_synthetic_detector(self, **params) -> SyntheticDetector:
+        """
+        Replace inference with a seeded synthetic detector
+        
+        Verdicts and latencies follow the given fire rate, bursts and latency
+        distribution, so capture, upload and event writes can be load-tested
+        without a model or a real fire.
+        
+        Args:
+            **params: SyntheticDetector parameters (seed, fire_rate, latency_ms,
+                latency_jitter_ms, latency_dist, burst_rate, burst_length, cpu_bound)
+        """
+        self.synthetic_detector = SyntheticDetector(**params)
+        log_event(
+            log, "synthetic_detector",
+            f"🧪 Synthetic detector: seed {self.synthetic_detector.seed}, fire rate {self.synthetic_detector.fire_rate:.0%}, "
+            f"{self.synthetic_detector.latency_dist} latency ~{self.synthetic_detector.latency_ms}ms",
+            level=logging.WARNING, **params
+        )
+        return self.synthetic_detector
+    
+    def print_synthetic_metrics(self):
+        """Print the synthetic detector's verdict counters"""
+        if self.synthetic_detector is None:
+            return
+        stats = self.synthetic_detector.metrics()
+        log_event(
+            log, "synthetic_summary",
+            f"🧪 Synthetic detector: {stats['fire_frames']}/{stats['frames']} fire frames, "
+            f"{stats['bursts']} bursts, avg latency {stats['avg_latency_ms']}ms",
+            **stats
+        )
+    
+    def enable_clip_capture(self, max_frames: int = 20, arena_mb: float = 4.0):
+        """
+        Keep each camera's recent frames and upload them as a clip with every alert
+        
+        Frames are stored as received (no re-encode) in a preallocated arena
+        per camera, so memory stays fixed at about arena_mb per camera.
+        
+        Args:
+            max_frames: Frames kept per camera (clip length = max_frames x capture interval)
+            arena_mb: Memory reserved per camera; the oldest frames are evicted when full
+        """
+        self.clip_config = {"max_frames": max_frames, "arena_bytes": int(arena_mb * 1024 * 1024)}
+        self.frame_rings = {}
+    
+    def _frame_ring(self, camera_url: Optional[str]) -> Optional[FrameRing]:
+        """Frame ring for a camera, created on first use (None if disabled)"""
+        if self.clip_config is None:
+            return None
+        ring = self.frame_rings.get(camera_url)
+        if ring is None:
+            ring = self.frame_rings[camera_url] = FrameRing(**self.clip_config)
+        return ring
+    
+    def print_clip_metrics(self):
+        """Print clips uploaded and frame ring usage per camera"""
+        for camera_url, ring in self.frame_rings.items():
+            stats = ring.metrics()
+            log_event(
+                log, "clip_summary",
+                f"🎬 Clip buffer{f' [{camera_url}]' if camera_url else ''}: {stats['clips']} clips, "
+                f"{stats['frames']} frames held ({stats['bytes_used'] / 1024:.0f}/{stats['arena_bytes'] / 1024:.0f} KB), "
+                f"{stats['evicted']} evicted, {stats['dropped']} too large",
+                camera_url=camera_url, **stats
+            )
+    
+    def enable_latency_budget(
+        self,
+        budget_ms: float,
+        fallback: Sequence[Union[int, str]] = (BRIGHTNESS,),
+        strikes: int = 3,
+        probe_interval: float = 30.0
+    ) -> Optional[LatencyBudget]:
+        """
+        Fall back to cheaper detection while inference is over a per-frame budget
+        
+        After `strikes` consecutive batches over budget_ms per frame the
+        detector steps down to the next fallback mode; while degraded it
+        retries the better mode every probe_interval seconds and steps back up
+        when that fits the budget. Applies to in-process inference (not the
+        inference pool or the synthetic detector).
+        
+        Args:
+            budget_ms: Allowed inference time per frame
+            fallback: Fallback modes in order: smaller input sizes (ints)
+                and/or "brightness"
+            strikes: Consecutive over-budget batches before stepping down
+            probe_interval: Seconds between attempts to restore the better mode
+        """
+        if self.model is None:
+            log_event(log, "budget_skipped", "⚠ No model loaded; latency budget not enabled", level=logging.WARNING)
+            return None
+        modes = [str(self.imgsz)]
+        for mode in fallback:
+            if mode != BRIGHTNESS:
+                mode = int(mode)
+                if mode >= self.imgsz:
+                    raise ValueError(f"Fallback input size {mode} is not smaller than imgsz {self.imgsz}")
+                if self.backend != "torch" and mode not in self.fallback_models:
+                    # Exported models have a fixed input size; export (once) and load one per fallback size
+                    from model_backends import load_model
+                    self.fallback_models[mode] = load_model(self.model_path, self.backend, mode)
+            modes.append(str(mode))
+        self.latency_budget = LatencyBudget(budget_ms, modes, strikes=strikes, probe_interval=probe_interval)
+        log_event(
+            log, "latency_budget",
+            f"⏱ Inference budget: {budget_ms:g}ms/frame, fallback {' -> '.join(modes)}",
+            budget_ms=budget_ms, modes=modes, strikes=strikes, probe_interval=probe_interval
+        )
+        return self.latency_budget
+    
+    def print_budget_metrics(self):
+        """Print how often the latency budget degraded inference and how many frames ran per mode"""
+        if self.latency_budget is None:
+            return
+        stats = self.latency_budget.metrics()
+        frames = ", ".join(f"{mode}: {count}" for mode, count in stats["frames"].items())
+        log_event(
+            log, "budget_summary",
+            f"⏱ Inference budget {stats['budget_ms']:g}ms: {stats['over_budget']} batches over, "
+            f"{stats['degradations']} fallbacks, {stats['restorations']} restores, now {stats['mode']} (frames {frames})",
+            **stats
+        )
+    
+    def warmup(
+        self,
+        runs: int = 3,
+        frame_size: Tuple[int, int] = (800, 600),
+        batch: int = 1,
+        in_process: bool = True
+    ) -> Optional[Dict[int, List[float]]]:
+        """
+        Run dummy frames through the model before the first capture
+        
+        The frames have the shape camera frames decode to, so lazy kernel
+        initialization and allocator growth happen here instead of delaying
+        the first real frames. Fallback models of the latency budget are
+        warmed too, and an inference pool started afterwards warms each
+        worker the same way.
+        
+        Args:
+            runs: Dummy inference calls per model
+            frame_size: Camera resolution (width, height)
+            batch: Frames per call (the batch size frames will arrive in)
+            in_process: Warm the model in this process (False when only pool workers run inference)
+        
+        Returns:
+            Milliseconds per warmup call keyed by input size, or None if there was nothing to warm
+        """
+        if runs <= 0 or self.model is None or self.synthetic_detector is not None:
+            return None
+        from image_decode import decoded_size
+        from model_backends import warmup_model
+        
+        def frame_shape(imgsz: int) -> Tuple[int, int]:
+            # Tiling decodes at full resolution; otherwise frames decode reduced down to imgsz
+            target = None if self.tiling_config is not None or not self.decode_size else min(self.decode_size, imgsz)
+            width, height = decoded_size(frame_size, target)
+            return height, width
+        
+        self.warmup_config = {"runs": runs, "frame_shape": frame_shape(self.imgsz), "batch": batch}
+        if not in_process:
+            return None
+        sizes = [self.imgsz]
+        if self.latency_budget is not None:
+            sizes += [int(mode) for mode in self.latency_budget.modes[1:] if mode != BRIGHTNESS]
+        timings = {}
+        for imgsz in sizes:
+            shape = frame_shape(imgsz)
+            runs_ms = [round(t * 1000, 1) for t in warmup_model(self._model_for(imgsz), imgsz, shape, runs, batch)]
+            timings[imgsz] = runs_ms
+            log_event(
+                log, "model_warmup",
+                f"✓ Model warmed up at imgsz {imgsz} on {shape[1]}x{shape[0]} frames: "
+                f"first call {runs_ms[0]:g}ms, last {runs_ms[-1]:g}ms ({runs} calls)",
+                imgsz=imgsz, frame_shape=list(shape), batch=batch, runs_ms=runs_ms
+            )
+        return timings
+    
+    def enable_inference_pool(self, workers: int = 2, threads_per_worker: int = 1) -> Optional[InferencePool]:
+        """
+        Run inference in worker processes, each with its own copy of the model
+        
+        Frames reach the workers through shared memory and go to the least
+        loaded worker; crashed workers are restarted. Tiling and warmup
+        settings given before this call apply in the workers too.
+        
+        Args:
+            workers: Worker processes (about one per spare CPU core)
+            threads_per_worker: Intra-op threads per worker
+        """
+        if self.model is None:
+            log_event(log, "pool_skipped", "⚠ No model loaded; inference pool not started", level=logging.WARNING)
+            return None
+        self.stop_inference_pool()
+        self.inference_pool = InferencePool(
+            workers,
+            detector="yolo",
+            model_path=self.model_path,
+            backend=self.backend,
+            imgsz=self.imgsz,
+            tiling=self.tiling_config,
+            decode_size=self.decode_size,
+            threads_per_worker=threads_per_worker,
+            warmup=self.warmup_config
+        ).start()
+        return self.inference_pool
+    
+    def stop_inference_pool(self):
+        """Stop the worker processes and print per-worker counters"""
+        if self.inference_pool is None:
+            return
+        pool, self.inference_pool = self.inference_pool, None
+        stats = pool.metrics()
+        pool.stop()
+        busy = ", ".join(f"#{wid}: {w['processed']} frames/{w['restarts']} restarts" for wid, w in stats["workers"].items())
+        log_event(
+            log, "pool_summary",
+            f"🧮 Inference pool: {stats['completed']} frames, {stats['failed']} failed, "
+            f"{stats['redispatched']} re-dispatched ({busy})",
+            **stats
+        )
+    
+    def enable_tiling(self, reduce: int = 8, max_regions: int = 4, pad: float = 0.25):
+        """
+        Run the model only on native-resolution crops around fire-colored regions
+        
+        Keeps small, distant flames that vanish when a high-resolution frame is
+        downscaled to imgsz, and skips inference on frames without fire colors.
+        
+        Args:
+            reduce: Subsampling step for the region proposal color mask
+            max_regions: Maximum crops per frame
+            pad: Context added around each region, as a fraction of its size
+        """
+        self.tiling_config = {"reduce": reduce, "max_regions": max_regions, "pad": pad}
+    
+    def enable_motion_gate(self, threshold: float = 4.0, max_skip: int = 30):
+        """
+        Skip inference on frames that haven't changed since the previous one
+        
+        Args:
+            threshold: Mean grayscale thumbnail difference that counts as a change
+            max_skip: Force a full inference after this many consecutive skips
+        """
+        self.motion_gate_config = {"threshold": threshold, "max_skip": max_skip}
+        self.motion_gates = {}
+    
+    def _motion_gate(self, camera_url: Optional[str]) -> Optional["MotionGate"]:
+        """Motion gate for a camera, created on first use (None if disabled)"""
+        if self.motion_gate_config is None:
+            return None
+        from motion_gate import MotionGate
+        
+        gate = self.motion_gates.get(camera_url)
+        if gate is None:
+            gate = self.motion_gates[camera_url] = MotionGate(**self.motion_gate_config)
+        return gate
+    
+    def detect_fire_gated(self, image_bytes: bytes, camera_url: Optional[str] = None) -> Tuple[bool, float]:
+        """
+        Run detect_fire unless the motion gate says the scene is unchanged
+        
+        Returns:
+            Tuple of (fire_detected: bool, confidence: float), possibly the previous verdict
+        """
+        gate = self._motion_gate(camera_url)
+        if gate is None:
+            return self.detect_fire(image_bytes)
+        reused = gate.reusable_verdict(image_bytes)
+        if reused is not None:
+            return reused
+        
+        started = time.perf_counter()
+        verdict = self.detect_fire(image_bytes)
+        gate.record(verdict, time.perf_counter() - started)
+        return verdict
+    
+    def print_motion_metrics(self):
+        """Print skip ratio and inference time saved by each motion gate"""
+        for camera_url, gate in self.motion_gates.items():
+            stats = gate.metrics()
+            log_event(
+                log, "motion_gate_summary",
+                f"🎞  Motion gate{f' [{camera_url}]' if camera_url else ''}: "
+                f"skipped {stats['skipped']}/{stats['frames']} frames ({stats['skip_ratio']:.0%}), "
+                f"~{stats['cpu_saved_s']}s inference saved",
+                camera_url=camera_url, **stats
+            )
+    
+    def enable_event_writer(
+        self,
+        max_batch: int = 20,
+        flush_interval: float = 1.0,
+        coalesce_window: float = 30.0
+    ) -> EventWriter:
+        """
+        Write DANGER events through a background batching writer
+        
+        Consecutive events from the same camera less than coalesce_window
+        seconds apart become one event document with a count and
+        first/last timestamps.
+        
+        Args:
+            max_batch: Commit as soon as this many documents are pending
+            flush_interval: Commit pending documents at least this often (seconds)
+            coalesce_window: Merge same-camera events closer together than this (seconds)
+        """
+        self.stop_event_writer()
+        self.event_writer = EventWriter(
+            self.db,
+            max_batch=max_batch,
+            flush_interval=flush_interval,
+            coalesce_window=coalesce_window
+        ).start()
+        return self.event_writer
+    
+    def enable_sensor_schedule(
+        self,
+        log_path: str,
+        node_cameras: Optional[Dict[str, str]] = None,
+        normal_interval: float = 30.0,
+        alert_interval: float = 0.5,
+        fallback_interval: float = 2.0,
+        hold: float = 60.0,
+        ldr_threshold: float = 200
+    ) -> SensorSchedule:
+        """
+        Set each camera's capture cadence from the gateway's NDJSON sensor stream
+        
+        Cameras sample every normal_interval seconds while their nodes read
+        NORMAL, capture immediately and then every alert_interval seconds on
+        WARNING/DANGER or flame with low light, and use fallback_interval when
+        their nodes stop reporting.
+        
+        Args:
+            log_path: Gateway NDJSON stream (data/local-buffer.ndjson), tailed from its end
+            node_cameras: node_id -> camera URL (default: every node drives every camera)
+            hold: Seconds to stay fast after the last elevated reading
+            ldr_threshold: Raw LDR value below which a flame reading counts (RISK_LOGIC.md)
+        """
+        self.stop_sensor_schedule()
+        self.sensor_schedule = SensorSchedule(
+            log_path,
+            node_cameras=node_cameras,
+            normal_interval=normal_interval,
+            alert_interval=alert_interval,
+            fallback_interval=fallback_interval,
+            hold=hold,
+            ldr_threshold=ldr_threshold,
+            on_escalate=self._on_sensor_escalate
+        ).start()
+        return self.sensor_schedule
+    
+    def _on_sensor_escalate(self, camera_url: Optional[str], node_id: str, reason: str):
+        """Capture now instead of waiting out a slow NORMAL-cadence tick"""
+        self.sensor_escalations_total.inc(reason=reason)
+        if self.scheduler is not None:
+            self.scheduler.trigger(camera_url)
+        elif camera_url in (None, self.esp32_cam_url):
+            self._capture_wake.set()
+    
+    def _capture_interval(self, camera_url: Optional[str], default: float) -> float:
+        if self.sensor_schedule is None:
+            return default
+        return self.sensor_schedule.interval(camera_url)
+    
+    def stop_sensor_schedule(self):
+        """Stop tailing the sensor stream and print per-node counters"""
+        if self.sensor_schedule is None:
+            return
+        self.sensor_schedule.stop()
+        stats = self.sensor_schedule.metrics()
+        self.sensor_schedule = None
+        for node_id, node in stats["nodes"].items():
+            log_event(
+                log, "sensor_summary",
+                f"📡 Sensor node {node_id}: {node['records']} readings, {node['escalations']} escalation(s)",
+                node_id=node_id, **node
+            )
+    
+    def stop_event_writer(self):
+        """Commit pending events, stop the writer and print its counters"""
+        if self.event_writer is None:
+            return
+        self.event_writer.stop()
+        stats = self.event_writer.metrics()
+        self.event_writer = None
+        log_event(
+            log, "event_writer_summary",
+            f"📝 Event writer: {stats['submitted']} events, {stats['coalesced']} coalesced, "
+            f"{stats['documents_written']} document writes in {stats['commits']} commits, "
+            f"{stats['pending']} pending, {stats['errors']} errors",
+            **stats
+        )
+    
+    def enable_upload_manager(
+        self,
+        spool_dir: str,
+        workers: int = 4,
+        max_spool_mb: float = 256,
+        max_spool_files: int = 1000
+    ) -> UploadManager:
+        """
+        Spool fire frames to disk and upload them on a background worker pool
+        
+        Failed uploads are retried with backoff, frames left in the spool are
+        resumed on the next start, and the DANGER event is patched with the
+        image URL once its upload succeeds.
+        
+        Args:
+            spool_dir: Directory for frames waiting to be uploaded
+            workers: Parallel upload threads
+            max_spool_mb: Oldest spooled frames are dropped beyond this size
+            max_spool_files: Oldest spooled frames are dropped beyond this count
+        """
+        self.stop_upload_manager()
+        self.uploader = UploadManager(
+            self.bucket,
+            spool_dir,
+            workers=workers,
+            max_spool_bytes=int(max_spool_mb * 1024 * 1024),
+            max_spool_files=max_spool_files,
+            on_uploaded=self._on_uploaded
+        ).start()
+        return self.uploader
+    
+    def stop_upload_manager(self, timeout: float = 10.0):
+        """Finish ready uploads (up to timeout), stop the workers and print counters"""
+        if self.uploader is None:
+            return
+        log_event(log, "uploads_finishing", "⏳ Finishing spooled uploads...")
+        self.uploader.stop(timeout=timeout)
+        stats = self.uploader.metrics()
+        self.uploader = None
+        log_event(
+            log, "upload_summary",
+            f"📤 Uploads: {stats['uploaded']} uploaded ({stats['uploads_per_s']}/s, "
+            f"{stats['mb_per_s']} MB/s, avg {stats['avg_upload_ms']}ms), "
+            f"{stats['failed_attempts']} failed attempts, {stats['evicted']} evicted, "
+            f"{stats['pending']} left in spool ({stats['spool_mb']} MB)",
+            **stats
+        )
+    
+    def start_pipeline(self, queue_size: int = 8) -> Pipeline:
+        """
+        Start background detect -> upload -> Firestore stages
+        
+        Stages are joined by bounded queues. The detect queue drops its oldest
+        frame when full so capture never blocks; upload and Firestore queues
+        apply backpressure so no detected fire is discarded.
+        """
+        self.pipeline = Pipeline([
+            Stage("detect", self._detect_stage, maxsize=queue_size, drop_oldest=True),
+            Stage("upload", self._upload_stage, maxsize=queue_size),
+            Stage("firestore", self._write_event_stage, maxsize=queue_size),
+        ]).start()
+        return self.pipeline
+    
+    def stop_pipeline(self):
+        """Drain queued uploads/events, stop the stages and print their counters"""
+        if self.pipeline is None:
+            return
+        log_event(log, "pipeline_draining", "⏳ Draining pipeline queues...")
+        self.pipeline.stop()
+        metrics = self.pipeline.metrics()
+        self.pipeline = None
+        
+        lines = ["📊 Pipeline stages:"]
+        for name, stats in metrics.items():
+            lines.append(
+                f"   {name}: {stats['processed']} processed, {stats['dropped']} dropped, "
+                f"{stats['errors']} errors, max queue {stats['max_depth']}/{stats['capacity']}"
+            )
+        log_event(log, "pipeline_summary", "\n".join(lines), stages=metrics)
+    
     def run_continuous(self, interval: float = 2.0):
         """
         Run continuous fire detection loop
         
+        Capture runs on a fixed cadence in this thread; detection, GCS upload
+        and Firestore writes run in background pipeline stages.
+        
         Args:
             interval: Time between captures in seconds
         """
-        print(f"\n🚀 Starting continuous fire detection...")
-        print(f"   ESP32-CAM URL: {self.esp32_cam_url}")
-        print(f"   GCS Bucket: {self.gcs_bucket_name}")
-        print(f"   Detection interval: {interval}s\n")
+        log_event(
+            log, "started",
+            f"\n🚀 Starting continuous fire detection...\n"
+            f"   ESP32-CAM URL: {self.esp32_cam_url}\n"
+            f"   GCS Bucket: {self.gcs_bucket_name}\n"
+            f"   Detection interval: {interval}s\n",
+            mode="continuous", camera_urls=[self.esp32_cam_url], bucket=self.gcs_bucket_name, interval=interval
+        )
         
+        self.start_pipeline()
         try:
+            next_due = time.monotonic()
             while True:
-                self.process_frame()
-                time.sleep(interval)
+                image_bytes = self.capture_image()
+                if image_bytes:
+                    self.pipeline.put("detect", (None, image_bytes))
+                
+                next_due += self._capture_interval(self.esp32_cam_url, interval)
+                delay = next_due - time.monotonic()
+                if delay > 0 and self._capture_wake.wait(delay):
+                    # Sensor escalation: capture now
+                    self._capture_wake.clear()
+                    next_due = time.monotonic()
+                elif delay <= 0:
+                    # Capture overran the interval; restart the cadence from now
+                    next_due = time.monotonic()
         except KeyboardInterrupt:
-            print("\n\n⚠ Fire detection stopped by user")
+            log_event(log, "stopped", "\n\n⚠ Fire detection stopped by user")
+        finally:
+            self.stop_sensor_schedule()
+            self.stop_streams()
+            self.stop_inference_pool()
+            self.stop_pipeline()
+            self.stop_upload_manager()
+            self.stop_event_writer()
+            self.print_motion_metrics()
+            self.print_smoothing_metrics()
+            self.print_clip_metrics()
+            self.print_synthetic_metrics()
+            self.print_budget_metrics()
+            self.print_stage_metrics()
+            self.stop_metrics_server()
+    
+    def run_multi_camera(
+        self,
+        camera_urls: List[str],
+        interval: float = 2.0,
+        batch_size: int = 1,
+        batch_wait: float = 0.05
+    ):
+        """
+        Capture from several ESP32-CAMs concurrently on a fixed cadence
+        
+        Frames from all cameras feed one shared detection stage. Per-camera
+        lag metrics are available from self.scheduler.metrics().
+        
+        Args:
+            camera_urls: ESP32-CAM /capture endpoint URLs
+            interval: Time between captures per camera in seconds
+            batch_size: Frames per batched model call (1 disables batching)
+            batch_wait: Max seconds a frame waits for its batch to fill
+        """
+        batcher = None
+        if self.inference_pool is not None or batch_size > 1:
+            if self.inference_pool is not None:
+                # Frames from all cameras run in parallel across the worker processes
+                submit = self.inference_pool.submit
+            else:
+                batcher = FrameBatcher(self.detect_fire_batch, batch_size, batch_wait).start()
+                submit = batcher.submit
+            
+            def handle_fn(url, image_bytes):
+                gate = self._motion_gate(url)
+                # Checked here on the capture thread, recorded in on_result (the gate locks both)
+                reused = gate.reusable_verdict(image_bytes) if gate else None
+                if reused is not None:
+                    self.handle_detection(image_bytes, *reused, camera_url=url)
+                    return
+                
+                def on_result(future):
+                    try:
+                        verdict = future.result()
+                    except Exception as e:
+                        self.errors_total.inc(stage="inference")
+                        log_event(log, "inference_failed", f"✗ Error during fire detection: {e}",
+                                  level=logging.ERROR, camera_url=url, error=str(e))
+                        return
+                    if batcher:
+                        stats = batcher.metrics()
+                        cost = stats["last_batch_ms"] / 1000 / max(stats["last_batch_size"], 1)
+                    else:
+                        cost = future.elapsed
+                        self.stage_seconds.observe(cost, stage="inference")
+                    if gate:
+                        gate.record(verdict, cost)
+                    self.handle_detection(image_bytes, *verdict, camera_url=url)
+                
+                # Each frame's result comes back on its own future
+                submit(image_bytes).add_done_callback(on_result)
+        else:
+            def handle_fn(url, image_bytes):
+                self.handle_frame(image_bytes, camera_url=url)
+        
+        # One pooled connection per camera so concurrent captures don't queue
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=len(camera_urls))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        self.scheduler = CameraScheduler(
+            camera_urls,
+            capture_fn=self.capture_image,
+            handle_fn=handle_fn,
+            interval=interval,
+            interval_fn=(lambda url: self._capture_interval(url, interval)) if self.sensor_schedule else None
+        )
+        
+        log_event(
+            log, "started",
+            f"\n🚀 Starting multi-camera fire detection...\n"
+            f"   Cameras: {len(camera_urls)}\n"
+            + "".join(f"     - {url}\n" for url in camera_urls)
+            + f"   GCS Bucket: {self.gcs_bucket_name}\n"
+            f"   Detection interval: {interval}s per camera\n"
+            f"   Inference batch size: {batch_size}\n",
+            mode="multi_camera", camera_urls=camera_urls, bucket=self.gcs_bucket_name,
+            interval=interval, batch_size=batch_size
+        )
+        
+        # The scheduler's inference thread is the detect stage here
+        self.start_pipeline()
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            log_event(log, "stopped", "\n\n⚠ Fire detection stopped by user")
+        finally:
+            self.stop_sensor_schedule()
+            self.stop_streams()
+            if batcher:
+                batcher.stop()
+            self.stop_inference_pool()
+            self.stop_pipeline()
+            self.stop_upload_manager()
+            self.stop_event_writer()
+            self.print_motion_metrics()
+            self.print_smoothing_metrics()
+            self.print_clip_metrics()
+            self.print_synthetic_metrics()
+            self.print_budget_metrics()
+            self.print_stage_metrics()
+            self.stop_metrics_server()
+        
+        cameras = self.scheduler.metrics()["cameras"]
+        lines = ["\n📊 Per-camera capture metrics:"]
+        for url, stats in cameras.items():
+            lines.append(
+                f"   {url}: {stats['captures']} frames, {stats['failures']} failed, "
+                f"{stats['skipped']} skipped, {stats['dropped']} dropped, "
+                f"lag avg {stats['avg_lag_ms']}ms / max {stats['max_lag_ms']}ms"
+            )
+        batch_stats = batcher.metrics() if batcher else None
+        if batch_stats:
+            lines.append(
+                f"   Inference: {batch_stats['batches']} batches, "
+                f"avg {batch_stats['avg_batch_size']} frames per batch"
+            )
+        log_event(log, "capture_summary", "\n".join(lines), cameras=cameras, batching=batch_stats)
 
 
 def main():
@@ -292,6 +1473,27 @@ def main():
         default=os.getenv("ESP32_CAM_URL", "http://192.168.1.100/capture"),
         help="ESP32-CAM capture endpoint URL"
     )
+    parser.add_argument(
+        "--camera-urls",
+        default=os.getenv("ESP32_CAM_URLS"),
+        help="Comma-separated ESP32-CAM capture URLs to poll concurrently (overrides --esp32-url)"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read frames from the cameras' MJPEG streams instead of polling /capture"
+    )
+    parser.add_argument(
+        "--stream-url",
+        default=os.getenv("ESP32_STREAM_URL"),
+        help="With --stream, MJPEG stream URL of --esp32-url (default: http://<host>:<stream-port>/stream)"
+    )
+    parser.add_argument(
+        "--stream-port",
+        type=int,
+        default=81,
+        help="With --stream, port of the ESP32-CAM stream server"
+    )
     parser.add_argument(
         "--gcs-bucket",
         default=os.getenv("GCS_BUCKET", "household-fire-images"),
@@ -312,12 +1514,311 @@ def main():
         default=os.getenv("FIRE_MODEL_PATH"),
         help="Path to fire detection model file (optional)"
     )
+    parser.add_argument(
+        "--backend",
+        default=os.getenv("FIRE_MODEL_BACKEND", "torch"),
+        choices=["torch", "onnx", "openvino", "torchscript"],
+        help="Inference backend (non-torch backends export the model once and cache it)"
+    )
+    parser.add_argument(
+        "--imgsz",
+        type=int,
+        default=640,
+        help="Model input resolution"
+    )
+    parser.add_argument(
+        "--full-decode",
+        action="store_true",
+        help="Decode frames at full resolution instead of reduced JPEG scale down to --imgsz"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=int(os.getenv("FIRE_INFERENCE_THREADS", "0")),
+        help="Intra-op inference threads (0 = one per core)"
+    )
+    parser.add_argument(
+        "--interop-threads",
+        type=int,
+        default=int(os.getenv("FIRE_INTEROP_THREADS", "0")),
+        help="Inter-op inference threads (0 = library default)"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=3,
+        help="Dummy inference calls at startup so the first frames don't pay for lazy init (0 = off)"
+    )
+    parser.add_argument(
+        "--warmup-size",
+        default="800x600",
+        help="Camera resolution (WxH) of the warmup frames"
+    )
+    parser.add_argument(
+        "--latency-budget-ms",
+        type=float,
+        default=0.0,
+        help="Fall back to cheaper detection while inference takes longer than this per frame (0 = off)"
+    )
+    parser.add_argument(
+        "--budget-fallback",
+        default="brightness",
+        help="With --latency-budget-ms, comma-separated fallback modes in order: smaller input sizes and/or brightness"
+    )
+    parser.add_argument(
+        "--budget-probe",
+        type=float,
+        default=30.0,
+        help="With --latency-budget-ms, seconds between attempts to restore the better mode"
+    )
     parser.add_argument(
         "--interval",
         type=float,
         default=2.0,
         help="Detection interval in seconds"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="With --camera-urls, run up to this many frames per model call"
+    )
+    parser.add_argument(
+        "--batch-wait",
+        type=float,
+        default=0.05,
+        help="Max seconds a frame waits for its inference batch to fill"
+    )
+    parser.add_argument(
+        "--tiled",
+        action="store_true",
+        help="Run the model on native-resolution crops around fire-colored regions instead of the whole frame"
+    )
+    parser.add_argument(
+        "--tile-reduce",
+        type=int,
+        default=8,
+        help="With --tiled, subsampling step for the region proposal mask"
+    )
+    parser.add_argument(
+        "--max-tiles",
+        type=int,
+        default=4,
+        help="With --tiled, maximum crops per frame"
+    )
+    parser.add_argument(
+        "--inference-workers",
+        type=int,
+        default=int(os.getenv("FIRE_INFERENCE_WORKERS", "0")),
+        help="Run inference in this many worker processes, each with its own model (0 = in-process)"
+    )
+    parser.add_argument(
+        "--worker-threads",
+        type=int,
+        default=1,
+        help="With --inference-workers, intra-op threads per worker process"
+    )
+    parser.add_argument(
+        "--synthetic-detector",
+        action="store_true",
+        help="Replace inference with a seeded synthetic detector (load testing, no model needed)"
+    )
+    parser.add_argument(
+        "--synthetic-seed",
+        type=int,
+        default=0,
+        help="With --synthetic-detector, seed for verdicts and latencies"
+    )
+    parser.add_argument(
+        "--synthetic-fire-rate",
+        type=float,
+        default=0.05,
+        help="With --synthetic-detector, probability that a frame is fire"
+    )
+    parser.add_argument(
+        "--synthetic-burst-rate",
+        type=float,
+        default=0.0,
+        help="With --synthetic-detector, per-frame probability of starting a burst of 10 fire frames"
+    )
+    parser.add_argument(
+        "--synthetic-latency-ms",
+        type=float,
+        default=20.0,
+        help="With --synthetic-detector, mean inference latency per frame"
+    )
+    parser.add_argument(
+        "--synthetic-latency-dist",
+        choices=LATENCY_DISTRIBUTIONS,
+        default="normal",
+        help="With --synthetic-detector, inference latency distribution"
+    )
+    parser.add_argument(
+        "--motion-gate",
+        action="store_true",
+        help="Reuse the last verdict instead of running inference on unchanged frames"
+    )
+    parser.add_argument(
+        "--motion-threshold",
+        type=float,
+        default=4.0,
+        help="Mean grayscale difference (0-255) that counts as a scene change"
+    )
+    parser.add_argument(
+        "--max-skip",
+        type=int,
+        default=30,
+        help="Force a full inference after this many consecutive skipped frames"
+    )
+    parser.add_argument(
+        "--smoothing",
+        choices=["off", "ema", "kofn"],
+        default="off",
+        help="Raise one alert per fire instead of one per fire frame (EMA or k-of-n confirmation)"
+    )
+    parser.add_argument(
+        "--ema-alpha",
+        type=float,
+        default=0.4,
+        help="With --smoothing ema, weight of the newest frame's confidence"
+    )
+    parser.add_argument(
+        "--alarm-on",
+        type=float,
+        default=0.5,
+        help="With --smoothing ema, smoothed confidence that raises the alarm"
+    )
+    parser.add_argument(
+        "--alarm-off",
+        type=float,
+        default=0.2,
+        help="With --smoothing ema, smoothed confidence below which the alarm clears"
+    )
+    parser.add_argument(
+        "--confirm-k",
+        type=int,
+        default=3,
+        help="With --smoothing kofn, fire frames needed among the last --confirm-n"
+    )
+    parser.add_argument(
+        "--confirm-n",
+        type=int,
+        default=5,
+        help="With --smoothing kofn, window length in frames"
+    )
+    parser.add_argument(
+        "--clip-frames",
+        type=int,
+        default=0,
+        help="Keep this many recent frames per camera and upload them as a clip with each alert (0 = off)"
+    )
+    parser.add_argument(
+        "--clip-mb",
+        type=float,
+        default=4.0,
+        help="With --clip-frames, memory reserved per camera for buffered frames (MB)"
+    )
+    parser.add_argument(
+        "--batch-events",
+        action="store_true",
+        help="Batch Firestore writes and coalesce repeated DANGER events per camera"
+    )
+    parser.add_argument(
+        "--event-batch",
+        type=int,
+        default=20,
+        help="With --batch-events, commit once this many event documents are pending"
+    )
+    parser.add_argument(
+        "--event-flush",
+        type=float,
+        default=1.0,
+        help="With --batch-events, commit pending events at least this often (seconds)"
+    )
+    parser.add_argument(
+        "--coalesce-window",
+        type=float,
+        default=30.0,
+        help="With --batch-events, merge same-camera events less than this many seconds apart"
+    )
+    parser.add_argument(
+        "--spool-uploads",
+        action="store_true",
+        help="Spool fire frames to disk and upload them in the background with retries"
+    )
+    parser.add_argument(
+        "--spool-dir",
+        default=os.getenv("UPLOAD_SPOOL_DIR", "upload_spool"),
+        help="With --spool-uploads, directory for frames waiting to be uploaded"
+    )
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        default=4,
+        help="With --spool-uploads, parallel upload threads"
+    )
+    parser.add_argument(
+        "--spool-max-mb",
+        type=float,
+        default=256,
+        help="With --spool-uploads, drop the oldest spooled frames beyond this size"
+    )
+    parser.add_argument(
+        "--sensor-log",
+        default=os.getenv("SENSOR_LOG_PATH"),
+        help="Tail this gateway NDJSON stream (e.g. ../data/local-buffer.ndjson) to set capture cadence"
+    )
+    parser.add_argument(
+        "--node-cameras",
+        default=os.getenv("NODE_CAMERAS"),
+        help="With --sensor-log, node_id=camera_url pairs, comma-separated (default: all nodes drive all cameras)"
+    )
+    parser.add_argument(
+        "--normal-interval",
+        type=float,
+        default=30.0,
+        help="With --sensor-log, seconds between captures while readings are NORMAL"
+    )
+    parser.add_argument(
+        "--alert-interval",
+        type=float,
+        default=0.5,
+        help="With --sensor-log, seconds between captures on WARNING/DANGER or flame in low light"
+    )
+    parser.add_argument(
+        "--alert-hold",
+        type=float,
+        default=60.0,
+        help="With --sensor-log, seconds to keep the fast cadence after the last elevated reading"
+    )
+    parser.add_argument(
+        "--ldr-threshold",
+        type=float,
+        default=200,
+        help="With --sensor-log, raw LDR value below which a flame reading triggers fast capture"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=int(os.getenv("FIRE_METRICS_PORT", "0")),
+        help="Serve Prometheus metrics on this local port (0 disables the endpoint)"
+    )
+    parser.add_argument(
+        "--metrics-host",
+        default=os.getenv("FIRE_METRICS_HOST", "127.0.0.1"),
+        help="Interface for the metrics endpoint"
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=["text", "json"],
+        default=os.getenv("FIRE_LOG_FORMAT", "text"),
+        help="Console lines (text) or one JSON object per line (json)"
+    )
+    parser.add_argument(
+        "--log-level",
+        default=os.getenv("FIRE_LOG_LEVEL", "INFO"),
+        help="Minimum log level (DEBUG, INFO, WARNING, ERROR)"
+    )
     parser.add_argument(
         "--once",
         action="store_true",
@@ -325,6 +1826,7 @@ def main():
     )
     
     args = parser.parse_args()
+    configure_logging(args.log_format, args.log_level)
     
     # Resolve relative paths
     script_dir = Path(__file__).parent
@@ -336,12 +1838,105 @@ def main():
         gcs_bucket_name=args.gcs_bucket,
         gcs_service_account_path=str(gcs_key_path),
         firebase_credentials_path=args.firebase_key,
-        model_path=args.model
+        model_path=args.model,
+        backend=args.backend,
+        imgsz=args.imgsz,
+        threads=args.threads or None,
+        interop_threads=args.interop_threads or None
     )
+    if args.full_decode:
+        detector.decode_size = None
+    if args.synthetic_detector:
+        detector.enable_synthetic_detector(
+            seed=args.synthetic_seed,
+            fire_rate=args.synthetic_fire_rate,
+            burst_rate=args.synthetic_burst_rate,
+            latency_ms=args.synthetic_latency_ms,
+            latency_dist=args.synthetic_latency_dist
+        )
+    if args.tiled:
+        detector.enable_tiling(reduce=args.tile_reduce, max_regions=args.max_tiles)
+    if args.latency_budget_ms:
+        detector.enable_latency_budget(
+            args.latency_budget_ms,
+            fallback=[mode.strip() for mode in args.budget_fallback.split(",") if mode.strip()],
+            probe_interval=args.budget_probe
+        )
+    if args.warmup:
+        detector.warmup(
+            args.warmup,
+            frame_size=tuple(int(v) for v in args.warmup_size.lower().split("x")),
+            batch=args.batch_size,
+            in_process=not args.inference_workers
+        )
+    if args.inference_workers:
+        detector.enable_inference_pool(args.inference_workers, threads_per_worker=args.worker_threads)
+    if args.motion_gate:
+        detector.enable_motion_gate(threshold=args.motion_threshold, max_skip=args.max_skip)
+    if args.smoothing != "off":
+        detector.enable_smoothing(
+            args.smoothing,
+            alpha=args.ema_alpha,
+            on_threshold=args.alarm_on,
+            off_threshold=args.alarm_off,
+            k=args.confirm_k,
+            n=args.confirm_n
+        )
+    if args.clip_frames:
+        detector.enable_clip_capture(max_frames=args.clip_frames, arena_mb=args.clip_mb)
+    if args.stream:
+        detector.enable_streaming(
+            stream_urls={args.esp32_url: args.stream_url} if args.stream_url else None,
+            port=args.stream_port
+        )
+    if args.spool_uploads:
+        spool_dir = script_dir / args.spool_dir if not os.path.isabs(args.spool_dir) else args.spool_dir
+        detector.enable_upload_manager(
+            str(spool_dir),
+            workers=args.upload_workers,
+            max_spool_mb=args.spool_max_mb
+        )
+    if args.batch_events:
+        detector.enable_event_writer(
+            max_batch=args.event_batch,
+            flush_interval=args.event_flush,
+            coalesce_window=args.coalesce_window
+        )
+    if args.sensor_log:
+        node_cameras = dict(
+            (node.strip(), url.strip())
+            for node, url in (pair.split("=", 1) for pair in (args.node_cameras or "").split(",") if "=" in pair)
+        )
+        detector.enable_sensor_schedule(
+            args.sensor_log,
+            node_cameras=node_cameras,
+            normal_interval=args.normal_interval,
+            alert_interval=args.alert_interval,
+            fallback_interval=args.interval,
+            hold=args.alert_hold,
+            ldr_threshold=args.ldr_threshold
+        )
+    if args.metrics_port:
+        detector.start_metrics_server(args.metrics_port, host=args.metrics_host)
     
     # Run detection
+    camera_urls = [url.strip() for url in (args.camera_urls or "").split(",") if url.strip()]
+    
     if args.once:
         detector.process_frame()
+        detector.stop_inference_pool()
+        detector.stop_sensor_schedule()
+        detector.stop_streams()
+        detector.stop_upload_manager()
+        detector.stop_event_writer()
+        detector.stop_metrics_server()
+    elif camera_urls:
+        detector.run_multi_camera(
+            camera_urls,
+            interval=args.interval,
+            batch_size=args.batch_size,
+            batch_wait=args.batch_wait
+        )
     else:
         detector.run_continuous(interval=args.interval)
 
@@ -0,0 +1,117 @@
+"""
+Fire-colored pixel masks for brightness-based fire detection
+
+A pixel looks like fire when it is very bright (flame core) or has a warm
+red/orange/yellow tone:
+
+    very_bright = (r + g + b) / 3 > 200
+    warm        = r > 100 and r >= g >= b and (r + g + b) / 3 > 100
+
+count_fire_pixels() evaluates this on uint8 data with integer sums and
+preallocated scratch buffers, so repeated calls on same-sized frames
+allocate nothing. count_fire_pixels_reference() is the original float64
+implementation, kept to check the fast path against.
+"""
+
+import threading
+from typing import Tuple
+
+import numpy as np
+
+
+def count_fire_pixels_reference(rgb: np.ndarray) -> Tuple[int, int]:
+    """
+    Float reference implementation of the fire mask
+
+    Returns:
+        Tuple of (fire_pixels, total_pixels)
+    """
+    r = rgb[:, :, 0].astype(float)
+    g = rgb[:, :, 1].astype(float)
+    b = rgb[:, :, 2].astype(float)
+
+    brightness = (r + g + b) / 3
+    very_bright = brightness > 200
+    warm_colors = (r > 100) & (r >= g) & (g >= b) & (brightness > 100)
+    fire_mask = very_bright | warm_colors
+    return int(np.sum(fire_mask)), fire_mask.size
+
+
+class FireMask:
+    """Integer fire mask with scratch buffers reused across same-sized frames"""
+
+    def __init__(self):
+        self._shape = None
+
+    def _scratch(self, shape):
+        if shape != self._shape:
+            self._shape = shape
+            self._sum = np.empty(shape, dtype=np.uint16)
+            self._mask = np.empty(shape, dtype=bool)
+            self._warm = np.empty(shape, dtype=bool)
+            self._tmp = np.empty(shape, dtype=bool)
+        return self._sum, self._mask, self._warm, self._tmp
+
+    def mask(self, rgb: np.ndarray) -> np.ndarray:
+        """
+        Boolean fire mask of an HxWx3 uint8 array
+
+        brightness > 200 is evaluated exactly as r + g + b > 600 (and > 100
+        as > 300), so the result matches the float reference bit for bit.
+        The returned array is a scratch buffer, overwritten by the next call.
+        """
+        r, g, b = rgb[:, :, 0], rgb[:, :, 1], rgb[:, :, 2]
+        total, mask, warm, tmp = self._scratch(r.shape)
+
+        np.add(r, g, out=total, dtype=np.uint16)
+        np.add(total, b, out=total)
+
+        # 1. Very bright spots (likely flame core) - white/yellow
+        np.greater(total, 600, out=mask)
+
+        # 2. Fire-like colors: warm tones (red/orange/yellow)
+        np.greater(total, 300, out=warm)
+        np.greater(r, 100, out=tmp)
+        np.logical_and(warm, tmp, out=warm)
+        np.greater_equal(r, g, out=tmp)
+        np.logical_and(warm, tmp, out=warm)
+        np.greater_equal(g, b, out=tmp)
+        np.logical_and(warm, tmp, out=warm)
+
+        np.logical_or(mask, warm, out=mask)
+        return mask
+
+    def count(self, rgb: np.ndarray) -> Tuple[int, int]:
+        """
+        Count fire-colored pixels in an HxWx3 uint8 array
+
+        Returns:
+            Tuple of (fire_pixels, total_pixels)
+        """
+        mask = self.mask(rgb)
+        return int(np.count_nonzero(mask)), mask.size
+
+    def brightness_sum(self) -> np.ndarray:
+        """r + g + b of the last frame passed to count() (for debug output)"""
+        return self._sum
+
+
+_local = threading.local()
+
+
+def get_fire_mask() -> FireMask:
+    """Per-thread FireMask, so concurrent detectors never share scratch buffers"""
+    mask = getattr(_local, "mask", None)
+    if mask is None:
+        mask = _local.mask = FireMask()
+    return mask
+
+
+def count_fire_pixels(rgb: np.ndarray) -> Tuple[int, int]:
+    """Fast fire mask using this thread's scratch buffers"""
+    return get_fire_mask().count(rgb)
+
+
+def fire_mask(rgb: np.ndarray) -> np.ndarray:
+    """Boolean fire mask using this thread's scratch buffers (overwritten by the next call)"""
+    return get_fire_mask().mask(rgb)
@@ -0,0 +1,158 @@
+"""
+Fixed-memory ring buffer of recent JPEG frames for pre-fire clips
+
+A DANGER event normally carries only the frame that triggered it. FrameRing
+keeps the last few frames of a camera so the seconds leading up to a
+detection can be uploaded with it, without growing memory:
+
+- frames are copied as-is (no re-encode) into one preallocated bytearray
+  arena, written sequentially and wrapping around at the end
+- a fixed-size offset/length/timestamp index records where each frame lives
+- writing a new frame evicts the oldest frames it would overwrite, and the
+  oldest frame once the index is full
+
+clip_archive() packs a snapshot of the ring into an uncompressed ZIP (JPEGs
+don't compress further) with one timestamped file per frame.
+"""
+
+import io
+import threading
+import time
+import zipfile
+from typing import List, Optional, Tuple
+
+# (capture time in seconds since the epoch, JPEG bytes)
+Frame = Tuple[float, bytes]
+
+
+class FrameRing:
+    def __init__(self, max_frames: int = 20, arena_bytes: int = 4 * 1024 * 1024):
+        """
+        Initialize the ring
+
+        Args:
+            max_frames: Most frames kept (index size)
+            arena_bytes: Memory reserved for frame data; frames larger than this are dropped
+        """
+        import numpy as np
+
+        self.max_frames = max_frames
+        self.arena_bytes = arena_bytes
+        self._arena = bytearray(arena_bytes)
+        self._view = memoryview(self._arena)
+        self._offsets = np.zeros(max_frames, dtype=np.int64)
+        self._lengths = np.zeros(max_frames, dtype=np.int64)
+        self._stamps = np.zeros(max_frames, dtype=np.float64)
+        self._head = 0      # Index slot of the oldest frame
+        self._count = 0
+        self._write = 0     # Arena offset for the next frame
+        self._lock = threading.Lock()
+
+        self.pushed = 0
+        self.evicted = 0
+        self.dropped = 0
+        self.clips = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _evict_oldest(self):
+        self._head = (self._head + 1) % self.max_frames
+        self._count -= 1
+        self.evicted += 1
+
+    def push(self, frame: bytes, timestamp: Optional[float] = None) -> bool:
+        """
+        Copy a JPEG frame into the ring
+
+        Returns:
+            False if the frame is larger than the whole arena (not stored)
+        """
+        size = len(frame)
+        if size > self.arena_bytes:
+            self.dropped += 1
+            return False
+        timestamp = time.time() if timestamp is None else timestamp
+
+        with self._lock:
+            start = self._write
+            skipped_tail = None
+            if start + size > self.arena_bytes:
+                # No room before the end: the tail is left unused and the frame goes to the front
+                skipped_tail, start = start, 0
+            end = start + size
+
+            # Live frames sit in write order from the oldest onwards, so the ones in
+            # the way of [start, end) (or in the skipped tail) are always the oldest
+            while self._count:
+                offset = self._offsets[self._head]
+                in_tail = skipped_tail is not None and offset >= skipped_tail
+                overlaps = offset < end and start < offset + self._lengths[self._head]
+                if not (in_tail or overlaps or self._count == self.max_frames):
+                    break
+                self._evict_oldest()
+
+            self._view[start:end] = frame
+            slot = (self._head + self._count) % self.max_frames
+            self._offsets[slot] = start
+            self._lengths[slot] = size
+            self._stamps[slot] = timestamp
+            self._count += 1
+            self._write = end
+            self.pushed += 1
+        return True
+
+    def frames(self, clear: bool = False) -> List[Frame]:
+        """
+        Copy out the buffered frames, oldest first
+
+        Args:
+            clear: Empty the ring afterwards, so the next clip holds only newer frames
+        """
+        with self._lock:
+            slots = [(self._head + i) % self.max_frames for i in range(self._count)]
+            frames = [
+                (float(self._stamps[slot]),
+                 bytes(self._view[self._offsets[slot]:self._offsets[slot] + self._lengths[slot]]))
+                for slot in slots
+            ]
+            if clear:
+                self._head = self._count = self._write = 0
+        return frames
+
+    def clip(self, clear: bool = True) -> Optional[bytes]:
+        """Snapshot the ring as a ZIP clip (None if empty)"""
+        frames = self.frames(clear=clear)
+        if not frames:
+            return None
+        self.clips += 1
+        return clip_archive(frames)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            used = int(self._lengths[[(self._head + i) % self.max_frames for i in range(self._count)]].sum())
+            span = 0.0
+            if self._count:
+                newest = (self._head + self._count - 1) % self.max_frames
+                span = float(self._stamps[newest] - self._stamps[self._head])
+            return {
+                "frames": self._count,
+                "bytes_used": used,
+                "arena_bytes": self.arena_bytes,
+                "span_s": round(span, 2),
+                "pushed": self.pushed,
+                "evicted": self.evicted,
+                "dropped": self.dropped,
+                "clips": self.clips,
+            }
+
+
+def clip_archive(frames: List[Frame]) -> bytes:
+    """Pack frames into an uncompressed ZIP, one frame_<n>_<epoch ms>.jpg per frame"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for index, (timestamp, data) in enumerate(frames):
+            name = f"frame_{index:03d}_{int(timestamp * 1000)}.jpg"
+            info = zipfile.ZipInfo(name, date_time=time.localtime(timestamp)[:6])
+            archive.writestr(info, data)
+    return buffer.getvalue()
@@ -0,0 +1,125 @@
+"""
+Image decoding helpers shared by the fire detectors
+
+Frames arrive as JPEG bytes from the ESP32-CAM or as image files from the
+Node.js scripts. These helpers decode them straight into NumPy arrays so the
+detectors never need a temporary file on disk.
+
+The model resizes every frame to its input size (imgsz) anyway, so passing
+target=imgsz decodes JPEGs at the smallest DCT scale (1/2, 1/4 or 1/8) whose
+long side is still at least imgsz. The model sees the same resolution, but
+decode time and memory shrink with the scale. The decoded array is then
+shared by YOLO and the brightness check instead of each decoding the frame.
+"""
+
+import io
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+# Anything the detectors accept as an image
+ImageSource = Union[str, bytes, bytearray, memoryview, np.ndarray]
+
+
+def _reduce(img: Image.Image, factor: int) -> Image.Image:
+    """
+    Shrink an image by an integer factor as cheaply as possible
+    
+    JPEGs are decoded at reduced scale in the DCT domain via draft(), which
+    only supports 1/2, 1/4 and 1/8; the rest of the way to exactly
+    (width // factor, height // factor) uses reduce() and, when the drafted
+    size isn't a multiple of that, a box-filtered resize().
+    """
+    if factor <= 1:
+        return img
+    target = (max(1, img.size[0] // factor), max(1, img.size[1] // factor))
+    if img.format == "JPEG":
+        img.draft("RGB", target)
+    # draft() never goes below the target, so the leftover factor is at least 1
+    leftover = min(img.size[0] // target[0], img.size[1] // target[1])
+    if leftover > 1:
+        img = img.reduce(leftover)
+    return img.resize(target, Image.BOX) if img.size != target else img
+
+
+def draft_scale(size: Tuple[int, int], target: Optional[int]) -> int:
+    """Largest JPEG draft divisor (1, 2, 4 or 8) keeping the long side >= target"""
+    if not target:
+        return 1
+    long_side = max(size)
+    scale = 1
+    while scale < 8 and long_side // (scale * 2) >= target:
+        scale *= 2
+    return scale
+
+
+def decoded_size(size: Tuple[int, int], target: Optional[int]) -> Tuple[int, int]:
+    """(width, height) a JPEG of this size decodes to with target (libjpeg rounds up)"""
+    scale = draft_scale(size, target)
+    width, height = size
+    return -(-width // scale), -(-height // scale)
+
+
+def _draft(img: Image.Image, target: Optional[int]) -> Image.Image:
+    """Decode a JPEG at reduced scale in the DCT domain, no smaller than target"""
+    if img.format != "JPEG":
+        return img
+    scale = draft_scale(img.size, target)
+    if scale > 1:
+        width, height = img.size
+        img.draft("RGB", (width // scale, height // scale))
+    return img
+
+
+def _to_array(img: Image.Image) -> np.ndarray:
+    """Convert a PIL image to a uint8 array (RGB, or 2-D for grayscale)"""
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    return np.asarray(img)
+
+
+def decode_image_bytes(data: Union[bytes, bytearray, memoryview], reduce: int = 1,
+                       target: Optional[int] = None) -> np.ndarray:
+    """
+    Decode encoded image bytes (JPEG, PNG, ...) in memory, optionally downscaled
+    
+    Args:
+        reduce: Integer downscale factor
+        target: Decode JPEGs at reduced scale with the long side still >= target
+            (the model input size); ignored when reduce > 1
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        return _to_array(_reduce(img, reduce) if reduce > 1 else _draft(img, target))
+
+
+def load_image(source: ImageSource, reduce: int = 1, target: Optional[int] = None) -> np.ndarray:
+    """
+    Load an image from a file path, encoded bytes, or an already decoded array
+    
+    Args:
+        source: File path, encoded image bytes, or decoded array
+        reduce: Integer downscale factor (arrays are subsampled without copying)
+        target: Decode JPEGs at reduced scale with the long side still >= target
+            (decoded arrays are returned as they are)
+    
+    Returns:
+        np.ndarray: uint8 array, HxWx3 RGB (HxW for grayscale images)
+    """
+    if isinstance(source, np.ndarray):
+        return source[::reduce, ::reduce] if reduce > 1 else source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return decode_image_bytes(source, reduce, target)
+    with Image.open(source) as img:
+        return _to_array(_reduce(img, reduce) if reduce > 1 else _draft(img, target))
+
+
+def rgb_to_bgr(frame: np.ndarray) -> np.ndarray:
+    """
+    Reorder an RGB array to BGR for model inference
+    
+    Ultralytics treats NumPy inputs as OpenCV-style BGR images.
+    """
+    if frame.ndim == 2:
+        return np.ascontiguousarray(np.stack([frame] * 3, axis=-1))
+    return np.ascontiguousarray(frame[:, :, 2::-1])
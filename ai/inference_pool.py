@@ -0,0 +1,490 @@
+"""
+Multi-process inference pool for multi-core hosts
+
+One FireDetectionAI process runs decode, pre- and post-processing under one
+GIL, so extra cores sit idle. InferencePool spreads frames over N worker
+processes that each hold their own loaded model:
+
+- Frames travel through shared memory: every worker owns a segment of
+  fixed-size slots, the parent copies the JPEG bytes into a free slot and
+  sends only (task id, slot, length) over the worker's queue.
+- Dispatch is least-loaded: each frame goes to the worker with the fewest
+  frames in flight that has a free slot; submit() blocks while every slot
+  is busy.
+- A monitor thread restarts workers that die (segfault, OOM kill) and
+  re-dispatches the frames they held; a frame that kills workers twice fails
+  its future instead of crash-looping the pool.
+
+Workers are started with the "spawn" method, so no model, CUDA context or
+thread state is inherited from the parent.
+"""
+
+import logging
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+from model_backends import THREAD_ENV_VARS
+from structured_log import get_logger, log_event
+
+log = get_logger("pool")
+
+DETECTORS = ("yolo", "brightness")
+MAX_ATTEMPTS = 2  # Dispatches per frame before a crashing frame is failed
+MAX_LOAD_FAILURES = 3  # Deaths before the model loaded; then the worker stays down
+
+
+def parse_fire_result(result) -> Tuple[bool, float]:
+    """Extract (fire_detected, confidence) from one model result"""
+    # Process results (adjust based on your model output)
+    # Example: Check if fire class is detected with confidence > threshold
+    for box in result.boxes:
+        # Adjust class_id based on your model (e.g., class 0 = fire)
+        if box.cls == 0 and box.conf > 0.5:  # Fire class with >50% confidence
+            return True, float(box.conf)
+    return False, 0.0
+
+
+def parse_fire_boxes(boxes) -> Tuple[bool, float]:
+    """parse_fire_result for tiled (x1, y1, x2, y2, confidence, class_id) detections"""
+    for *_, conf, cls_id in boxes:
+        if cls_id == 0 and conf > 0.5:
+            return True, conf
+    return False, 0.0
+
+
+def _make_detector(config: dict):
+    """Build the per-process detect(image_bytes) -> (fire, confidence) function"""
+    if config["detector"] == "brightness":
+        from yolo_fire_wrapper import detect_fire_brightness
+
+        def detect(data):
+            result = detect_fire_brightness(data, config["conf"], reduce=config["brightness_reduce"])
+            return bool(result["fire"]), float(result["confidence"])
+        return detect
+
+    from image_decode import decode_image_bytes, rgb_to_bgr
+    from model_backends import configure_threads, load_model, warmup_model
+
+    # Pin torch's pools too: the parent's --threads must not carry over into N workers
+    configure_threads(config.get("threads", 1), config.get("interop_threads", 1))
+    model = load_model(config["model_path"], config["backend"], config["imgsz"])
+    if config.get("warmup"):
+        # Before "ready", so no real frame reaches a cold worker (restarted ones included)
+        warmup_model(model, config["imgsz"], **config["warmup"])
+    tiling = config.get("tiling")
+
+    def detect(data):
+        frame = decode_image_bytes(data, target=None if tiling is not None else config.get("decode_size"))
+        if tiling is not None:
+            from roi_tiling import detect_tiled
+            boxes, _ = detect_tiled(model, frame, config["imgsz"], verbose=False, **tiling)
+            return parse_fire_boxes(boxes)
+        result = model([rgb_to_bgr(frame)], imgsz=config["imgsz"], verbose=False)[0]
+        return parse_fire_result(result)
+    return detect
+
+
+def _worker_main(worker_id: int, shm_name: str, slot_bytes: int, tasks, results, config: dict):
+    """Worker process: load the model once, then answer tasks until told to stop"""
+    # One intra-op thread per worker unless configured; N workers x all cores oversubscribes.
+    # Overwrite, not setdefault: spawned workers inherit the parent's --threads environment
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(config.get("threads", 1))
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        started = time.perf_counter()
+        detect = _make_detector(config)
+        results.put(("ready", worker_id, None, None, time.perf_counter() - started))
+
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            task_id, slot, length, payload = task
+            started = time.perf_counter()
+            view = None
+            try:
+                if payload is None:
+                    offset = slot * slot_bytes
+                    view = shm.buf[offset:offset + length]
+                verdict = detect(view if payload is None else payload)
+                results.put(("result", worker_id, task_id, verdict, time.perf_counter() - started))
+            except Exception as e:
+                results.put(("error", worker_id, task_id, f"{type(e).__name__}: {e}", time.perf_counter() - started))
+            finally:
+                if view is not None:
+                    view.release()
+    finally:
+        shm.close()
+
+
+class _Task:
+    def __init__(self, task_id: int, data: bytes, future: Future):
+        self.id = task_id
+        self.data = data
+        self.future = future
+        self.attempts = 0
+        self.slot: Optional[int] = None
+
+
+class _Worker:
+    def __init__(self, worker_id: int, shm: shared_memory.SharedMemory, slots: int):
+        self.id = worker_id
+        self.shm = shm
+        self.free_slots = list(range(slots))
+        self.in_flight: Dict[int, _Task] = {}
+        self.process: Optional[mp.process.BaseProcess] = None
+        self.tasks = None
+        self.ready = False
+        self.load_failures = 0
+        self.restarts = 0
+        self.processed = 0
+        self.busy_time = 0.0
+
+
+class InferencePool:
+    def __init__(
+        self,
+        workers: int = 2,
+        detector: str = "yolo",
+        model_path: Optional[str] = None,
+        backend: str = "torch",
+        imgsz: int = 640,
+        conf: float = 0.5,
+        brightness_reduce: int = 1,
+        tiling: Optional[dict] = None,
+        decode_size: Optional[int] = None,
+        threads_per_worker: int = 1,
+        warmup: Optional[dict] = None,
+        slots_per_worker: int = 2,
+        slot_bytes: int = 2 * 1024 * 1024
+    ):
+        """
+        Initialize the pool (call start() to launch the workers)
+
+        Args:
+            workers: Worker processes, each with its own model
+            detector: "yolo" (model_path through model_backends) or "brightness"
+            model_path: YOLO model for the yolo detector
+            backend: Inference backend (torch, onnx, openvino, torchscript)
+            imgsz: Model input resolution
+            conf: Confidence threshold for the brightness detector
+            brightness_reduce: Downscale factor for the brightness detector
+            tiling: roi_tiling options (reduce, max_regions, pad), None for whole frames
+            decode_size: Decode whole frames at reduced JPEG scale down to this long side
+                (None = full resolution; tiled frames are always full resolution)
+            threads_per_worker: Intra-op threads per worker (OMP/MKL and torch)
+            warmup: model_backends.warmup_model options (runs, frame_shape, batch)
+                run by each yolo worker before it reports ready (None = no warmup)
+            slots_per_worker: Frames a worker can hold at once (queued + running)
+            slot_bytes: Shared memory per slot; larger frames are sent pickled
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if detector not in DETECTORS:
+            raise ValueError(f"Unknown detector '{detector}'. Choose from: {', '.join(DETECTORS)}")
+
+        self.num_workers = workers
+        self.slots_per_worker = slots_per_worker
+        self.slot_bytes = slot_bytes
+        self.config = {
+            "detector": detector,
+            "model_path": model_path,
+            "backend": backend,
+            "imgsz": imgsz,
+            "conf": conf,
+            "brightness_reduce": brightness_reduce,
+            "tiling": tiling,
+            "decode_size": decode_size,
+            "threads": threads_per_worker,
+            "interop_threads": 1,  # One inference at a time per worker
+            "warmup": warmup,
+        }
+
+        self._ctx = mp.get_context("spawn")
+        self._results = None
+        self._workers: List[_Worker] = []
+        self._backlog: List[_Task] = []   # Re-dispatched frames, served before new ones
+        self._next_id = 0
+        self._rotation = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.redispatched = 0
+        self.oversize = 0
+
+    # ---------- lifecycle ----------
+
+    def start(self, timeout: float = 120.0) -> "InferencePool":
+        """Launch the workers and wait until each has loaded its model"""
+        self._results = self._ctx.Queue()
+        for worker_id in range(self.num_workers):
+            shm = shared_memory.SharedMemory(create=True, size=self.slots_per_worker * self.slot_bytes)
+            worker = _Worker(worker_id, shm, self.slots_per_worker)
+            self._workers.append(worker)
+            self._spawn(worker)
+
+        for target, name in ((self._collect, "pool-results"), (self._monitor, "pool-monitor")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            # Workers retired after MAX_LOAD_FAILURES will never be ready
+            while not all(w.ready or w.process is None for w in self._workers):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stop()
+                    raise TimeoutError(f"Inference workers not ready after {timeout}s")
+                self._cond.wait(remaining)
+            usable = self._usable()
+        if not usable:
+            self.stop()
+            raise RuntimeError("No inference worker could load the model")
+        log_event(log, "pool_ready", f"✓ Inference pool ready: {self.num_workers} worker(s) ({self.config['detector']})",
+                  workers=self.num_workers, detector=self.config["detector"])
+        return self
+
+    def _spawn(self, worker: _Worker):
+        worker.tasks = self._ctx.Queue()
+        worker.ready = False
+        worker.process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker.id, worker.shm.name, self.slot_bytes, worker.tasks, self._results, self.config),
+            name=f"inference-{worker.id}",
+            daemon=True
+        )
+        worker.process.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the workers, fail frames still in flight and free the shared memory"""
+        with self._cond:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            if worker.process is not None and worker.process.is_alive():
+                worker.tasks.put(None)
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            if worker.process is not None:
+                worker.process.join(max(0.0, deadline - time.monotonic()))
+                if worker.process.is_alive():
+                    worker.process.terminate()
+                    worker.process.join()
+
+        self._results.put(None)
+        for thread in self._threads:
+            thread.join()
+        with self._cond:
+            pending = self._backlog + [t for w in self._workers for t in w.in_flight.values()]
+            self._backlog = []
+            for worker in self._workers:
+                worker.in_flight.clear()
+        for task in pending:
+            if not task.future.done():
+                task.future.set_exception(RuntimeError("Inference pool stopped"))
+        for worker in self._workers:
+            worker.shm.close()
+            worker.shm.unlink()
+        self._workers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------- dispatch ----------
+
+    def submit(self, image_bytes: bytes) -> Future:
+        """Queue a frame on the least-loaded worker; blocks while every slot is busy"""
+        future = Future()
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("Inference pool is stopped")
+            task = _Task(self._next_id, bytes(image_bytes), future)
+            self._next_id += 1
+            self.submitted += 1
+            # Re-dispatched frames go first
+            while not self._stopping and self._usable() and (self._backlog or not self._dispatch(task)):
+                self._cond.wait()
+            if self._stopping and not future.done():
+                future.set_exception(RuntimeError("Inference pool stopped"))
+            elif not self._usable() and not future.done():
+                self.failed += 1
+                future.set_exception(RuntimeError("No inference worker can load the model"))
+        return future
+
+    def _usable(self) -> bool:
+        """Whether any worker is running or being restarted (holding _cond)"""
+        return any(w.process is not None for w in self._workers)
+
+    def detect_batch(self, images: List[bytes]) -> List[Tuple[bool, float]]:
+        """Run frames in parallel across the workers; a failed frame counts as no fire"""
+        futures = [self.submit(image) for image in images]
+        verdicts = []
+        for future in futures:
+            try:
+                verdicts.append(future.result())
+            except Exception:
+                verdicts.append((False, 0.0))
+        return verdicts
+
+    def _dispatch(self, task: _Task) -> bool:
+        """Send a task to the ready worker with the fewest frames in flight (holding _cond)"""
+        candidates = [w for w in self._workers if w.ready and w.free_slots]
+        if not candidates:
+            return False
+        # Rotate the starting point so equally loaded workers share the work
+        self._rotation += 1
+        n = len(candidates)
+        worker = min((candidates[(self._rotation + i) % n] for i in range(n)), key=lambda w: len(w.in_flight))
+
+        task.attempts += 1
+        payload = None
+        if len(task.data) <= self.slot_bytes:
+            task.slot = worker.free_slots.pop()
+            offset = task.slot * self.slot_bytes
+            worker.shm.buf[offset:offset + len(task.data)] = task.data
+        else:
+            self.oversize += 1
+            task.slot = None
+            payload = task.data
+        worker.in_flight[task.id] = task
+        worker.tasks.put((task.id, task.slot, len(task.data), payload))
+        return True
+
+    def _release(self, worker: _Worker, task: _Task):
+        """Free a task's slot and hand it to a waiting frame (holding _cond)"""
+        worker.in_flight.pop(task.id, None)
+        if task.slot is not None:
+            worker.free_slots.append(task.slot)
+            task.slot = None
+        while self._backlog and self._dispatch(self._backlog[0]):
+            self._backlog.pop(0)
+        self._cond.notify_all()
+
+    # ---------- background threads ----------
+
+    def _collect(self):
+        """Resolve futures from worker results"""
+        while True:
+            message = self._results.get()
+            if message is None:
+                return
+            kind, worker_id, task_id, value, elapsed = message
+            with self._cond:
+                worker = next((w for w in self._workers if w.id == worker_id), None)
+                if worker is None:
+                    continue
+                if kind == "ready":
+                    worker.ready = True
+                    while self._backlog and self._dispatch(self._backlog[0]):
+                        self._backlog.pop(0)
+                    self._cond.notify_all()
+                    continue
+                task = worker.in_flight.get(task_id)
+                if task is None:
+                    # Already re-dispatched after a restart
+                    continue
+                worker.processed += 1
+                worker.busy_time += elapsed
+                self._release(worker, task)
+                if kind == "result":
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            task.future.elapsed = elapsed
+            if kind == "result":
+                task.future.set_result(tuple(value))
+            else:
+                task.future.set_exception(RuntimeError(value))
+
+    def _monitor(self, poll: float = 0.2):
+        """Restart dead workers and re-dispatch the frames they held"""
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                dead = [w for w in self._workers if w.process is not None and not w.process.is_alive()]
+                failed, abandoned = [], []
+                for worker in dead:
+                    tasks = list(worker.in_flight.values())
+                    worker.in_flight.clear()
+                    worker.free_slots = list(range(self.slots_per_worker))
+                    exitcode = worker.process.exitcode
+                    if not worker.ready:
+                        worker.load_failures += 1
+                    if worker.load_failures >= MAX_LOAD_FAILURES:
+                        # The model itself fails to load; restarting would only loop
+                        worker.process = None
+                        log_event(log, "worker_failed",
+                                  f"✗ Inference worker {worker.id} failed to load the model "
+                                  f"{worker.load_failures} times (exit code {exitcode}); not restarting",
+                                  level=logging.ERROR, worker=worker.id, exitcode=exitcode)
+                    else:
+                        worker.restarts += 1
+                        self._spawn(worker)
+                    for task in tasks:
+                        task.slot = None
+                        if task.attempts >= MAX_ATTEMPTS:
+                            self.failed += 1
+                            failed.append(task)
+                        else:
+                            self.redispatched += 1
+                            self._backlog.append(task)
+                    if worker.process is not None:
+                        log_event(log, "worker_restarted",
+                                  f"⚠ Inference worker {worker.id} died (exit code {exitcode}), restarted; "
+                                  f"{len(tasks)} frame(s) re-dispatched",
+                                  level=logging.WARNING, worker=worker.id, exitcode=exitcode, frames=len(tasks))
+                while self._backlog and self._dispatch(self._backlog[0]):
+                    self._backlog.pop(0)
+                if dead and not self._usable():
+                    # Last worker retired: fail what is waiting instead of blocking forever
+                    self.failed += len(self._backlog)
+                    abandoned, self._backlog = self._backlog, []
+                    log_event(log, "pool_failed", "✗ No inference worker can load the model; failing all frames",
+                              level=logging.ERROR)
+                if dead:
+                    self._cond.notify_all()
+            for task in failed:
+                task.future.set_exception(RuntimeError("Frame crashed the inference worker twice"))
+            for task in abandoned:
+                task.future.set_exception(RuntimeError("No inference worker can load the model"))
+            time.sleep(poll)
+
+    def metrics(self) -> dict:
+        with self._cond:
+            workers = {
+                w.id: {
+                    "in_flight": len(w.in_flight),
+                    "processed": w.processed,
+                    "busy_s": round(w.busy_time, 2),
+                    "restarts": w.restarts,
+                    "alive": w.process is not None and w.process.is_alive(),
+                }
+                for w in self._workers
+            }
+            return {
+                "workers": workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "redispatched": self.redispatched,
+                "backlog": len(self._backlog),
+                "oversize": self.oversize,
+            }
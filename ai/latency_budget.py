@@ -0,0 +1,120 @@
+"""
+Per-frame inference latency budget with automatic fallback
+
+On a shared edge host another process can take the CPU for minutes, and a
+frame that needs 800 ms of inference delays every camera behind it.
+LatencyBudget watches per-frame inference time and walks down a ladder of
+cheaper modes when the budget is blown:
+
+- modes are opaque labels, best first (e.g. "640", "320", "brightness")
+- after `strikes` consecutive over-budget batches the detector steps down
+  one mode; a single slow frame (GC pause, page fault) does not count
+- while degraded, one batch every `probe_interval` seconds runs one mode
+  up; if it fits the budget the detector steps back up, so it recovers on
+  its own once the contention is gone
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+BRIGHTNESS = "brightness"
+
+
+class LatencyBudget:
+    def __init__(self, budget_ms: float, modes: List[str], strikes: int = 3, probe_interval: float = 30.0):
+        """
+        Initialize the budget
+
+        Args:
+            budget_ms: Allowed inference time per frame
+            modes: Detection modes, best first; modes[0] runs while within budget
+            strikes: Consecutive over-budget batches before stepping down
+            probe_interval: Seconds between attempts to step back up while degraded
+        """
+        if len(modes) < 2:
+            raise ValueError("A latency budget needs at least one fallback mode")
+        self.budget = budget_ms / 1000
+        self.modes = list(modes)
+        self.strikes = strikes
+        self.probe_interval = probe_interval
+
+        self._lock = threading.Lock()
+        self._level = 0
+        self._overruns = 0
+        self._next_probe = 0.0
+
+        self.degradations = 0
+        self.restorations = 0
+        self.probes = 0
+        self.over_budget = 0
+        self.last_latency = 0.0
+        self.frames: Dict[str, int] = {mode: 0 for mode in self.modes}
+
+    @property
+    def mode(self) -> str:
+        """Mode currently in effect"""
+        return self.modes[self._level]
+
+    def choose(self) -> str:
+        """Mode to run the next batch in (one mode up when a probe is due)"""
+        with self._lock:
+            if self._level and time.monotonic() >= self._next_probe:
+                self._next_probe = time.monotonic() + self.probe_interval
+                self.probes += 1
+                return self.modes[self._level - 1]
+            return self.modes[self._level]
+
+    def record(self, mode: str, seconds: float, frames: int = 1) -> Optional[Tuple[str, str]]:
+        """
+        Record how long a batch took in `mode`
+
+        Args:
+            mode: Mode the batch ran in (as returned by choose())
+            seconds: Inference time of the whole batch
+            frames: Frames in the batch
+
+        Returns:
+            (from_mode, to_mode) when this batch changed the mode, else None
+        """
+        per_frame = seconds / max(frames, 1)
+        with self._lock:
+            self.frames[mode] += frames
+            self.last_latency = per_frame
+            over = per_frame > self.budget
+            self.over_budget += over
+            level = self.modes.index(mode)
+
+            if level < self._level:
+                # Probe of a better mode: step up only if it fit the budget
+                if over:
+                    return None
+                previous, self._level, self._overruns = self.mode, level, 0
+                self.restorations += 1
+                self._next_probe = time.monotonic() + self.probe_interval
+                return previous, self.mode
+
+            if level != self._level:
+                return None
+            self._overruns = self._overruns + 1 if over else 0
+            if self._overruns < self.strikes or self._level == len(self.modes) - 1:
+                return None
+            previous, self._overruns = self.mode, 0
+            self._level += 1
+            self.degradations += 1
+            self._next_probe = time.monotonic() + self.probe_interval
+            return previous, self.mode
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "fallback_level": self._level,
+                "budget_ms": round(self.budget * 1000, 1),
+                "degradations": self.degradations,
+                "restorations": self.restorations,
+                "probes": self.probes,
+                "over_budget": self.over_budget,
+                "last_latency_ms": round(self.last_latency * 1000, 1),
+                "frames": dict(self.frames),
+            }
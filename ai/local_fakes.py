@@ -0,0 +1,278 @@
+"""
+In-memory stand-ins for Firestore, Google Cloud Storage and an ESP32-CAM
+
+They implement just the client calls the AI module uses, so the detection
+pipeline, event writer, upload manager and camera capture can run in tests,
+replays and benchmarks without credentials, hardware or network access. For a closer match to
+production, point firebase_admin at the Firestore emulator instead by
+setting FIRESTORE_EMULATOR_HOST=localhost:8080.
+"""
+
+import copy
+import itertools
+import threading
+import time
+from typing import Dict, Optional
+
+_ids = itertools.count(1)
+
+
+class FakeDocumentReference:
+    def __init__(self, store: "FakeFirestore", collection: str, doc_id: Optional[str] = None):
+        self._store = store
+        self.collection = collection
+        self.id = doc_id or f"fake-{next(_ids):06d}"
+
+    def set(self, data: dict):
+        self._store._set(self.collection, self.id, data)
+
+    def update(self, data: dict):
+        self._store._update(self.collection, self.id, data)
+
+    def get(self) -> Optional[dict]:
+        return self._store.get(self.collection, self.id)
+
+
+class FakeCollection:
+    def __init__(self, store: "FakeFirestore", name: str):
+        self._store = store
+        self.name = name
+
+    def document(self, doc_id: Optional[str] = None) -> FakeDocumentReference:
+        return FakeDocumentReference(self._store, self.name, doc_id)
+
+    def add(self, data: dict):
+        """Same return shape as firestore: (update_time, DocumentReference)"""
+        ref = self.document()
+        ref.set(data)
+        return time.time(), ref
+
+
+class FakeWriteBatch:
+    def __init__(self, store: "FakeFirestore"):
+        self._store = store
+        self._ops = []
+
+    def set(self, ref: FakeDocumentReference, data: dict):
+        self._ops.append(("set", ref, copy.deepcopy(data)))
+
+    def update(self, ref: FakeDocumentReference, data: dict):
+        self._ops.append(("update", ref, copy.deepcopy(data)))
+
+    def commit(self):
+        self._store._commit(self._ops)
+        self._ops = []
+
+
+class FakeFirestore:
+    """Thread-safe in-memory Firestore client (collections of dict documents)"""
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: Seconds to sleep per write round trip, to mimic the network
+        """
+        self.latency = latency
+        self.docs: Dict[str, Dict[str, dict]] = {}
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def get(self, collection: str, doc_id: str) -> Optional[dict]:
+        with self._lock:
+            doc = self.docs.get(collection, {}).get(doc_id)
+            return copy.deepcopy(doc) if doc is not None else None
+
+    def all(self, collection: str) -> Dict[str, dict]:
+        with self._lock:
+            return copy.deepcopy(self.docs.get(collection, {}))
+
+    def _set(self, collection: str, doc_id: str, data: dict):
+        self._commit([("set", FakeDocumentReference(self, collection, doc_id), data)])
+
+    def _update(self, collection: str, doc_id: str, data: dict):
+        self._commit([("update", FakeDocumentReference(self, collection, doc_id), data)])
+
+    def _commit(self, ops):
+        with self._lock:
+            # Validate first so a batch applies all-or-nothing, like Firestore
+            for op, ref, _ in ops:
+                if op == "update" and ref.id not in self.docs.get(ref.collection, {}):
+                    raise KeyError(f"No document to update: {ref.collection}/{ref.id}")
+            for op, ref, data in ops:
+                docs = self.docs.setdefault(ref.collection, {})
+                if op == "set":
+                    docs[ref.id] = copy.deepcopy(data)
+                else:
+                    docs[ref.id].update(copy.deepcopy(data))
+            self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class FakeBlob:
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+
+    def upload_from_string(self, data: bytes, content_type: str = "application/octet-stream"):
+        self.bucket._upload(self.name, bytes(data), content_type)
+
+
+class FakeBucket:
+    """In-memory GCS bucket; objects maps blob name -> (data, content_type)"""
+
+    def __init__(self, name: str, latency: float = 0.0, fail_uploads: int = 0):
+        """
+        Args:
+            latency: Seconds to sleep per upload, to mimic the network
+            fail_uploads: Make this many uploads raise before they start succeeding
+        """
+        self.name = name
+        self.latency = latency
+        self.fail_uploads = fail_uploads
+        self.objects: Dict[str, tuple] = {}
+        self.uploads = 0
+        self._lock = threading.Lock()
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+    def _upload(self, name: str, data: bytes, content_type: str):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            if self.fail_uploads > 0:
+                self.fail_uploads -= 1
+                raise ConnectionError(f"Simulated upload failure for {name}")
+            self.objects[name] = (data, content_type)
+            self.uploads += 1
+
+
+class FakeStorage:
+    """Stand-in for google.cloud.storage.Client"""
+
+    def __init__(self, latency: float = 0.0, fail_uploads: int = 0):
+        self.latency = latency
+        self.fail_uploads = fail_uploads
+        self.buckets: Dict[str, FakeBucket] = {}
+
+    def bucket(self, name: str) -> FakeBucket:
+        if name not in self.buckets:
+            self.buckets[name] = FakeBucket(name, self.latency, self.fail_uploads)
+        return self.buckets[name]
+
+
+class FakeCamera:
+    """
+    Local HTTP server imitating an ESP32-CAM
+
+    Serves GET /capture (one JPEG per request) and GET /stream (MJPEG,
+    multipart/x-mixed-replace at a fixed frame rate), cycling through the
+    given JPEG frames.
+    """
+
+    BOUNDARY = "123456789000000000000987654321"
+
+    def __init__(self, frames, fps: float = 10.0, host: str = "127.0.0.1", port: int = 0,
+                 capture_latency: float = 0.0):
+        """
+        Args:
+            frames: JPEG images (bytes) to serve in order, repeated forever
+            fps: Stream frame rate
+            port: TCP port (0 = pick a free one)
+            capture_latency: Seconds each /capture takes before responding (sensor readout)
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        if not frames:
+            raise ValueError("FakeCamera needs at least one frame")
+        self.frames = list(frames)
+        self.fps = fps
+        self.capture_latency = capture_latency
+        self.captures = 0
+        self.frames_streamed = 0
+        self._next = itertools.count()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        camera = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.startswith("/capture"):
+                    camera._serve_capture(self)
+                elif self.path.startswith("/stream"):
+                    camera._serve_stream(self)
+                else:
+                    self.send_error(404)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def capture_url(self) -> str:
+        return f"{self.base_url}/capture"
+
+    @property
+    def stream_url(self) -> str:
+        return f"{self.base_url}/stream"
+
+    def _frame(self) -> bytes:
+        return self.frames[next(self._next) % len(self.frames)]
+
+    def _serve_capture(self, handler):
+        if self.capture_latency:
+            time.sleep(self.capture_latency)
+        frame = self._frame()
+        handler.send_response(200)
+        handler.send_header("Content-Type", "image/jpeg")
+        handler.send_header("Content-Length", str(len(frame)))
+        handler.end_headers()
+        handler.wfile.write(frame)
+        with self._lock:
+            self.captures += 1
+
+    def _serve_stream(self, handler):
+        handler.send_response(200)
+        handler.send_header("Content-Type", f"multipart/x-mixed-replace;boundary={self.BOUNDARY}")
+        handler.end_headers()
+        try:
+            while not self._stopped.is_set():
+                frame = self._frame()
+                handler.wfile.write(
+                    f"\r\n--{self.BOUNDARY}\r\n"
+                    f"Content-Type: image/jpeg\r\nContent-Length: {len(frame)}\r\n\r\n".encode()
+                )
+                handler.wfile.write(frame)
+                handler.wfile.flush()
+                with self._lock:
+                    self.frames_streamed += 1
+                time.sleep(1.0 / self.fps)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def start(self) -> "FakeCamera":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-camera", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,285 @@
+"""
+Streaming MJPEG capture for ESP32-CAM
+
+Polling /capture opens a request per frame and waits for a full single-shot
+capture each time. ESP32-CAM firmwares also serve a multipart/x-mixed-replace
+stream (CameraWebServer: http://<ip>:81/stream). MJPEGStream keeps one
+connection open on a background thread, splits the multipart body into JPEG
+frames as bytes arrive, and keeps only the newest frame: a reader always
+gets the latest image and frames it never picked up are counted as dropped.
+"""
+
+import logging
+import threading
+import time
+from typing import List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+from structured_log import get_logger, log_event
+
+log = get_logger("stream")
+
+DEFAULT_BOUNDARY = b"123456789000000000000987654321"  # ESP32 CameraWebServer
+STREAM_PORT = 81
+
+
+def stream_url_for(capture_url: str, port: int = STREAM_PORT) -> str:
+    """Derive the stream URL of an ESP32-CAM from its /capture URL"""
+    parts = urlsplit(capture_url)
+    host = parts.hostname or ""
+    return urlunsplit((parts.scheme or "http", f"{host}:{port}", "/stream", "", ""))
+
+
+def _boundary_from_content_type(content_type: str) -> bytes:
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.strip().partition("=")
+        if name.lower() == "boundary" and value:
+            value = value.strip('"')
+            # Some servers repeat the leading dashes in the header
+            return (value[2:] if value.startswith("--") else value).encode()
+    return DEFAULT_BOUNDARY
+
+
+class MultipartJPEGParser:
+    """
+    Incremental multipart/x-mixed-replace parser
+
+    Bytes are appended to one growing buffer and scanned from where the last
+    scan stopped, so each byte is searched once. Consumed bytes are released
+    only once they make up half the buffer, which keeps compaction amortized.
+    """
+
+    def __init__(self, boundary: bytes = DEFAULT_BOUNDARY, max_frame_bytes: int = 4 * 1024 * 1024):
+        self.delimiter = b"--" + boundary
+        self.max_frame_bytes = max_frame_bytes
+        self._buf = bytearray()
+        self._pos = 0                     # Start of unparsed data
+        self._scan = 0                    # Where the next search may start
+        self._body_start: Optional[int] = None
+        self._length: Optional[int] = None
+        self.discarded = 0                # Oversized or malformed parts skipped
+
+    def feed(self, data) -> List[bytes]:
+        """Add received bytes and return the JPEG frames they completed"""
+        self._buf += data
+        frames = []
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                break
+            frames.append(frame)
+        if self._pos and self._pos * 2 >= len(self._buf):
+            del self._buf[:self._pos]
+            self._scan -= self._pos
+            if self._body_start is not None:
+                self._body_start -= self._pos
+            self._pos = 0
+        return frames
+
+    def _next_frame(self) -> Optional[bytes]:
+        while True:
+            frame = self._next_part()
+            if frame is None or frame.startswith(b"\xff\xd8"):
+                return frame
+            # Not a JPEG (e.g. a JSON status part); skip it
+            self.discarded += 1
+
+    def _next_part(self) -> Optional[bytes]:
+        buf = self._buf
+        if self._body_start is None:
+            # Part headers: from the delimiter line to the blank line
+            start = buf.find(self.delimiter, max(self._pos, self._scan))
+            if start < 0:
+                self._scan = max(self._pos, len(buf) - len(self.delimiter))
+                return None
+            end = buf.find(b"\r\n\r\n", start)
+            if end < 0:
+                self._pos = start
+                self._scan = start
+                return None
+            self._length = None
+            for line in bytes(buf[start:end]).split(b"\r\n")[1:]:
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    try:
+                        self._length = int(value.strip())
+                    except ValueError:
+                        pass
+            self._body_start = self._scan = end + 4
+
+        body_start = self._body_start
+        if self._length is not None:
+            body_end = body_start + self._length
+            if len(buf) < body_end:
+                return None
+        else:
+            # No Content-Length: the body runs to the next delimiter
+            body_end = buf.find(self.delimiter, self._scan)
+            if body_end < 0:
+                if len(buf) - body_start > self.max_frame_bytes:
+                    self.discarded += 1
+                    self._reset(len(buf))
+                else:
+                    self._scan = max(body_start, len(buf) - len(self.delimiter))
+                return None
+            while body_end > body_start and buf[body_end - 1] in b"\r\n":
+                body_end -= 1
+
+        with memoryview(buf) as view:
+            frame = bytes(view[body_start:body_end])
+        self._reset(body_end)
+        return frame
+
+    def _reset(self, position: int):
+        self._pos = self._scan = position
+        self._body_start = None
+        self._length = None
+
+
+class MJPEGStream:
+    def __init__(
+        self,
+        url: str,
+        session: Optional[requests.Session] = None,
+        timeout: float = 10.0,
+        reconnect_delay: float = 1.0,
+        max_age: float = 2.0,
+        chunk_size: int = 32 * 1024
+    ):
+        """
+        Initialize the stream reader
+
+        Args:
+            url: MJPEG stream URL (e.g. "http://192.168.1.100:81/stream")
+            session: HTTP session to open the stream with
+            timeout: Connect/read timeout in seconds
+            reconnect_delay: Wait before reconnecting after the stream drops
+            max_age: Frames older than this many seconds are never handed out
+            chunk_size: Bytes read from the socket per call
+        """
+        self.url = url
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_age = max_age
+        self.chunk_size = chunk_size
+
+        self._cond = threading.Condition()
+        self._latest: Optional[bytes] = None
+        self._latest_at = 0.0
+        self._latest_seq = 0
+        self._read_seq = 0
+        self._response = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.connected = False
+        self._report_errors = True
+        self.frames_received = 0
+        self.frames_read = 0
+        self.bytes_received = 0
+        self.connects = 0
+        self.errors = 0
+
+    def start(self) -> "MJPEGStream":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"mjpeg-{self.url}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            # Unblocks the reader thread's pending socket read
+            response.close()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout)
+            self._thread = None
+        with self._cond:
+            self._cond.notify_all()
+
+    def read(self, timeout: float = 5.0) -> Optional[bytes]:
+        """
+        Return the newest frame not handed out before, waiting up to timeout
+
+        Returns:
+            JPEG bytes, or None if no fresh frame arrived in time
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                fresh = (
+                    self._latest_seq > self._read_seq
+                    and time.monotonic() - self._latest_at <= self.max_age
+                )
+                if fresh:
+                    self._read_seq = self._latest_seq
+                    self.frames_read += 1
+                    return self._latest
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop.is_set():
+                    return None
+                self._cond.wait(remaining)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._read_stream()
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                self.errors += 1
+                if self._report_errors:
+                    # Report once per outage, not on every reconnect attempt
+                    log_event(log, "stream_failed", f"✗ MJPEG stream {self.url} failed: {e}",
+                              level=logging.WARNING, url=self.url, error=str(e))
+                    self._report_errors = False
+            finally:
+                self.connected = False
+                self._response = None
+            self._stop.wait(self.reconnect_delay)
+
+    def _read_stream(self):
+        response = self.session.get(self.url, stream=True, timeout=self.timeout)
+        self._response = response
+        with response:
+            response.raise_for_status()
+            parser = MultipartJPEGParser(_boundary_from_content_type(response.headers.get("Content-Type", "")))
+            self.connects += 1
+            self.connected = True
+            self._report_errors = True
+            log_event(log, "stream_connected", f"✓ MJPEG stream connected: {self.url}", url=self.url)
+
+            # read1 returns whatever has arrived instead of waiting for a full chunk
+            raw = response.raw
+            read = getattr(raw, "read1", raw.read)
+            while not self._stop.is_set():
+                data = read(self.chunk_size)
+                if not data:
+                    raise ConnectionError("stream closed by camera")
+                self.bytes_received += len(data)
+                frames = parser.feed(data)
+                if frames:
+                    with self._cond:
+                        # Only the newest frame matters; older ones are dropped
+                        self._latest = frames[-1]
+                        self._latest_at = time.monotonic()
+                        self._latest_seq += 1
+                        self.frames_received += len(frames)
+                        self._cond.notify_all()
+
+    def metrics(self) -> dict:
+        with self._cond:
+            return {
+                "connected": self.connected,
+                "connects": self.connects,
+                "frames_received": self.frames_received,
+                "frames_read": self.frames_read,
+                "frames_dropped": self.frames_received - self.frames_read,
+                "mb_received": round(self.bytes_received / 1e6, 2),
+                "errors": self.errors,
+            }
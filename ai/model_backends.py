@@ -0,0 +1,198 @@
+"""
+Inference backend selection for YOLO fire detection models
+
+PyTorch is the slowest way to run YOLO on a CPU-only edge box. This module
+exports a .pt model once to ONNX Runtime, OpenVINO or TorchScript at a fixed
+input resolution, caches the exported artifact next to the source weights
+(<stem>_<imgsz>.onnx, <stem>_<imgsz>_openvino_model/, ...), and loads the
+cached artifact on later startups.
+
+It also pins the inference thread pools (configure_threads) and runs
+dummy frames through a freshly loaded model (warmup_model), so the first
+camera frames don't pay for lazy kernel initialization and allocator growth.
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import contextlib
+import importlib.util
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Backend name -> ultralytics export format (None = run the .pt model directly)
+BACKENDS = {
+    "torch": None,
+    "onnx": "onnx",
+    "openvino": "openvino",
+    "torchscript": "torchscript",
+}
+
+DEFAULT_IMGSZ = 640
+
+# Read by OpenMP/MKL/OpenBLAS when they initialize, i.e. at the first import of torch
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+@contextlib.contextmanager
+def ultralytics_output_to_stderr():
+    """
+    Keep ultralytics' progress output (weight download, export) off stdout
+
+    The wrapper's stdout carries only JSON results, but ultralytics logs to
+    a stdout handler created at import time, so plain redirection during the
+    call is not enough: the handler is pointed at stderr as well.
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        import ultralytics  # noqa: F401  (creates the "ultralytics" logger on first import)
+
+        for handler in logging.getLogger("ultralytics").handlers:
+            if isinstance(handler, logging.StreamHandler) and handler.stream is sys.__stdout__:
+                handler.setStream(sys.stderr)
+        yield
+
+
+def exported_path(model_path: str, backend: str, imgsz: int, export_dir: Optional[str] = None) -> Path:
+    """Where the exported artifact for this model/backend/resolution is cached"""
+    source = Path(model_path)
+    directory = Path(export_dir) if export_dir else source.resolve().parent
+    stem = f"{source.stem}_{imgsz}"
+    if backend == "onnx":
+        return directory / f"{stem}.onnx"
+    if backend == "openvino":
+        # ultralytics recognises OpenVINO models by the _openvino_model suffix
+        return directory / f"{stem}_openvino_model"
+    if backend == "torchscript":
+        return directory / f"{stem}.torchscript"
+    raise ValueError(f"Backend '{backend}' has no export artifact")
+
+
+def export_model(model_path: str, backend: str, imgsz: int = DEFAULT_IMGSZ,
+                 export_dir: Optional[str] = None) -> str:
+    """
+    Export a .pt model for a backend, reusing a cached export when it is current
+
+    Returns:
+        Path of the exported artifact
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+
+    def cached(source: Path) -> Optional[str]:
+        target = exported_path(str(source), backend, imgsz, export_dir)
+        if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+            return str(target)
+        return None
+
+    # Check the cache before paying for a PyTorch model load
+    source = Path(model_path)
+    artifact = cached(source) if source.exists() else None
+    if artifact:
+        return artifact
+
+    with ultralytics_output_to_stderr():
+        from ultralytics import YOLO
+
+        model = YOLO(model_path)
+    # Default weights like yolov8n.pt are downloaded on first use
+    source = Path(model.ckpt_path or model_path)
+    artifact = cached(source)
+    if artifact:
+        return artifact
+    target = exported_path(str(source), backend, imgsz, export_dir)
+
+    # stderr: the wrapper's stdout carries only the JSON result
+    print(f"⏳ Exporting {source.name} to {backend} (imgsz={imgsz})...", file=sys.stderr)
+    with ultralytics_output_to_stderr():
+        output = Path(model.export(format=BACKENDS[backend], imgsz=imgsz))
+    if output.resolve() != target.resolve():
+        if target.is_dir():
+            shutil.rmtree(target)
+        elif target.exists():
+            target.unlink()
+        shutil.move(str(output), str(target))
+    print(f"✓ Exported model cached at {target}", file=sys.stderr)
+    return str(target)
+
+
+def load_model(model_path: str, backend: str = "torch", imgsz: int = DEFAULT_IMGSZ,
+               export_dir: Optional[str] = None):
+    """
+    Load a YOLO model on the requested backend
+
+    The "torch" backend loads model_path as-is; other backends export it once
+    (see export_model) and load the cached artifact.
+    """
+    with ultralytics_output_to_stderr():
+        from ultralytics import YOLO
+
+        if backend == "torch":
+            return YOLO(model_path)
+    artifact = export_model(model_path, backend, imgsz, export_dir)
+    with ultralytics_output_to_stderr():
+        return YOLO(artifact, task="detect")
+
+
+def configure_threads(intra_op: Optional[int] = None, inter_op: Optional[int] = None) -> dict:
+    """
+    Pin the inference thread pools instead of taking one thread per core
+
+    Call before the model is loaded: the OpenMP/MKL variables only count
+    before torch is imported, and torch accepts an inter-op count only
+    before its first parallel operation. The torch and torchscript backends
+    are pinned directly; exported ONNX/OpenVINO models get the environment
+    variables only.
+
+    Args:
+        intra_op: Threads inside one operator (None or 0 = library default)
+        inter_op: Threads running independent operators (None or 0 = library default)
+
+    Returns:
+        {"intra_op": n, "inter_op": n} as in effect (None where torch is not installed)
+    """
+    if intra_op:
+        for var in THREAD_ENV_VARS:
+            os.environ[var] = str(intra_op)
+    if not (intra_op or inter_op) or importlib.util.find_spec("torch") is None:
+        return {"intra_op": intra_op or None, "inter_op": inter_op or None}
+
+    import torch
+
+    if intra_op:
+        torch.set_num_threads(intra_op)
+    if inter_op and torch.get_num_interop_threads() != inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError as e:
+            # Fixed once torch has run parallel work; keep the running pool
+            print(f"⚠ Inter-op threads already started, keeping {torch.get_num_interop_threads()}: {e}",
+                  file=sys.stderr)
+    return {"intra_op": torch.get_num_threads(), "inter_op": torch.get_num_interop_threads()}
+
+
+def warmup_model(model, imgsz: int, frame_shape: Tuple[int, int], runs: int = 3, batch: int = 1) -> List[float]:
+    """
+    Run dummy frames through a loaded model before real frames arrive
+
+    Args:
+        model: Loaded YOLO model
+        imgsz: Input resolution the model will be called with
+        frame_shape: (height, width) of the decoded frames it will see, so the
+            letterboxed input tensor matches the real one
+        runs: Dummy inference calls
+        batch: Frames per call
+
+    Returns:
+        Seconds per run, in order (the first one shows the cold-start cost)
+    """
+    import numpy as np
+
+    frames = [np.random.default_rng(i).integers(0, 256, (*frame_shape, 3), dtype=np.uint8) for i in range(batch)]
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model(frames, imgsz=imgsz, verbose=False)
+        timings.append(time.perf_counter() - start)
+    return timings
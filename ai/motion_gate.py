@@ -0,0 +1,126 @@
+"""
+Frame-difference motion gate for the fire detection system
+
+Most household camera frames are identical for hours. MotionGate compares
+each frame with the previous one using a tiny grayscale thumbnail (decoded
+at 1/8 scale in JPEG draft mode) and lets the detector reuse its last
+verdict when nothing has changed. A full inference is still forced every
+max_skip frames, and a frame is never skipped while the last verdict was fire.
+
+The gate is thread-safe: with batching or the inference pool, frames are
+checked on the capture thread while verdicts are recorded on the thread
+that completes the inference.
+"""
+
+import io
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+THUMB_SIZE = (32, 24)
+
+
+def thumbnail(image_bytes: bytes, size: Tuple[int, int] = THUMB_SIZE) -> np.ndarray:
+    """Decode a small grayscale thumbnail as cheaply as possible"""
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        img.draft("L", (size[0] * 2, size[1] * 2))
+        return np.asarray(img.convert("L").resize(size, Image.BILINEAR), dtype=np.int16)
+
+
+class MotionGate:
+    def __init__(self, threshold: float = 4.0, max_skip: int = 30):
+        """
+        Initialize the gate
+
+        Args:
+            threshold: Mean absolute thumbnail difference (0-255 gray levels)
+                below which a frame counts as unchanged
+            max_skip: Force a full inference after this many consecutive skips
+        """
+        self.threshold = threshold
+        self.max_skip = max_skip
+
+        self._lock = threading.Lock()
+        self._previous: Optional[np.ndarray] = None
+        self._consecutive_skips = 0
+        self.last_verdict: Optional[Tuple[bool, float]] = None
+
+        self.frames = 0
+        self.skipped = 0
+        self.inference_time = 0.0   # Seconds spent in real inference
+        self.gate_time = 0.0        # Seconds spent computing thumbnails/diffs
+
+    def reusable_verdict(self, image_bytes: bytes) -> Optional[Tuple[bool, float]]:
+        """
+        Check a frame against the previous one
+
+        Returns:
+            The last verdict when the frame is unchanged and it can be reused,
+            None when the frame needs a full inference
+        """
+        started = time.perf_counter()
+        try:
+            current = thumbnail(image_bytes)
+        except Exception:
+            current = None
+
+        with self._lock:
+            self.frames += 1
+            if current is None:
+                # Undecodable frame: let the detector deal with it
+                self._previous = None
+                self.gate_time += time.perf_counter() - started
+                return None
+
+            changed = (
+                self._previous is None
+                or current.shape != self._previous.shape
+                or float(np.abs(current - self._previous).mean()) >= self.threshold
+            )
+            self._previous = current
+
+            verdict = self.last_verdict
+            reuse = (
+                not changed
+                and verdict is not None
+                and not verdict[0]
+                and self._consecutive_skips < self.max_skip
+            )
+            if reuse:
+                self._consecutive_skips += 1
+                self.skipped += 1
+            else:
+                self._consecutive_skips = 0
+            self.gate_time += time.perf_counter() - started
+            return verdict if reuse else None
+
+    def should_infer(self, image_bytes: bytes) -> bool:
+        """Return False when the frame is unchanged and the last verdict can be reused"""
+        return self.reusable_verdict(image_bytes) is None
+
+    def record(self, verdict: Tuple[bool, float], inference_time: float):
+        """Store the verdict of a full inference and how long it took"""
+        with self._lock:
+            self.last_verdict = verdict
+            self.inference_time += inference_time
+
+    def metrics(self) -> dict:
+        """Skip ratio and estimated inference time saved (net of gate overhead)"""
+        with self._lock:
+            return self._metrics()
+
+    def _metrics(self) -> dict:
+        inferred = self.frames - self.skipped
+        avg_inference = self.inference_time / inferred if inferred else 0.0
+        saved = self.skipped * avg_inference - self.gate_time
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "skip_ratio": round(self.skipped / self.frames, 3) if self.frames else 0.0,
+            "avg_inference_ms": round(avg_inference * 1000, 1),
+            "gate_ms_per_frame": round(self.gate_time / self.frames * 1000, 2) if self.frames else 0.0,
+            "cpu_saved_s": round(saved, 2),
+        }
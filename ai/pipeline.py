@@ -0,0 +1,150 @@
+"""
+Staged processing pipeline for the fire detection system
+
+Each stage runs on its own worker thread(s) and reads from a bounded queue,
+so a slow stage (GCS upload, Firestore write) never blocks capture or
+inference directly. When a queue is full the stage either applies
+backpressure (the producer waits) or drops its oldest item, which is the
+right choice for camera frames where only the newest one matters.
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from structured_log import get_logger, log_event
+
+log = get_logger("pipeline")
+
+_STOP = object()
+
+
+class Stage:
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Any], Any],
+        maxsize: int = 8,
+        workers: int = 1,
+        drop_oldest: bool = False
+    ):
+        """
+        Initialize a pipeline stage
+
+        Args:
+            name: Stage name used in metrics
+            fn: Processes one item; a non-None return value is passed to the next stage
+            maxsize: Queue capacity
+            workers: Worker threads for this stage
+            drop_oldest: When full, drop the oldest queued item instead of blocking the producer
+        """
+        self.name = name
+        self.fn = fn
+        self.maxsize = maxsize
+        self.workers = workers
+        self.drop_oldest = drop_oldest
+        self.next: Optional["Stage"] = None
+
+        self.queue = queue.Queue(maxsize=maxsize)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+
+    def put(self, item: Any):
+        """Queue an item, blocking or dropping the oldest item when full"""
+        if not self.drop_oldest:
+            self.queue.put(item)
+        else:
+            while True:
+                try:
+                    self.queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.queue.task_done()
+                        with self._lock:
+                            self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            with self._lock:
+                self.max_depth = max(self.max_depth, depth)
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                result = self.fn(item)
+                with self._lock:
+                    self.processed += 1
+                if result is not None and self.next is not None:
+                    self.next.put(result)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                log_event(log, "stage_failed", f"✗ Error in {self.name} stage: {e}",
+                          level=logging.ERROR, stage=self.name, error=str(e))
+            finally:
+                self.queue.task_done()
+
+    def start(self):
+        """Start the stage's worker threads"""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Process everything already queued, then stop the workers"""
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "depth": self.queue.qsize(),
+                "capacity": self.maxsize,
+                "max_depth": self.max_depth,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+
+
+class Pipeline:
+    def __init__(self, stages: List[Stage]):
+        """Chain stages so each stage's output feeds the next one"""
+        self.stages = stages
+        self._by_name: Dict[str, Stage] = {stage.name: stage for stage in stages}
+        for stage, following in zip(stages, stages[1:]):
+            stage.next = following
+
+    def start(self) -> "Pipeline":
+        for stage in self.stages:
+            stage.start()
+        return self
+
+    def stop(self):
+        """Drain and stop stages in order, so queued work reaches the end"""
+        for stage in self.stages:
+            stage.stop()
+
+    def put(self, stage_name: str, item: Any):
+        """Feed an item into the named stage"""
+        self._by_name[stage_name].put(item)
+
+    def metrics(self) -> dict:
+        """Queue depth and counters per stage"""
+        return {stage.name: stage.metrics() for stage in self.stages}
@@ -0,0 +1,143 @@
+"""
+Content-addressed detection result cache
+
+Results are keyed by a BLAKE2 hash of the image bytes plus everything that
+changes the answer (model path and mtime, confidence threshold, detection
+mode). An in-memory LRU with TTL serves repeat frames inside one process
+(serve mode); an optional on-disk layer lets results survive across one-shot
+CLI invocations, e.g. when the Node scripts re-submit the same capture file.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+
+def make_key(image_bytes: bytes, model_path: Optional[str], conf: float, mode: str = "") -> str:
+    """Hash the image content together with the settings that affect the result"""
+    model_stamp = ""
+    if model_path and os.path.exists(model_path):
+        model_stamp = f"{os.path.abspath(model_path)}:{os.path.getmtime(model_path)}"
+    elif model_path:
+        model_stamp = model_path
+
+    digest = hashlib.blake2b(image_bytes, digest_size=16)
+    digest.update(f"|{model_stamp}|{conf}|{mode}".encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 300.0,
+        disk_dir: Optional[str] = None,
+        max_disk_entries: int = 4096
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: In-memory LRU capacity
+            ttl: Seconds a result stays valid (memory and disk)
+            disk_dir: Directory for the persistent layer (None = memory only)
+            max_disk_entries: Oldest files are pruned beyond this many
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a cached result, or None if missing or expired"""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, result = entry
+            if now - stored_at <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(result)
+            del self._entries[key]
+
+        result = self._disk_get(key, now)
+        if result is not None:
+            self.disk_hits += 1
+            return dict(result)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: dict):
+        """Store a result in memory and, if enabled, on disk"""
+        now = time.time()
+        self._remember(key, result, now)
+        if self.disk_dir:
+            self._disk_put(key, result, now)
+
+    def _remember(self, key: str, result: dict, stored_at: float):
+        self._entries[key] = (stored_at, dict(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.json"
+
+    def _disk_get(self, key: str, now: float) -> Optional[dict]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if now - entry["stored_at"] > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            self._remember(key, entry["result"], entry["stored_at"])
+            return entry["result"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _disk_put(self, key: str, result: dict, now: float):
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": now, "result": result}, f)
+            # Atomic rename so concurrent invocations never read a partial file
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def _prune_disk(self):
+        """Drop the oldest files once the disk layer exceeds its size bound"""
+        files = list(self.disk_dir.glob("*.json"))
+        excess = len(files) - self.max_disk_entries
+        if excess <= 0:
+            return
+        files.sort(key=lambda p: p.stat().st_mtime)
+        for path in files[:excess]:
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,190 @@
+"""
+Region-of-interest tiling for high-resolution frames
+
+Running a whole 1600x1200 (or larger) capture at the model's input size
+shrinks it 2.5x or more, so a distant flame a dozen pixels wide is mostly
+gone before the model sees it. Tiled inference keeps native resolution
+where it matters and skips the rest:
+
+1. The fire-color mask (fire_mask) is evaluated on the frame subsampled by
+   `reduce`, and grid cells with enough fire-colored pixels are grouped into
+   candidate regions.
+2. Each region becomes a native-resolution crop of at least tile x tile
+   pixels (tile = the model input size), so the model sees the flame
+   without downscaling. Overlapping crops are merged.
+3. All crops go through the model in one batched call, the boxes are
+   shifted back into frame coordinates, and duplicates from overlapping
+   crops are removed.
+
+Frames without fire-colored pixels never reach the model.
+"""
+
+from collections import deque
+from typing import List, Tuple
+
+import numpy as np
+
+from fire_mask import fire_mask
+from image_decode import rgb_to_bgr
+
+# (x1, y1, x2, y2) in frame pixels
+Region = Tuple[int, int, int, int]
+# (x1, y1, x2, y2, confidence, class_id) in frame pixels
+Detection = Tuple[float, float, float, float, float, int]
+
+
+def propose_regions(frame: np.ndarray, reduce: int = 8, cell: int = 4,
+                    min_pixels: int = 2, max_regions: int = 4) -> List[Region]:
+    """
+    Find fire-colored regions on a subsampled copy of the frame
+
+    Args:
+        frame: HxWx3 uint8 RGB array at native resolution
+        reduce: Subsampling step for the color mask
+        cell: Grid cell size in subsampled pixels
+        min_pixels: Fire-colored pixels a cell needs to count as a candidate
+        max_regions: Keep only this many regions (largest fire area first)
+
+    Returns:
+        List of regions in native frame coordinates
+    """
+    if frame.ndim != 3:
+        return []
+    height, width = frame.shape[:2]
+    mask = fire_mask(frame[::reduce, ::reduce])
+    rows, cols = mask.shape
+    grid_rows, grid_cols = -(-rows // cell), -(-cols // cell)
+
+    # Fire pixels per cell (the mask is zero-padded to whole cells)
+    padded = np.zeros((grid_rows * cell, grid_cols * cell), dtype=np.uint16)
+    padded[:rows, :cols] = mask
+    counts = padded.reshape(grid_rows, cell, grid_cols, cell).sum(axis=(1, 3))
+    hot = counts >= min_pixels
+    if not hot.any():
+        return []
+
+    # Group hot cells into 8-connected components
+    seen = np.zeros_like(hot)
+    components = []
+    for start in zip(*np.nonzero(hot)):
+        if seen[start]:
+            continue
+        seen[start] = True
+        queue = deque([start])
+        top, left, bottom, right = start[0], start[1], start[0], start[1]
+        area = 0
+        while queue:
+            r, c = queue.popleft()
+            area += int(counts[r, c])
+            top, bottom = min(top, r), max(bottom, r)
+            left, right = min(left, c), max(right, c)
+            for nr in range(max(r - 1, 0), min(r + 2, grid_rows)):
+                for nc in range(max(c - 1, 0), min(c + 2, grid_cols)):
+                    if hot[nr, nc] and not seen[nr, nc]:
+                        seen[nr, nc] = True
+                        queue.append((nr, nc))
+        components.append((area, int(top), int(left), int(bottom), int(right)))
+
+    components.sort(reverse=True)
+    scale = cell * reduce
+    return [
+        (left * scale, top * scale, min((right + 1) * scale, width), min((bottom + 1) * scale, height))
+        for _, top, left, bottom, right in components[:max_regions]
+    ]
+
+
+def _overlaps(a: Region, b: Region) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def crop_boxes(regions: List[Region], frame_shape, tile: int = 640, pad: float = 0.25) -> List[Region]:
+    """
+    Native-resolution crops covering the regions
+
+    Each region is padded by `pad` of its size for context and grown to at
+    least tile x tile pixels (clamped to the frame). Overlapping crops are
+    merged into their bounding box.
+    """
+    height, width = frame_shape[:2]
+
+    def grow(low: int, high: int, size: int, limit: int) -> Tuple[int, int]:
+        size = min(max(size, high - low), limit)
+        center = (low + high) // 2
+        low = min(max(center - size // 2, 0), limit - size)
+        return low, low + size
+
+    crops = []
+    for x1, y1, x2, y2 in regions:
+        pad_x, pad_y = int((x2 - x1) * pad), int((y2 - y1) * pad)
+        x1, x2 = grow(x1 - pad_x, x2 + pad_x, tile, width)
+        y1, y2 = grow(y1 - pad_y, y2 + pad_y, tile, height)
+        crops.append((x1, y1, x2, y2))
+
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(crops)):
+            for j in range(i + 1, len(crops)):
+                if _overlaps(crops[i], crops[j]):
+                    a, b = crops[i], crops.pop(j)
+                    crops[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    merged = True
+                    break
+            if merged:
+                break
+    return crops
+
+
+def merge_detections(detections: List[Detection], iou_threshold: float = 0.5) -> List[Detection]:
+    """Greedy per-class non-maximum suppression across crops"""
+    kept: List[Detection] = []
+    for det in sorted(detections, key=lambda d: d[4], reverse=True):
+        duplicate = False
+        for other in kept:
+            if other[5] != det[5]:
+                continue
+            ix = max(0.0, min(det[2], other[2]) - max(det[0], other[0]))
+            iy = max(0.0, min(det[3], other[3]) - max(det[1], other[1]))
+            inter = ix * iy
+            union = ((det[2] - det[0]) * (det[3] - det[1])
+                     + (other[2] - other[0]) * (other[3] - other[1]) - inter)
+            if union > 0 and inter / union > iou_threshold:
+                duplicate = True
+                break
+        if not duplicate:
+            kept.append(det)
+    return kept
+
+
+def detect_tiled(model, frame: np.ndarray, imgsz: int = 640, reduce: int = 8,
+                 max_regions: int = 4, pad: float = 0.25, **model_kwargs) -> Tuple[List[Detection], List[Region]]:
+    """
+    Run the model on native-resolution crops around fire-colored regions
+
+    Args:
+        model: Loaded YOLO model (called as model(list_of_bgr_arrays, imgsz=...))
+        frame: HxWx3 uint8 RGB array at native resolution
+        imgsz: Model input resolution; also the minimum crop size
+        reduce: Subsampling step for the region proposal mask
+        max_regions: Maximum crops per frame
+        pad: Context added around each region, as a fraction of its size
+        model_kwargs: Passed through to the model call (e.g. conf, verbose)
+
+    Returns:
+        (detections in frame coordinates, crops that were run)
+    """
+    crops = crop_boxes(propose_regions(frame, reduce, max_regions=max_regions), frame.shape, imgsz, pad)
+    if not crops:
+        return [], []
+
+    results = model([rgb_to_bgr(frame[y1:y2, x1:x2]) for x1, y1, x2, y2 in crops],
+                    imgsz=imgsz, **model_kwargs)
+
+    detections = []
+    for (x1, y1, _, _), result in zip(crops, results):
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            continue
+        for (bx1, by1, bx2, by2), conf, cls in zip(boxes.xyxy.tolist(), boxes.conf.tolist(), boxes.cls.tolist()):
+            detections.append((bx1 + x1, by1 + y1, bx2 + x1, by2 + y1, float(conf), int(cls)))
+    return merge_detections(detections), crops
@@ -0,0 +1,260 @@
+"""
+Sensor-driven capture cadence for the fire detection system
+
+The gateway (scripts/ingestFromEsp32.js) appends one JSON record per sensor
+reading to data/local-buffer.ndjson. SensorSchedule tails that file
+incrementally and sets each camera's capture interval from its node's
+latest readings, so CPU goes where the risk is:
+
+- NORMAL readings: capture every `normal_interval` seconds (rarely)
+- WARNING/DANGER, or flame with low ambient light (flame && ldr < 200, see
+  RISK_LOGIC.md): capture every `alert_interval` seconds, with an immediate
+  capture on escalation, and stay fast for `hold` seconds after the last
+  elevated reading
+- no recent readings from the node (gateway down): fall back to the fixed
+  `fallback_interval`, as if sensor scheduling were off
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from structured_log import get_logger, log_event
+
+log = get_logger("sensors")
+
+ELEVATED_LEVELS = ("WARNING", "DANGER")
+LDR_MAX = 4095  # ESP32 ADC range
+
+# Called as on_escalate(camera_url, node_id, reason); camera_url None = every camera
+EscalateCallback = Callable[[Optional[str], str, str], None]
+
+
+def ldr_from_light(light: float) -> float:
+    """Raw LDR ADC value from the normalized light field (reverse of ingestFromEsp32.js)"""
+    return (1 - light) * LDR_MAX
+
+
+def risk_reason(record: dict, ldr_threshold: float = 200) -> Optional[str]:
+    """
+    Why a sensor record calls for fast sampling
+
+    Returns:
+        "warning", "danger", "flame_low_light", or None for a NORMAL reading
+    """
+    level = record.get("risk_level", "NORMAL")
+    if level in ELEVATED_LEVELS:
+        return level.lower()
+    light = record.get("light")
+    if record.get("flame") and light is not None and ldr_from_light(float(light)) < ldr_threshold:
+        return "flame_low_light"
+    return None
+
+
+class NDJSONTailer:
+    """Reads records appended to an NDJSON file since the previous poll"""
+
+    def __init__(self, path: str, from_start: bool = False):
+        """
+        Args:
+            path: NDJSON file written by the gateway (need not exist yet)
+            from_start: Replay existing records instead of starting at the end
+        """
+        self.path = path
+        self.offset = 0
+        self.inode = None
+        self.records = 0
+        self.invalid = 0
+        self._partial = b""
+        if not from_start and os.path.exists(path):
+            stat = os.stat(path)
+            self.offset, self.inode = stat.st_size, stat.st_ino
+
+    def poll(self) -> List[dict]:
+        """Complete records appended since the last call (a trailing partial line waits)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            # Rotated or truncated: start over at the beginning of the new file
+            self.inode, self.offset, self._partial = stat.st_ino, 0, b""
+        if stat.st_size == self.offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        self.offset += len(data)
+
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                self.invalid += 1
+        self.records += len(records)
+        return records
+
+
+class _NodeState:
+    def __init__(self):
+        self.last_seen: Optional[float] = None
+        self.elevated_until = 0.0
+        self.reason: Optional[str] = None
+        self.records = 0
+        self.escalations = 0
+
+
+class SensorSchedule:
+    def __init__(
+        self,
+        path: str,
+        node_cameras: Optional[Dict[str, str]] = None,
+        normal_interval: float = 30.0,
+        alert_interval: float = 0.5,
+        fallback_interval: float = 2.0,
+        hold: float = 60.0,
+        stale_after: float = 120.0,
+        ldr_threshold: float = 200,
+        poll_interval: float = 0.5,
+        from_start: bool = False,
+        on_escalate: Optional[EscalateCallback] = None
+    ):
+        """
+        Initialize the schedule
+
+        Args:
+            path: Gateway NDJSON stream (data/local-buffer.ndjson)
+            node_cameras: node_id -> camera URL; empty means every node drives every camera
+            normal_interval: Capture period while a camera's nodes read NORMAL
+            alert_interval: Capture period while any of its nodes is elevated
+            fallback_interval: Capture period when its nodes have gone quiet
+            hold: Seconds to stay fast after the last elevated reading
+            stale_after: Seconds without readings before falling back
+            ldr_threshold: Raw LDR value below which a flame reading counts as real
+            poll_interval: Seconds between checks of the NDJSON file
+            from_start: Replay records already in the file on start
+            on_escalate: Called when a node turns elevated (for an immediate capture)
+        """
+        self.tailer = NDJSONTailer(path, from_start)
+        self.node_cameras = dict(node_cameras or {})
+        self.normal_interval = normal_interval
+        self.alert_interval = alert_interval
+        self.fallback_interval = fallback_interval
+        self.hold = hold
+        self.stale_after = stale_after
+        self.ldr_threshold = ldr_threshold
+        self.poll_interval = poll_interval
+        self.on_escalate = on_escalate
+
+        self.nodes: Dict[str, _NodeState] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _nodes_for(self, camera_url: Optional[str]) -> List[_NodeState]:
+        if not self.node_cameras:
+            return list(self.nodes.values())
+        return [state for node_id, state in self.nodes.items()
+                if self.node_cameras.get(node_id) == camera_url]
+
+    def update(self, record: dict, now: Optional[float] = None) -> Optional[str]:
+        """
+        Feed one sensor record
+
+        Args:
+            now: Arrival time (time.monotonic() by default; replays pass record time)
+
+        Returns:
+            The escalation reason when the node just turned elevated, otherwise None
+        """
+        now = time.monotonic() if now is None else now
+        node_id = str(record.get("node_id", "default"))
+        reason = risk_reason(record, self.ldr_threshold)
+        with self._lock:
+            state = self.nodes.get(node_id)
+            if state is None:
+                state = self.nodes[node_id] = _NodeState()
+            was_elevated = now < state.elevated_until
+            state.last_seen = now
+            state.records += 1
+            if reason is None:
+                return None
+            state.elevated_until = now + self.hold
+            state.reason = reason
+            if was_elevated:
+                return None
+            state.escalations += 1
+
+        camera_url = self.node_cameras.get(node_id)
+        log_event(log, "sensor_escalated",
+                  f"⚠ {node_id}: {reason.replace('_', ' ')} - capturing every {self.alert_interval}s",
+                  level=logging.WARNING, node_id=node_id, reason=reason, camera_url=camera_url)
+        if self.on_escalate:
+            self.on_escalate(camera_url, node_id, reason)
+        return reason
+
+    def interval(self, camera_url: Optional[str] = None, now: Optional[float] = None) -> float:
+        """Current capture period for a camera"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            nodes = self._nodes_for(camera_url)
+            if any(now < state.elevated_until for state in nodes):
+                return self.alert_interval
+            if any(now - state.last_seen < self.stale_after for state in nodes):
+                return self.normal_interval
+            return self.fallback_interval
+
+    def poll(self, now: Optional[float] = None) -> int:
+        """Read new records from the stream; returns how many were applied"""
+        records = self.tailer.poll()
+        for record in records:
+            self.update(record, now)
+        return len(records)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                log_event(log, "sensor_poll_failed", f"✗ Could not read {self.tailer.path}: {e}",
+                          level=logging.ERROR, path=self.tailer.path, error=str(e))
+            self._stop.wait(self.poll_interval)
+
+    def start(self) -> "SensorSchedule":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sensor-schedule", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def metrics(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            nodes = {
+                node_id: {
+                    "records": state.records,
+                    "escalations": state.escalations,
+                    "elevated": now < state.elevated_until,
+                    "last_reason": state.reason,
+                }
+                for node_id, state in self.nodes.items()
+            }
+        return {
+            "records": self.tailer.records,
+            "invalid_lines": self.tailer.invalid,
+            "nodes": nodes,
+        }
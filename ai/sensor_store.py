@@ -0,0 +1,499 @@
+"""
+Columnar, memory-mapped store for the gateway sensor buffer
+
+data/local-buffer.ndjson repeats every key on every line, and answering
+"readings for node X between t1 and t2" means parsing the whole file.
+SensorStore ingests the buffer incrementally into a directory of flat
+column files that are memory-mapped on read:
+
+- each field is two columns: a uint8 type tag per row (missing, null,
+  bool, int, float, string, other JSON) and a float64 value (the number,
+  0/1 for bools, or a code into the string table), so every record can be
+  rebuilt exactly as json.loads returned it
+- strings (node_id, risk_level, ...) are dictionary-encoded in meta.json
+- column files are named after the hex-encoded field name, so any JSON key
+  is a safe file name; keys that can't be encoded are skipped
+- two row indexes are kept sorted as rows arrive: by timestamp, and by
+  (node_id, timestamp)
+- only complete lines are ingested; the byte offset of the last one is
+  saved, so the next ingest reads just what the gateway appended since
+  (a truncated or replaced buffer is re-ingested from the start)
+
+Queries cover readings with a numeric timestamp, over half-open [start, end)
+millisecond ranges, returned in timestamp order (ties in file order).
+Rollups (count/min/max/mean per window) run vectorized over the columns.
+
+CLI:
+    python sensor_store.py ingest ../data/local-buffer.ndjson --store ../data/local-buffer.store
+    python sensor_store.py query --store ../data/local-buffer.store --node gw-1 --start 1765123188208
+    python sensor_store.py rollup --store ../data/local-buffer.store --field temp --window 60000
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from structured_log import get_logger, log_event
+
+log = get_logger("sensors")
+
+# Type tags (0 = field absent, so columns added later read as missing for older rows)
+MISSING, NULL, FALSE, TRUE, INT, FLOAT, STR, JSON = range(8)
+NUMERIC_TAGS = (FALSE, TRUE, INT, FLOAT)
+MAX_EXACT_INT = 2 ** 53  # Larger ints don't survive float64 and are stored as JSON
+
+STORE_VERSION = 2  # 2: column files named by hex-encoded field names
+MAX_FIELD_BYTES = 100  # Longest field name (UTF-8) that still fits a file name once hex-encoded
+TIMESTAMP_FIELD = "timestamp"
+NODE_FIELD = "node_id"
+
+
+def column_name(field: str) -> str:
+    """
+    File name stem for a field's columns
+
+    Raises:
+        ValueError: If the field name is not valid UTF-8 or longer than MAX_FIELD_BYTES
+    """
+    try:
+        encoded = field.encode("utf-8")
+    except UnicodeEncodeError:
+        raise ValueError(f"Field name is not valid UTF-8: {field!r}") from None
+    if len(encoded) > MAX_FIELD_BYTES:
+        raise ValueError(f"Field name longer than {MAX_FIELD_BYTES} bytes: {field[:40]!r}...")
+    return "f-" + encoded.hex()
+
+
+def encode_value(value, strings: Dict[str, int]) -> Tuple[int, float]:
+    """(tag, float64 value) for one JSON value; new strings are added to the table"""
+    if value is None:
+        return NULL, 0.0
+    if isinstance(value, bool):
+        return (TRUE, 1.0) if value else (FALSE, 0.0)
+    if isinstance(value, int):
+        if abs(value) <= MAX_EXACT_INT:
+            return INT, float(value)
+        tag, text = JSON, json.dumps(value)
+    elif isinstance(value, float):
+        return FLOAT, value
+    elif isinstance(value, str):
+        tag, text = STR, value
+    else:
+        tag, text = JSON, json.dumps(value)
+    key = text if tag == STR else "\0json:" + text
+    code = strings.get(key)
+    if code is None:
+        code = strings[key] = len(strings)
+    return tag, float(code)
+
+
+def window_rollup(timestamps: np.ndarray, values: np.ndarray, window_ms: float, origin: float = 0.0) -> dict:
+    """
+    Count/min/max/mean of values per time window
+
+    Args:
+        timestamps: Millisecond timestamps in ascending order
+        values: float64 values aligned with timestamps
+        window_ms: Window length in milliseconds
+        origin: Windows start at origin + k * window_ms
+
+    Returns:
+        Dict of arrays: window_start, count, min, max, mean (one entry per non-empty window)
+    """
+    if not len(values):
+        empty = np.empty(0)
+        return {"window_start": empty, "count": np.empty(0, dtype=np.int64),
+                "min": empty, "max": empty, "mean": empty}
+    windows = np.floor_divide(timestamps - origin, window_ms)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(windows)) + 1))
+    counts = np.diff(np.append(starts, len(values)))
+    return {
+        "window_start": origin + windows[starts] * window_ms,
+        "count": counts,
+        "min": np.minimum.reduceat(values, starts),
+        "max": np.maximum.reduceat(values, starts),
+        "mean": np.add.reduceat(values, starts) / counts,
+    }
+
+
+def _empty_meta() -> dict:
+    return {"version": STORE_VERSION, "source": None, "inode": None, "offset": 0,
+            "rows": 0, "fields": [], "strings": []}
+
+
+def _insert_sorted(index: np.ndarray, keys: np.ndarray, new_rows: np.ndarray, lo: int = 0, hi: Optional[int] = None):
+    """Positions and rows to insert new_rows into index[lo:hi], kept stably sorted by keys"""
+    hi = len(index) if hi is None else hi
+    rows = new_rows[np.argsort(keys[new_rows], kind="stable")]
+    return lo + np.searchsorted(keys[index[lo:hi]], keys[rows], side="right"), rows
+
+
+class SensorStore:
+    def __init__(self, store_dir: str, source: Optional[str] = None):
+        """
+        Open (or create) a store
+
+        Args:
+            store_dir: Directory for the column files and meta.json
+            source: NDJSON buffer to ingest from (remembered in meta.json)
+        """
+        self.dir = Path(store_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.meta = self._load_meta()
+        if source is not None and source != self.meta["source"]:
+            if self.meta["rows"]:
+                self._reset()
+            self.meta["source"] = source
+        self._strings_by_code: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        self._load_strings()
+        self._cache: Dict[str, np.ndarray] = {}
+
+    # Storage
+
+    def _load_meta(self) -> dict:
+        try:
+            with open(self.dir / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") == STORE_VERSION:
+                return meta
+        except FileNotFoundError:
+            return _empty_meta()
+        # Written by another store version: its column files can't be read
+        log_event(log, "store_reset", f"⚠ {self.dir} has an unsupported store version; rebuilding it",
+                  level=logging.WARNING, path=str(self.dir))
+        for path in self.dir.glob("*.bin"):
+            path.unlink()
+        return _empty_meta()
+
+    def _save_meta(self):
+        self.meta["strings"] = self._strings_by_code
+        tmp = self.dir / "meta.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self.dir / "meta.json")
+
+    def _load_strings(self):
+        self._strings_by_code = list(self.meta["strings"])
+        self._string_codes = {s: i for i, s in enumerate(self._strings_by_code)}
+
+    def _reset(self):
+        """Drop every row (the source was replaced)"""
+        self._cache = {}
+        for path in self.dir.glob("*.bin"):
+            path.unlink()
+        self.meta = {**_empty_meta(), "source": self.meta["source"]}
+        self._load_strings()
+
+    def _path(self, name: str) -> Path:
+        return self.dir / f"{name}.bin"
+
+    def _array(self, name: str, dtype, rows: Optional[int] = None) -> np.ndarray:
+        """Memory-mapped column (or index) of `rows` entries (default: every committed row)"""
+        if rows is not None:
+            path = self._path(name)
+            return np.fromfile(path, dtype=dtype, count=rows) if rows else np.empty(0, dtype=dtype)
+        cached = self._cache.get(name)
+        if cached is not None:
+            return cached
+        rows = self.meta["rows"]
+        path = self._path(name)
+        if not rows or not path.exists():
+            array = np.zeros(rows, dtype=dtype)
+        else:
+            array = np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+        self._cache[name] = array
+        return array
+
+    def _append(self, name: str, data: np.ndarray, rows_before: int):
+        """Append to a column file, zero-filling rows from before the field first appeared"""
+        committed = rows_before * data.dtype.itemsize
+        with open(self._path(name), "ab") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size > committed:
+                # Left over from an interrupted ingest
+                f.truncate(committed)
+            elif size < committed:
+                f.write(np.zeros(rows_before - size // data.dtype.itemsize, dtype=data.dtype).tobytes())
+            f.write(np.ascontiguousarray(data).tobytes())
+
+    def _write(self, name: str, data: np.ndarray):
+        tmp = self.dir / f"{name}.bin.tmp"
+        data.astype(np.int64).tofile(tmp)
+        os.replace(tmp, self._path(name))
+
+    # Ingest
+
+    def _read_lines(self) -> List[bytes]:
+        """Complete lines appended to the source since the last ingest"""
+        path = self.meta["source"]
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return []
+        if (self.meta["inode"] is not None and stat.st_ino != self.meta["inode"]) or stat.st_size < self.meta["offset"]:
+            log_event(log, "store_reset", f"⚠ {path} was truncated or replaced; re-ingesting it",
+                      level=logging.WARNING, path=path)
+            self._reset()
+        self.meta["inode"] = stat.st_ino
+        if stat.st_size == self.meta["offset"]:
+            return []
+
+        with open(path, "rb") as f:
+            f.seek(self.meta["offset"])
+            data = f.read(stat.st_size - self.meta["offset"])
+        complete = data.rfind(b"\n") + 1
+        self.meta["offset"] += complete
+        return data[:complete].split(b"\n")[:-1]
+
+    def ingest(self) -> int:
+        """
+        Append readings written to the source NDJSON since the last ingest
+
+        Returns:
+            Number of readings added
+        """
+        if not self.meta["source"]:
+            raise ValueError("SensorStore has no source NDJSON file")
+        records = []
+        invalid = 0
+        for line in self._read_lines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                invalid += 1
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+            else:
+                invalid += 1
+        if invalid:
+            log_event(log, "store_invalid_lines", f"⚠ Skipped {invalid} invalid line(s) in {self.meta['source']}",
+                      level=logging.WARNING, invalid=invalid)
+        if records:
+            self._append_records(records)
+        self._save_meta()
+        return len(records)
+
+    def _append_records(self, records: List[dict]):
+        self._cache = {}  # Release memory maps before the files change
+        rows_before = self.meta["rows"]
+        count = len(records)
+        fields = self.meta["fields"]
+        rejected = set()
+        for record in records:
+            for field in record:
+                if field in fields or field in rejected:
+                    continue
+                try:
+                    column_name(field)
+                except ValueError:
+                    rejected.add(field)
+                    continue
+                fields.append(field)
+        if rejected:
+            log_event(log, "store_invalid_fields", f"⚠ Skipped {len(rejected)} field(s) that can't be stored",
+                      level=logging.WARNING, fields=sorted(repr(f)[:60] for f in rejected))
+
+        for field in fields:
+            tags = np.zeros(count, dtype=np.uint8)
+            values = np.zeros(count, dtype=np.float64)
+            for i, record in enumerate(records):
+                if field in record:
+                    tags[i], values[i] = encode_value(record[field], self._string_codes)
+            name = column_name(field)
+            self._append(f"{name}.tag", tags, rows_before)
+            self._append(f"{name}.val", values, rows_before)
+        self._strings_by_code = sorted(self._string_codes, key=self._string_codes.get)
+
+        # Merge the new rows into both indexes instead of re-sorting everything
+        self.meta["rows"] = rows_before + count
+        self._cache = {}
+        timestamps = self._timestamps()
+        nodes = self._node_codes()
+        new_rows = np.arange(rows_before, rows_before + count)
+
+        by_time = self._array("by_time", np.int64, rows_before)
+        positions, rows = _insert_sorted(by_time, timestamps, new_rows)
+        self._write("by_time", np.insert(by_time, positions, rows))
+
+        by_node = self._array("by_node", np.int64, rows_before)
+        sorted_nodes = nodes[by_node]
+        inserts = []
+        for code in np.unique(nodes[new_rows]):
+            lo, hi = np.searchsorted(sorted_nodes, code, "left"), np.searchsorted(sorted_nodes, code, "right")
+            inserts.append(_insert_sorted(by_node, timestamps, new_rows[nodes[new_rows] == code], lo, hi))
+        positions = np.concatenate([p for p, _ in inserts])
+        rows = np.concatenate([r for _, r in inserts])
+        self._write("by_node", np.insert(by_node, positions, rows))
+        self._cache = {}
+
+    # Queries
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self.meta["fields"])
+
+    def column(self, field: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(type tags, float64 values) for every row of a field, in file order"""
+        name = column_name(field)
+        return self._array(f"{name}.tag", np.uint8), self._array(f"{name}.val", np.float64)
+
+    def _timestamps(self) -> np.ndarray:
+        """Timestamp per row; NaN where it is missing or not a number (sorts last)"""
+        cached = self._cache.get("_timestamps")
+        if cached is None:
+            tags, values = self.column(TIMESTAMP_FIELD)
+            cached = self._cache["_timestamps"] = np.where(np.isin(tags, (INT, FLOAT)), values, np.nan)
+        return cached
+
+    def _node_codes(self) -> np.ndarray:
+        """String code of node_id per row, -1 where it isn't a string"""
+        cached = self._cache.get("_nodes")
+        if cached is None:
+            tags, values = self.column(NODE_FIELD)
+            cached = self._cache["_nodes"] = np.where(tags == STR, values, -1).astype(np.int64)
+        return cached
+
+    def _sorted(self, name: str, key: str) -> np.ndarray:
+        """Index-ordered copy of timestamps or node codes, for binary search"""
+        cache_key = f"_{name}_{key}"
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            source = self._timestamps() if key == "ts" else self._node_codes()
+            cached = self._cache[cache_key] = source[self._array(name, np.int64)]
+        return cached
+
+    def nodes(self) -> List[str]:
+        """node_id values seen so far"""
+        codes = np.unique(self._node_codes())
+        return sorted(self._strings_by_code[code] for code in codes if code >= 0)
+
+    def select(self, start: Optional[float] = None, end: Optional[float] = None,
+               node: Optional[str] = None) -> np.ndarray:
+        """
+        Row numbers of readings in [start, end), in timestamp order
+
+        Args:
+            start: First millisecond included (None = from the beginning)
+            end: First millisecond excluded (None = to the end)
+            node: Only this node_id
+        """
+        if node is None:
+            index, lo, hi = self._array("by_time", np.int64), 0, len(self)
+        else:
+            code = self._string_codes.get(node)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            nodes = self._sorted("by_node", "node")
+            index = self._array("by_node", np.int64)
+            lo, hi = np.searchsorted(nodes, code, "left"), np.searchsorted(nodes, code, "right")
+        timestamps = self._sorted("by_time" if node is None else "by_node", "ts")
+        block = timestamps[lo:hi]
+        first = lo + (np.searchsorted(block, start, "left") if start is not None else 0)
+        last = lo + (np.searchsorted(block, end, "left") if end is not None
+                     else np.searchsorted(block, np.nan, "left"))  # NaN (no timestamp) sorts last
+        return np.asarray(index[first:last])
+
+    def _decode(self, tag: int, value: float):
+        if tag == NULL:
+            return None
+        if tag in (FALSE, TRUE):
+            return tag == TRUE
+        if tag == INT:
+            return int(value)
+        if tag == FLOAT:
+            return float(value)
+        text = self._strings_by_code[int(value)]
+        return text if tag == STR else json.loads(text[len("\0json:"):])
+
+    def records(self, start: Optional[float] = None, end: Optional[float] = None,
+                node: Optional[str] = None) -> List[dict]:
+        """Readings in [start, end) (optionally one node's), rebuilt exactly as parsed from the NDJSON"""
+        rows = self.select(start, end, node)
+        columns = [(field, *(np.asarray(column[rows]) for column in self.column(field))) for field in self.fields]
+        records = [{} for _ in range(len(rows))]
+        for field, tags, values in columns:
+            for record, tag, value in zip(records, tags.tolist(), values.tolist()):
+                if tag != MISSING:
+                    record[field] = self._decode(tag, value)
+        return records
+
+    def values(self, field: str, start: Optional[float] = None, end: Optional[float] = None,
+               node: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Numeric readings of a field in [start, end), in timestamp order
+
+        Bools count as 0/1; nulls, strings and missing values are left out.
+
+        Returns:
+            (timestamps, values) as float64 arrays
+        """
+        rows = self.select(start, end, node)
+        if field not in self.meta["fields"]:
+            return np.empty(0), np.empty(0)
+        tags, values = self.column(field)
+        numeric = np.isin(tags[rows], NUMERIC_TAGS)
+        rows = rows[numeric]
+        return self._timestamps()[rows], np.asarray(values[rows])
+
+    def rollup(self, field: str, window_ms: float, start: Optional[float] = None, end: Optional[float] = None,
+               node: Optional[str] = None) -> dict:
+        """
+        Count/min/max/mean of a numeric field per time window
+
+        Windows are aligned to start (or to the epoch when start is None).
+        """
+        timestamps, values = self.values(field, start, end, node)
+        return window_rollup(timestamps, values, window_ms, origin=start or 0.0)
+
+    def metrics(self) -> dict:
+        size = sum(path.stat().st_size for path in self.dir.iterdir() if path.is_file())
+        return {
+            "rows": len(self),
+            "fields": len(self.meta["fields"]),
+            "nodes": len(self.nodes()),
+            "strings": len(self._strings_by_code),
+            "ingested_bytes": self.meta["offset"],
+            "store_bytes": size,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar store for the gateway sensor buffer")
+    parser.add_argument("command", choices=["ingest", "query", "rollup"])
+    parser.add_argument("source", nargs="?", default=None, help="NDJSON buffer (ingest)")
+    parser.add_argument("--store", required=True, help="Store directory")
+    parser.add_argument("--node", default=None, help="Only this node_id")
+    parser.add_argument("--start", type=float, default=None, help="First millisecond timestamp included")
+    parser.add_argument("--end", type=float, default=None, help="First millisecond timestamp excluded")
+    parser.add_argument("--field", default="temp", help="Numeric field to roll up")
+    parser.add_argument("--window", type=float, default=60000, help="Rollup window in milliseconds")
+    args = parser.parse_args()
+
+    store = SensorStore(args.store, source=args.source)
+    if args.command == "ingest":
+        added = store.ingest()
+        print(json.dumps({"added": added, **store.metrics()}))
+    elif args.command == "query":
+        for record in store.records(args.start, args.end, args.node):
+            sys.stdout.write(json.dumps(record) + "\n")
+    else:
+        result = store.rollup(args.field, args.window, args.start, args.end, args.node)
+        for row in zip(*(result[key].tolist() for key in ("window_start", "count", "min", "max", "mean"))):
+            print(json.dumps(dict(zip(("window_start", "count", "min", "max", "mean"), row))))
+
+
+if __name__ == "__main__":
+    main()
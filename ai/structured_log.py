@@ -0,0 +1,77 @@
+"""
+Structured logging for the fire detection service
+
+Status messages go through the standard logging module under the "fire"
+logger namespace. Each message carries an event name and typed fields, so
+the same call renders either as the familiar console line (text format) or
+as one JSON object per line for log collectors (json format):
+
+    {"ts": 1712345678.901, "level": "info", "logger": "fire.detection",
+     "event": "fire_detected", "msg": "🔥 FIRE DETECTED! Confidence: 92.00%",
+     "camera_url": "http://192.168.1.100/capture", "confidence": 0.92}
+"""
+
+import json
+import logging
+import sys
+
+ROOT_LOGGER = "fire"
+FORMATS = ("text", "json")
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "msg": record.getMessage().strip(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Just the message, as the console output has always looked"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger in the "fire" namespace (e.g. get_logger("uploads") -> fire.uploads)"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def log_event(logger: logging.Logger, event: str, message: str, level: int = logging.INFO, **fields):
+    """Log a message with an event name and structured fields"""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"event": event, "fields": fields})
+
+
+def configure_logging(fmt: str = "text", level: str = "INFO", stream=None) -> logging.Logger:
+    """
+    Send "fire.*" logs to stdout (or stream) in text or JSON format
+
+    Args:
+        fmt: "text" for console lines, "json" for one JSON object per line
+        level: Minimum level name (DEBUG, INFO, WARNING, ...)
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown log format '{fmt}'. Choose from: {', '.join(FORMATS)}")
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JSONFormatter() if fmt == "json" else TextFormatter())
+
+    root = logging.getLogger(ROOT_LOGGER)
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    root.propagate = False
+    return root
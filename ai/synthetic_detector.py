@@ -0,0 +1,141 @@
+"""
+Seeded synthetic fire detector for pipeline load tests
+
+detect_fire_mock decides by file name with unseeded randomness, and
+FireDetectionAI without a model returns (False, 0.0) for every frame, so
+neither exercises uploads and event writes at a known rate. SyntheticDetector
+ignores the image and draws verdicts and inference latencies from a seeded
+generator, so two runs with the same seed see the same sequence:
+
+- fire_rate: probability that a frame outside a burst is fire
+- bursts: each frame starts a burst with probability burst_rate; the next
+  burst_length frames are all fire (a sustained fire, so uploads and event
+  writes pile up the way they do in a real incident)
+- latency: per-frame inference time from a fixed, normal, lognormal or
+  exponential distribution, spent sleeping (like a GPU or a separate
+  process) or spinning the CPU (like in-process CPU inference)
+"""
+
+import math
+import random
+import threading
+import time
+from typing import List, Tuple
+
+LATENCY_DISTRIBUTIONS = ("fixed", "normal", "lognormal", "exponential")
+
+
+class SyntheticDetector:
+    def __init__(
+        self,
+        seed: int = 0,
+        fire_rate: float = 0.05,
+        latency_ms: float = 20.0,
+        latency_jitter_ms: float = 5.0,
+        latency_dist: str = "normal",
+        burst_rate: float = 0.0,
+        burst_length: int = 10,
+        cpu_bound: bool = False
+    ):
+        """
+        Initialize the detector
+
+        Args:
+            seed: Seed for verdicts, confidences and latencies
+            fire_rate: Probability that a frame outside a burst is fire
+            latency_ms: Mean inference latency per frame
+            latency_jitter_ms: Standard deviation for normal/lognormal latencies
+            latency_dist: fixed, normal, lognormal or exponential
+            burst_rate: Per-frame probability of starting a burst of fire frames
+            burst_length: Fire frames per burst
+            cpu_bound: Spin the CPU for the latency instead of sleeping
+        """
+        if latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{latency_dist}'. Choose from: {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        self.seed = seed
+        self.fire_rate = fire_rate
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.latency_dist = latency_dist
+        self.burst_rate = burst_rate
+        self.burst_length = burst_length
+        self.cpu_bound = cpu_bound
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._burst_left = 0
+
+        self.frames = 0
+        self.fire_frames = 0
+        self.bursts = 0
+        self.latency_total = 0.0
+
+    def _latency(self) -> float:
+        """Next latency in seconds (never negative)"""
+        mean, jitter = self.latency_ms, self.latency_jitter_ms
+        if self.latency_dist == "fixed" or mean <= 0:
+            ms = mean
+        elif self.latency_dist == "normal":
+            ms = self._rng.gauss(mean, jitter)
+        elif self.latency_dist == "lognormal":
+            # Parameters chosen so the distribution has the given mean and standard deviation
+            sigma2 = math.log(1 + (jitter / mean) ** 2)
+            ms = self._rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+        else:
+            ms = self._rng.expovariate(1 / mean)
+        return max(ms, 0.0) / 1000
+
+    def next(self) -> Tuple[bool, float, float]:
+        """
+        Draw the next frame's outcome without waiting
+
+        Returns:
+            (fire_detected, confidence, latency in seconds)
+        """
+        with self._lock:
+            if self._burst_left == 0 and self.burst_rate and self._rng.random() < self.burst_rate:
+                self._burst_left = self.burst_length
+                self.bursts += 1
+            if self._burst_left:
+                self._burst_left -= 1
+                fire = True
+            else:
+                fire = self._rng.random() < self.fire_rate
+            confidence = self._rng.uniform(0.6, 0.95) if fire else self._rng.uniform(0.0, 0.3)
+            latency = self._latency()
+            self.frames += 1
+            self.fire_frames += fire
+            self.latency_total += latency
+        return fire, round(confidence, 2), latency
+
+    def _wait(self, seconds: float):
+        if not self.cpu_bound:
+            time.sleep(seconds)
+            return
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+
+    def detect(self, image_bytes: bytes = b"") -> Tuple[bool, float]:
+        """Spend the drawn latency and return (fire_detected, confidence); the image is ignored"""
+        fire, confidence, latency = self.next()
+        self._wait(latency)
+        return fire, confidence
+
+    def detect_batch(self, images: List[bytes]) -> List[Tuple[bool, float]]:
+        """One verdict per image; the batch takes the sum of the frame latencies"""
+        outcomes = [self.next() for _ in images]
+        self._wait(sum(latency for _, _, latency in outcomes))
+        return [(fire, confidence) for fire, confidence, _ in outcomes]
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "frames": self.frames,
+                "fire_frames": self.fire_frames,
+                "fire_ratio": round(self.fire_frames / self.frames, 3) if self.frames else 0.0,
+                "bursts": self.bursts,
+                "avg_latency_ms": round(self.latency_total / self.frames * 1000, 2) if self.frames else 0.0,
+            }
@@ -0,0 +1,325 @@
+"""
+Spooled, parallel GCS uploads for fire evidence frames
+
+upload_to_gcs uploads synchronously and gives up on the first error, which
+leaves the DANGER event without its image. UploadManager writes each frame
+to a local spool directory first, uploads from the spool on a bounded pool
+of worker threads, and retries failures with exponential backoff. Spooled
+frames that are still on disk when the process stops are picked up again on
+the next start. Each spool entry carries a small JSON sidecar with the GCS
+object name and caller metadata (e.g. the Firestore event ID to patch).
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from structured_log import get_logger, log_event
+
+log = get_logger("uploads")
+
+UploadCallback = Callable[[str, str, dict], None]
+
+
+class _SpoolEntry:
+    def __init__(self, key: str, filename: str, size: int, metadata: dict, attempts: int = 0):
+        self.key = key              # Spool file stem
+        self.filename = filename    # GCS object name
+        self.size = size
+        self.metadata = metadata
+        self.attempts = attempts
+
+
+class UploadManager:
+    def __init__(
+        self,
+        bucket,
+        spool_dir: str,
+        workers: int = 4,
+        max_spool_bytes: int = 256 * 1024 * 1024,
+        max_spool_files: int = 1000,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        content_type: str = "image/jpeg",
+        on_uploaded: Optional[UploadCallback] = None
+    ):
+        """
+        Initialize the manager
+
+        Args:
+            bucket: google.cloud.storage Bucket (or local_fakes.FakeBucket)
+            spool_dir: Directory holding frames that are not uploaded yet
+            workers: Parallel upload threads
+            max_spool_bytes: Oldest queued frames are evicted beyond this size
+            max_spool_files: Oldest queued frames are evicted beyond this count
+            backoff: Delay before the first retry (seconds), doubled per attempt
+            max_backoff: Upper bound for the retry delay (seconds)
+            content_type: Content type of uploaded objects
+            on_uploaded: Called as on_uploaded(filename, url, metadata) once the
+                upload succeeded, from a worker thread
+        """
+        self.bucket = bucket
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = max(1, workers)
+        self.max_spool_bytes = max_spool_bytes
+        self.max_spool_files = max_spool_files
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.content_type = content_type
+        self.on_uploaded = on_uploaded
+
+        self._entries: Dict[str, _SpoolEntry] = {}
+        # (ready_at, seq, key): entries waiting for a worker, earliest first
+        self._ready: List[Tuple[float, int, str]] = []
+        self._in_flight: Dict[str, _SpoolEntry] = {}
+        self._done: Dict[str, Tuple[str, dict]] = {}   # filename -> (url, metadata)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+
+        self.spool_bytes = 0
+        self.queued = 0
+        self.resumed = 0
+        self.uploaded = 0
+        self.bytes_uploaded = 0
+        self.failed_attempts = 0
+        self.evicted = 0
+        self.upload_time = 0.0
+        self._started_at: Optional[float] = None
+
+        self._resume()
+
+    def url_for(self, filename: str) -> str:
+        return f"https://storage.googleapis.com/{self.bucket.name}/{filename}"
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.spool_dir / f"{key}.jpg", self.spool_dir / f"{key}.json"
+
+    def _write_sidecar(self, entry: _SpoolEntry):
+        _, meta_path = self._paths(entry.key)
+        tmp_path = meta_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "filename": entry.filename,
+                "metadata": entry.metadata,
+                "attempts": entry.attempts,
+            }, f)
+        os.replace(tmp_path, meta_path)
+
+    def _remove(self, entry: _SpoolEntry):
+        for path in self._paths(entry.key):
+            path.unlink(missing_ok=True)
+        self.spool_bytes -= entry.size
+
+    def _resume(self):
+        """Queue frames left in the spool by a previous run"""
+        for meta_path in sorted(self.spool_dir.glob("*.json")):
+            key = meta_path.stem
+            data_path, _ = self._paths(key)
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                size = data_path.stat().st_size
+            except (OSError, ValueError):
+                # Half-written entry from a crash; nothing to upload
+                data_path.unlink(missing_ok=True)
+                meta_path.unlink(missing_ok=True)
+                continue
+            entry = _SpoolEntry(key, meta["filename"], size, meta.get("metadata", {}), meta.get("attempts", 0))
+            self._entries[key] = entry
+            self.spool_bytes += size
+            heapq.heappush(self._ready, (0.0, next(self._seq), key))
+            self.resumed += 1
+        if self.resumed:
+            log_event(log, "uploads_resumed", f"⏳ Resuming {self.resumed} spooled upload(s) from {self.spool_dir}",
+                      count=self.resumed, spool_dir=str(self.spool_dir))
+
+    def start(self) -> "UploadManager":
+        with self._cond:
+            self._stopping = False
+        self._started_at = time.monotonic()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"upload-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Wait up to timeout seconds for queued uploads (and retries due before
+        then), then stop
+
+        Frames still waiting stay in the spool and are resumed by the next
+        UploadManager on the same directory.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while (self._in_flight or (self._ready and self._ready[0][0] < deadline)) \
+                    and time.monotonic() < deadline:
+                self._cond.wait(0.1)
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, image_bytes: bytes, filename: str, metadata: Optional[dict] = None) -> str:
+        """
+        Spool a frame for upload and return immediately
+
+        Returns:
+            The URL the object will have once uploaded
+        """
+        with self._cond:
+            key = f"{int(time.time() * 1000):013d}_{next(self._seq):06d}"
+            entry = _SpoolEntry(key, filename, len(image_bytes), dict(metadata or {}))
+            data_path, _ = self._paths(key)
+            with open(data_path, "wb") as f:
+                f.write(image_bytes)
+            # Sidecar last: an entry without one is treated as incomplete
+            self._write_sidecar(entry)
+
+            self._entries[key] = entry
+            self.spool_bytes += entry.size
+            self.queued += 1
+            heapq.heappush(self._ready, (0.0, next(self._seq), key))
+            self._enforce_limits()
+            self._cond.notify()
+        return self.url_for(filename)
+
+    def attach(self, filename: str, **metadata) -> bool:
+        """
+        Add metadata to a spooled frame, e.g. the event ID known only after submit
+
+        If the frame has already been uploaded, on_uploaded is called again
+        with the merged metadata so the caller can still act on it.
+
+        Returns:
+            False if the frame is unknown (evicted, or uploaded too long ago)
+        """
+        callback_args = None
+        with self._cond:
+            done = self._done.get(filename)
+            if done is not None:
+                url, done_metadata = done
+                done_metadata.update(metadata)
+                callback_args = (filename, url, dict(done_metadata))
+            else:
+                entry = next(
+                    (e for e in self._entries.values() if e.filename == filename),
+                    None
+                ) or next((e for e in self._in_flight.values() if e.filename == filename), None)
+                if entry is None:
+                    return False
+                entry.metadata.update(metadata)
+                self._write_sidecar(entry)
+
+        if callback_args and self.on_uploaded:
+            self.on_uploaded(*callback_args)
+        return True
+
+    def _enforce_limits(self):
+        """Evict the oldest queued frames while the spool is over its limits"""
+        while self._ready and (
+            self.spool_bytes > self.max_spool_bytes
+            or len(self._entries) + len(self._in_flight) > self.max_spool_files
+        ):
+            oldest = min(self._entries.values(), key=lambda e: e.key)
+            self._ready = [item for item in self._ready if item[2] != oldest.key]
+            heapq.heapify(self._ready)
+            del self._entries[oldest.key]
+            self._remove(oldest)
+            self.evicted += 1
+            log_event(log, "spool_evicted", f"⚠ Upload spool full, dropped {oldest.filename}",
+                      level=logging.WARNING, filename=oldest.filename)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    if self._ready:
+                        delay = self._ready[0][0] - time.monotonic()
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+                _, _, key = heapq.heappop(self._ready)
+                entry = self._entries.pop(key)
+                self._in_flight[key] = entry
+            self._upload(entry)
+
+    def _upload(self, entry: _SpoolEntry):
+        data_path, _ = self._paths(entry.key)
+        started = time.perf_counter()
+        try:
+            with open(data_path, "rb") as f:
+                image_bytes = f.read()
+            blob = self.bucket.blob(entry.filename)
+            blob.upload_from_string(image_bytes, content_type=self.content_type)
+        except Exception as e:
+            with self._cond:
+                self.failed_attempts += 1
+                entry.attempts += 1
+                delay = min(self.backoff * 2 ** (entry.attempts - 1), self.max_backoff)
+                del self._in_flight[entry.key]
+                self._entries[entry.key] = entry
+                heapq.heappush(self._ready, (time.monotonic() + delay, next(self._seq), entry.key))
+                try:
+                    self._write_sidecar(entry)
+                except OSError:
+                    pass
+                self._cond.notify_all()
+            log_event(log, "upload_retry",
+                      f"✗ Upload of {entry.filename} failed (attempt {entry.attempts}), retrying in {delay:.1f}s: {e}",
+                      level=logging.WARNING, filename=entry.filename, attempt=entry.attempts,
+                      retry_in_s=round(delay, 1), error=str(e))
+            return
+
+        url = self.url_for(entry.filename)
+        with self._cond:
+            self.upload_time += time.perf_counter() - started
+            self.uploaded += 1
+            self.bytes_uploaded += entry.size
+            del self._in_flight[entry.key]
+            self._remove(entry)
+            self._done[entry.filename] = (url, entry.metadata)
+            # Remember recent uploads only, for late attach() calls
+            while len(self._done) > 1000:
+                self._done.pop(next(iter(self._done)))
+            metadata = dict(entry.metadata)
+            self._cond.notify_all()
+        log_event(log, "image_uploaded", f"✓ Image uploaded to GCS: {url}", filename=entry.filename, url=url)
+
+        if self.on_uploaded:
+            try:
+                self.on_uploaded(entry.filename, url, metadata)
+            except Exception as e:
+                log_event(log, "upload_callback_failed", f"✗ Upload callback failed for {entry.filename}: {e}",
+                          level=logging.ERROR, filename=entry.filename, error=str(e))
+
+    def metrics(self) -> dict:
+        with self._cond:
+            elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+            return {
+                "queued": self.queued,
+                "resumed": self.resumed,
+                "uploaded": self.uploaded,
+                "failed_attempts": self.failed_attempts,
+                "evicted": self.evicted,
+                "pending": len(self._entries) + len(self._in_flight),
+                "spool_mb": round(self.spool_bytes / 1e6, 2),
+                "avg_upload_ms": round(self.upload_time / self.uploaded * 1000, 1) if self.uploaded else 0.0,
+                "uploads_per_s": round(self.uploaded / elapsed, 2) if elapsed else 0.0,
+                "mb_per_s": round(self.bytes_uploaded / 1e6 / elapsed, 3) if elapsed else 0.0,
+            }
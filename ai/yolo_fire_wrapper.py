@@ -5,74 +5,119 @@ Outputs JSON for Node.js integration
 
 Usage:
     python yolo_fire_wrapper.py <image_path> [--model <model_path>] [--conf <confidence>]
+    python yolo_fire_wrapper.py - < frame.jpg     (image bytes on stdin)
+    python yolo_fire_wrapper.py --serve [--socket <path>] [--model <model_path>]
 
 Output format:
     {"fire": true, "confidence": 0.92}
     or
     {"fire": false, "confidence": 0.0}
+
+Serve mode:
+    Loads the model once, runs --warmup dummy frames through it, and
+    answers one NDJSON request per line, either on stdin/stdout or on a
+    local Unix socket. Requests look like
+    {"id": 1, "image_path": "/tmp/fire-check.jpg"} (or "image_b64" with the
+    base64-encoded image bytes) and optionally carry "conf", "mock",
+    "brightness" and "tiled". Responses echo "id" next to "fire" and "confidence".
 """
 
+import os
+import io
 import sys
 import json
+import base64
+import binascii
 import argparse
+import importlib.util
+import socketserver
 from pathlib import Path
 
-# Try to import YOLO
-try:
-    from ultralytics import YOLO
-    YOLO_AVAILABLE = True
-except ImportError:
-    YOLO_AVAILABLE = False
+from result_cache import ResultCache, make_key
+
+# Check for YOLO without importing it: ultralytics pulls in torch, which
+# takes seconds. It is imported on first use in load_yolo_model(), so
+# --mock and --brightness runs start in milliseconds.
+YOLO_AVAILABLE = importlib.util.find_spec("ultralytics") is not None
+
+DEFAULT_MODEL = 'yolov8n.pt'  # Nano model for speed
 
+# Loaded models keyed by (path, backend, imgsz), so serve mode pays the load cost only once
+_MODEL_CACHE = {}
 
-def detect_fire_brightness(image_path: str, conf_threshold: float = 0.5, debug: bool = False):
+# Class names treated as fire (adjust based on your model's class names)
+FIRE_KEYWORDS = ['fire', 'flame', 'smoke', 'burn']
+
+
+def load_yolo_model(model_path: str = None, debug: bool = False,
+                    backend: str = 'torch', imgsz: int = 640):
+    """
+    Load a YOLO model, reusing an already loaded instance for the same path
+    
+    Falls back to the default YOLOv8n model when model_path is missing.
+    Non-torch backends export the model once and load the cached artifact.
+    """
+    if model_path and Path(model_path).exists():
+        key = model_path
+    else:
+        # Use default YOLOv8 model (you should replace with fire-trained model)
+        # For now, we'll use a general model and check for fire-like classes
+        key = DEFAULT_MODEL
+    
+    model = _MODEL_CACHE.get((key, backend, imgsz))
+    if model is None:
+        from model_backends import load_model
+        model = load_model(key, backend, imgsz)
+        _MODEL_CACHE[(key, backend, imgsz)] = model
+        if debug:
+            print(f"[DEBUG] Backend: {backend} (imgsz={imgsz})", file=sys.stderr)
+            if key == DEFAULT_MODEL:
+                print(f"[DEBUG] Using default YOLOv8n model (no fire classes)", file=sys.stderr)
+            else:
+                print(f"[DEBUG] Using custom model: {model_path}", file=sys.stderr)
+    return model
+
+
+def detect_fire_brightness(image, conf_threshold: float = 0.5, debug: bool = False,
+                           reduce: int = 1, reference: bool = False):
     """
     Simple fire detection based on bright spots (fallback method)
     Detects bright yellow/orange/white regions that could indicate fire/flame
     
+    Args:
+        image: Image file path, encoded image bytes, or decoded RGB array
+        reduce: Integer downscale factor applied while decoding (JPEG draft mode)
+        reference: Use the original float implementation instead of the uint8 one
+    
     Returns:
         dict: {"fire": bool, "confidence": float}
     """
     try:
-        from PIL import Image
-        import numpy as np
+        from image_decode import load_image
+        from fire_mask import count_fire_pixels, count_fire_pixels_reference, get_fire_mask
         
-        img = Image.open(image_path)
-        img_array = np.array(img)
+        img_array = load_image(image, reduce)
         
         if debug:
             print(f"[DEBUG] Image shape: {img_array.shape}", file=sys.stderr)
         
-        # Convert to HSV for better color detection
         if len(img_array.shape) == 3:
             # Simple brightness and color analysis
             # Fire characteristics: high red, moderate green, low blue, high brightness
-            r = img_array[:, :, 0].astype(float)
-            g = img_array[:, :, 1].astype(float)
-            b = img_array[:, :, 2].astype(float)
-            
-            # Calculate brightness
-            brightness = (r + g + b) / 3
-            
-            # More lenient fire detection:
-            # 1. Very bright spots (likely flame core) - white/yellow
-            very_bright = brightness > 200
-            
-            # 2. Fire-like colors: warm tones (red/orange/yellow)
-            warm_colors = (r > 100) & (r >= g) & (g >= b) & (brightness > 100)
-            
-            # Combine conditions
-            fire_mask = very_bright | warm_colors
+            if reference:
+                fire_pixels, total_pixels = count_fire_pixels_reference(img_array)
+            else:
+                fire_pixels, total_pixels = count_fire_pixels(img_array)
             
             # Calculate percentage of fire-like pixels
-            fire_pixels = np.sum(fire_mask)
-            total_pixels = fire_mask.size
             fire_ratio = fire_pixels / total_pixels
             
             if debug:
                 print(f"[DEBUG] Fire pixels: {fire_pixels} / {total_pixels} = {fire_ratio:.4f}", file=sys.stderr)
-                print(f"[DEBUG] Max brightness: {np.max(brightness):.1f}", file=sys.stderr)
-                print(f"[DEBUG] Max R: {np.max(r):.1f}, Max G: {np.max(g):.1f}, Max B: {np.max(b):.1f}", file=sys.stderr)
+                if not reference:
+                    print(f"[DEBUG] Max brightness: {get_fire_mask().brightness_sum().max() / 3:.1f}", file=sys.stderr)
+                max_r, max_g, max_b = img_array[:, :, :3].reshape(-1, 3).max(axis=0)
+                print(f"[DEBUG] Max R: {max_r:.1f}, Max G: {max_g:.1f}, Max B: {max_b:.1f}", file=sys.stderr)
             
             # If >0.3% of pixels look like fire, consider it detected (more lenient)
             if fire_ratio > 0.003:
@@ -94,15 +139,161 @@ def detect_fire_brightness(image_path: str, conf_threshold: float = 0.5, debug:
         return {"fire": False, "confidence": 0.0}
 
 
-def detect_fire_yolo(image_path: str, model_path: str = None, conf_threshold: float = 0.5, debug: bool = False):
+def _yolo_fire_confidence(result, names, debug: bool = False):
+    """
+    Scan one YOLO result for fire classes
+    
+    Returns:
+        tuple: (fire_detected: bool, max_confidence: float)
+    """
+    # Check for fire detection
+    # NOTE: Adjust this logic based on your fire detection model
+    # For a fire-trained model, class 0 might be 'fire'
+    # For general YOLOv8, we might look for 'fire', 'flame', etc.
+    fire_detected = False
+    max_confidence = 0.0
+    
+    boxes = result.boxes
+    if boxes is not None and len(boxes) > 0:
+        if debug:
+            print(f"[DEBUG] YOLO detected {len(boxes)} objects", file=sys.stderr)
+        for box in boxes:
+            # Get class name
+            cls_id = int(box.cls[0])
+            conf = float(box.conf[0])
+            cls_name = names[cls_id] if cls_id < len(names) else "unknown"
+            
+            if debug:
+                print(f"[DEBUG] Object: {cls_name} (confidence: {conf:.2f})", file=sys.stderr)
+            
+            # Check if this is a fire class
+            if any(keyword in cls_name.lower() for keyword in FIRE_KEYWORDS):
+                fire_detected = True
+                max_confidence = max(max_confidence, conf)
+    elif debug:
+        print(f"[DEBUG] YOLO detected no objects", file=sys.stderr)
+    
+    return fire_detected, max_confidence
+
+
+def _hybrid_result(fire_detected: bool, max_confidence: float, frame,
+                   conf_threshold: float = 0.5, debug: bool = False, brightness_reduce: int = 1):
+    """Combine a YOLO verdict with brightness detection on the same frame"""
+    # HYBRID APPROACH: Use both YOLO and brightness detection
+    # Take the higher confidence result
+    brightness_result = detect_fire_brightness(frame, conf_threshold, debug, brightness_reduce)
+    
+    if not fire_detected:
+        # YOLO found nothing, use brightness result
+        if debug:
+            print(f"[DEBUG] No fire classes in YOLO output, using brightness detection result", file=sys.stderr)
+        return brightness_result
+    else:
+        # YOLO found fire - use whichever has higher confidence
+        if brightness_result["fire"] and brightness_result["confidence"] > max_confidence:
+            if debug:
+                print(f"[DEBUG] Brightness detection has higher confidence ({brightness_result['confidence']} vs {max_confidence})", file=sys.stderr)
+            return brightness_result
+        else:
+            if debug:
+                print(f"[DEBUG] Using YOLO result (confidence: {max_confidence})", file=sys.stderr)
+            return {
+                "fire": fire_detected,
+                "confidence": round(max_confidence, 2)
+            }
+
+
+def detect_fire_yolo(image, model_path: str = None, conf_threshold: float = 0.5, debug: bool = False,
+                     brightness_reduce: int = 1, backend: str = 'torch', imgsz: int = 640,
+                     full_decode: bool = False):
     """
     Detect fire in image using YOLO model
     
     Args:
-        image_path: Path to image file
+        image: Image file path, encoded image bytes, or decoded RGB array
         model_path: Path to YOLO model file (optional)
         conf_threshold: Confidence threshold for detection
         debug: Enable debug output
+        brightness_reduce: Downscale factor for the brightness check
+        backend: Inference backend (torch, onnx, openvino, torchscript)
+        imgsz: Model input resolution
+        full_decode: Decode at full resolution instead of reduced JPEG scale down to imgsz
+    
+    Returns:
+        dict: {"fire": bool, "confidence": float}
+    """
+    return detect_fire_yolo_batch([image], model_path, conf_threshold, debug, brightness_reduce,
+                                  backend, imgsz, full_decode)[0]
+
+
+def detect_fire_yolo_batch(images, model_path: str = None, conf_threshold: float = 0.5, debug: bool = False,
+                           brightness_reduce: int = 1, backend: str = 'torch', imgsz: int = 640,
+                           full_decode: bool = False):
+    """
+    Detect fire in several images with a single batched YOLO call
+    
+    Args:
+        images: List of image file paths, encoded image bytes, or decoded RGB arrays
+        model_path: Path to YOLO model file (optional)
+        conf_threshold: Confidence threshold for detection
+        debug: Enable debug output
+        brightness_reduce: Downscale factor for the brightness check
+        backend: Inference backend (torch, onnx, openvino, torchscript)
+        imgsz: Model input resolution
+        full_decode: Decode at full resolution instead of reduced JPEG scale down to imgsz
+    
+    Returns:
+        list: One {"fire": bool, "confidence": float} dict per input image, in order
+    """
+    if not YOLO_AVAILABLE:
+        print(json.dumps({
+            "error": "YOLO not installed. Run: pip install ultralytics",
+            "fire": False,
+            "confidence": 0.0
+        }), file=sys.stderr)
+        return [{"fire": False, "confidence": 0.0} for _ in images]
+    
+    try:
+        # Load model (cached after the first call)
+        model = load_yolo_model(model_path, debug, backend, imgsz)
+        
+        # Decode once, at the smallest JPEG scale the model input allows;
+        # YOLO and brightness detection share the same arrays
+        from image_decode import load_image, rgb_to_bgr
+        frames = [load_image(image, target=None if full_decode else imgsz) for image in images]
+        
+        # Run inference (one result per frame, in input order)
+        results = model([rgb_to_bgr(frame) for frame in frames], conf=conf_threshold,
+                        imgsz=imgsz, verbose=False)
+        
+        return [
+            _hybrid_result(*_yolo_fire_confidence(result, model.names, debug), frame,
+                           conf_threshold, debug, brightness_reduce)
+            for frame, result in zip(frames, results)
+        ]
+    
+    except Exception as e:
+        print(json.dumps({
+            "error": str(e),
+            "fire": False,
+            "confidence": 0.0
+        }), file=sys.stderr)
+        return [{"fire": False, "confidence": 0.0} for _ in images]
+
+
+def detect_fire_yolo_tiled(image, model_path: str = None, conf_threshold: float = 0.5, debug: bool = False,
+                           brightness_reduce: int = 1, backend: str = 'torch', imgsz: int = 640,
+                           tile_reduce: int = 8, max_tiles: int = 4):
+    """
+    Detect fire with YOLO on native-resolution crops around fire-colored regions
+    
+    Small, distant flames survive because the crops are not downscaled, and
+    frames without fire-colored pixels skip the model entirely (see roi_tiling).
+    
+    Args:
+        image: Image file path, encoded image bytes, or decoded RGB array
+        tile_reduce: Subsampling step for the region proposal mask
+        max_tiles: Maximum crops run through the model per frame
     
     Returns:
         dict: {"fire": bool, "confidence": float}
@@ -116,74 +307,26 @@ def detect_fire_yolo(image_path: str, model_path: str = None, conf_threshold: fl
         return {"fire": False, "confidence": 0.0}
     
     try:
-        # Load model
-        if model_path and Path(model_path).exists():
-            model = YOLO(model_path)
-            if debug:
-                print(f"[DEBUG] Using custom model: {model_path}", file=sys.stderr)
-        else:
-            # Use default YOLOv8 model (you should replace with fire-trained model)
-            # For now, we'll use a general model and check for fire-like classes
-            model = YOLO('yolov8n.pt')  # Nano model for speed
-            if debug:
-                print(f"[DEBUG] Using default YOLOv8n model (no fire classes)", file=sys.stderr)
+        model = load_yolo_model(model_path, debug, backend, imgsz)
         
-        # Run inference
-        results = model(image_path, conf=conf_threshold, verbose=False)
+        from image_decode import load_image
+        from roi_tiling import detect_tiled
+        frame = load_image(image)
+        detections, crops = detect_tiled(model, frame, imgsz, tile_reduce, max_tiles,
+                                         conf=conf_threshold, verbose=False)
         
-        # Check for fire detection
-        # NOTE: Adjust this logic based on your fire detection model
-        # For a fire-trained model, class 0 might be 'fire'
-        # For general YOLOv8, we might look for 'fire', 'flame', etc.
+        if debug:
+            print(f"[DEBUG] Tiled: {len(crops)} crop(s) {crops}, {len(detections)} detection(s)", file=sys.stderr)
         
         fire_detected = False
         max_confidence = 0.0
+        for *_, conf, cls_id in detections:
+            cls_name = model.names[cls_id] if cls_id < len(model.names) else "unknown"
+            if any(keyword in cls_name.lower() for keyword in FIRE_KEYWORDS):
+                fire_detected = True
+                max_confidence = max(max_confidence, conf)
         
-        for result in results:
-            boxes = result.boxes
-            if boxes is not None and len(boxes) > 0:
-                if debug:
-                    print(f"[DEBUG] YOLO detected {len(boxes)} objects", file=sys.stderr)
-                for box in boxes:
-                    # Get class name
-                    cls_id = int(box.cls[0])
-                    conf = float(box.conf[0])
-                    cls_name = model.names[cls_id] if cls_id < len(model.names) else "unknown"
-                    
-                    if debug:
-                        print(f"[DEBUG] Object: {cls_name} (confidence: {conf:.2f})", file=sys.stderr)
-                    
-                    # Check if this is a fire class
-                    # Adjust based on your model's class names
-                    fire_keywords = ['fire', 'flame', 'smoke', 'burn']
-                    if any(keyword in cls_name.lower() for keyword in fire_keywords):
-                        fire_detected = True
-                        max_confidence = max(max_confidence, conf)
-            elif debug:
-                print(f"[DEBUG] YOLO detected no objects", file=sys.stderr)
-        
-        # HYBRID APPROACH: Use both YOLO and brightness detection
-        # Take the higher confidence result
-        brightness_result = detect_fire_brightness(image_path, conf_threshold, debug)
-        
-        if not fire_detected:
-            # YOLO found nothing, use brightness result
-            if debug:
-                print(f"[DEBUG] No fire classes in YOLO output, using brightness detection result", file=sys.stderr)
-            return brightness_result
-        else:
-            # YOLO found fire - use whichever has higher confidence
-            if brightness_result["fire"] and brightness_result["confidence"] > max_confidence:
-                if debug:
-                    print(f"[DEBUG] Brightness detection has higher confidence ({brightness_result['confidence']} vs {max_confidence})", file=sys.stderr)
-                return brightness_result
-            else:
-                if debug:
-                    print(f"[DEBUG] Using YOLO result (confidence: {max_confidence})", file=sys.stderr)
-                return {
-                    "fire": fire_detected,
-                    "confidence": round(max_confidence, 2)
-                }
+        return _hybrid_result(fire_detected, max_confidence, frame, conf_threshold, debug, brightness_reduce)
     
     except Exception as e:
         print(json.dumps({
@@ -194,16 +337,16 @@ def detect_fire_yolo(image_path: str, model_path: str = None, conf_threshold: fl
         return {"fire": False, "confidence": 0.0}
 
 
-def detect_fire_mock(image_path: str, conf_threshold: float = 0.5):
+def detect_fire_mock(image, conf_threshold: float = 0.5):
     """
     Mock fire detection for testing (when YOLO not available)
     Randomly detects fire based on filename or image characteristics
     """
     import random
     
-    # For testing: detect fire if 'fire' is in filename
-    path = Path(image_path)
-    if 'fire' in path.name.lower():
+    # For testing: detect fire if 'fire' is in filename (in-memory images have none)
+    name = Path(image).name.lower() if isinstance(image, (str, Path)) else ""
+    if 'fire' in name:
         return {
             "fire": True,
             "confidence": round(random.uniform(0.7, 0.95), 2)
@@ -215,34 +358,285 @@ def detect_fire_mock(image_path: str, conf_threshold: float = 0.5):
         }
 
 
+def detect(image, model_path: str = None, conf_threshold: float = 0.5,
+           mock: bool = False, debug: bool = False, brightness_reduce: int = 1,
+           brightness_only: bool = False, backend: str = 'torch', imgsz: int = 640,
+           tiled: bool = False, tile_reduce: int = 8, full_decode: bool = False):
+    """
+    Run the detection path selected by the CLI flags on a single image
+    
+    Args:
+        image: Image file path, or encoded image bytes already in memory
+    
+    Returns:
+        dict: {"fire": bool, "confidence": float}, plus "error" if the image is missing
+    """
+    if isinstance(image, str) and not Path(image).exists():
+        return {
+            "error": f"Image not found: {image}",
+            "fire": False,
+            "confidence": 0.0
+        }
+    if not isinstance(image, str) and len(image) == 0:
+        return {"error": "Empty image data", "fire": False, "confidence": 0.0}
+    
+    if mock:
+        return detect_fire_mock(image, conf_threshold)
+    if brightness_only:
+        return detect_fire_brightness(image, conf_threshold, debug, brightness_reduce)
+    if not YOLO_AVAILABLE:
+        return detect_fire_mock(image, conf_threshold)
+    if tiled:
+        return detect_fire_yolo_tiled(image, model_path, conf_threshold, debug, brightness_reduce,
+                                      backend, imgsz, tile_reduce)
+    return detect_fire_yolo(image, model_path, conf_threshold, debug, brightness_reduce, backend, imgsz,
+                            full_decode)
+
+
+def detect_cached(cache, image, model_path: str = None, conf_threshold: float = 0.5,
+                  mock: bool = False, debug: bool = False, brightness_reduce: int = 1,
+                  brightness_only: bool = False, backend: str = 'torch', imgsz: int = 640,
+                  tiled: bool = False, tile_reduce: int = 8, full_decode: bool = False):
+    """
+    detect() behind a content-addressed result cache
+    
+    Args:
+        cache: ResultCache, or None to always run detection
+        image: Image file path, or encoded image bytes already in memory
+    """
+    options = (model_path, conf_threshold, mock, debug, brightness_reduce, brightness_only, backend, imgsz,
+               tiled, tile_reduce, full_decode)
+    if cache is None:
+        return detect(image, *options)
+    
+    if isinstance(image, str):
+        try:
+            data = Path(image).read_bytes()
+        except OSError:
+            # Let detect() report the missing image
+            return detect(image, *options)
+    else:
+        data = bytes(image)
+    
+    mock = mock or not (brightness_only or YOLO_AVAILABLE)
+    if mock:
+        # Mock detection looks at the filename, so it is part of the key
+        mode = f"mock:{Path(image).name if isinstance(image, str) else ''}"
+    elif brightness_only:
+        mode = f"brightness:{brightness_reduce}"
+    else:
+        mode = f"yolo:{backend}:{imgsz}:{brightness_reduce}"
+        if tiled:
+            mode += f":tiled{tile_reduce}"
+        elif full_decode:
+            mode += ":full"
+    key = make_key(data, model_path, conf_threshold, mode)
+    
+    result = cache.get(key)
+    if result is not None:
+        if debug:
+            print(f"[DEBUG] Cache hit: {key}", file=sys.stderr)
+        return result
+    
+    # Reuse the bytes already read for hashing (mock needs the path)
+    result = detect(image if mock else data, *options)
+    if "error" not in result:
+        cache.put(key, result)
+    return result
+
+
+def build_cache(args):
+    """
+    Create the result cache selected by the CLI flags
+    
+    Serve mode always gets the in-memory LRU; one-shot runs only benefit
+    from the on-disk layer, so they use a cache only with --cache-dir.
+    """
+    if args.no_cache or (not args.serve and not args.cache_dir):
+        return None
+    return ResultCache(max_entries=args.cache_size, ttl=args.cache_ttl, disk_dir=args.cache_dir)
+
+
+def _answer_request(request: dict, args) -> dict:
+    """Run detection for one parsed serve request (may raise on bad fields)"""
+    image = request.get("image_path")
+    if image is not None and not isinstance(image, str):
+        raise ValueError("image_path must be a string")
+    if not image and request.get("image_b64"):
+        try:
+            image = base64.b64decode(request["image_b64"], validate=True)
+        except (binascii.Error, ValueError, TypeError) as e:
+            return {"error": f"Invalid image_b64: {e}", "fire": False, "confidence": 0.0}
+    elif not image:
+        return {"error": "Missing image_path or image_b64", "fire": False, "confidence": 0.0}
+    
+    return detect_cached(
+        args.cache,
+        image,
+        args.model,
+        float(request.get("conf", args.conf)),
+        bool(request.get("mock", args.mock)),
+        args.debug,
+        args.brightness_reduce,
+        bool(request.get("brightness", args.brightness)),
+        args.backend,
+        args.imgsz,
+        bool(request.get("tiled", args.tiled)),
+        args.tile_reduce,
+        args.full_decode
+    )
+
+
+def handle_request(line: str, args) -> dict:
+    """Answer one NDJSON serve request, using CLI flags as defaults"""
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+    except (ValueError, RecursionError) as e:
+        return {"error": f"Invalid request: {e}", "fire": False, "confidence": 0.0}
+    
+    try:
+        result = _answer_request(request, args)
+    except Exception as e:
+        # A bad field must not take the server down; answer it and keep serving
+        result = {"error": f"Invalid request: {e}", "fire": False, "confidence": 0.0}
+    
+    if "id" in request:
+        result = {"id": request["id"], **result}
+    return result
+
+
+def serve_stream(infile, outfile, args):
+    """Read NDJSON requests from infile and write one JSON response per line"""
+    for line in infile:
+        line = line.strip()
+        if not line:
+            continue
+        outfile.write(json.dumps(handle_request(line, args)) + "\n")
+        outfile.flush()
+
+
+def serve_socket(socket_path: str, args):
+    """Serve NDJSON requests on a local Unix socket, one connection at a time"""
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            infile = io.TextIOWrapper(self.rfile, encoding="utf-8")
+            outfile = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+            serve_stream(infile, outfile, args)
+    
+    # UnixStreamServer handles connections serially, so the model is never shared
+    with socketserver.UnixStreamServer(socket_path, RequestHandler) as server:
+        print(f"[SERVE] Listening on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(socket_path)
+
+
+def warmup(model, args):
+    """Run --warmup dummy frames at the decoded --warmup-size so the first request isn't slow"""
+    from image_decode import decoded_size
+    from model_backends import warmup_model
+    
+    size = tuple(int(v) for v in args.warmup_size.lower().split('x'))
+    width, height = decoded_size(size, None if args.full_decode or args.tiled else args.imgsz)
+    timings = warmup_model(model, args.imgsz, (height, width), args.warmup)
+    print(f"[SERVE] Warmed up on {width}x{height} frames: first call {timings[0] * 1000:.1f}ms, "
+          f"last {timings[-1] * 1000:.1f}ms ({len(timings)} calls)", file=sys.stderr)
+
+
+def serve(args):
+    """Keep the model warm and answer detection requests until EOF or Ctrl+C"""
+    if not (args.mock or args.brightness) and YOLO_AVAILABLE:
+        model = load_yolo_model(args.model, args.debug, args.backend, args.imgsz)
+        if args.warmup > 0:
+            warmup(model, args)
+    print("[SERVE] Model ready", file=sys.stderr)
+    
+    try:
+        if args.socket:
+            serve_socket(args.socket, args)
+        else:
+            serve_stream(sys.stdin, sys.stdout, args)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.cache is not None:
+            print(f"[SERVE] Cache: {json.dumps(args.cache.stats())}", file=sys.stderr)
+
+
 def main():
     parser = argparse.ArgumentParser(description='YOLO Fire Detection Wrapper')
-    parser.add_argument('image_path', help='Path to image file')
+    parser.add_argument('image_path', nargs='?', help='Path to image file, or - to read image bytes from stdin')
     parser.add_argument('--model', default=None, help='Path to YOLO model file')
     parser.add_argument('--conf', type=float, default=0.5, help='Confidence threshold')
     parser.add_argument('--mock', action='store_true', help='Use mock detection for testing')
+    parser.add_argument('--brightness', action='store_true',
+                        help='Use brightness detection only (no YOLO, no torch import)')
     parser.add_argument('--debug', action='store_true', help='Enable debug output')
+    parser.add_argument('--backend', default=os.getenv('YOLO_BACKEND', 'torch'),
+                        choices=['torch', 'onnx', 'openvino', 'torchscript'],
+                        help='Inference backend; non-torch backends export the model once and cache it')
+    parser.add_argument('--imgsz', type=int, default=640, help='Model input resolution')
+    parser.add_argument('--full-decode', action='store_true',
+                        help='Decode at full resolution instead of reduced JPEG scale down to --imgsz')
+    parser.add_argument('--tiled', action='store_true',
+                        help='Run YOLO only on native-resolution crops around fire-colored regions')
+    parser.add_argument('--tile-reduce', type=int, default=8,
+                        help='With --tiled, subsampling step for the region proposal mask')
+    parser.add_argument('--brightness-reduce', type=int, default=1,
+                        help='Run the brightness check on a frame downscaled by this factor')
+    parser.add_argument('--serve', action='store_true',
+                        help='Keep the model loaded and answer NDJSON requests on stdin')
+    parser.add_argument('--socket', default=None,
+                        help='With --serve, listen on this Unix socket path instead of stdin')
+    parser.add_argument('--cache-dir', default=os.getenv('YOLO_CACHE_DIR'),
+                        help='Persist results keyed by image content in this directory')
+    parser.add_argument('--cache-ttl', type=float, default=300.0,
+                        help='Seconds a cached result stays valid')
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help='Max results kept in the in-memory cache')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the result cache')
+    parser.add_argument('--threads', type=int, default=int(os.getenv('YOLO_THREADS', '0')),
+                        help='Intra-op inference threads (0 = one per core)')
+    parser.add_argument('--interop-threads', type=int, default=int(os.getenv('YOLO_INTEROP_THREADS', '0')),
+                        help='Inter-op inference threads (0 = library default)')
+    parser.add_argument('--warmup', type=int, default=3,
+                        help='With --serve, dummy inference calls after loading the model (0 = off)')
+    parser.add_argument('--warmup-size', default='800x600',
+                        help='With --serve, camera resolution (WxH) of the warmup frames')
     
     args = parser.parse_args()
+    args.cache = build_cache(args)
     
-    # Check if image exists
-    if not Path(args.image_path).exists():
-        result = {
-            "error": f"Image not found: {args.image_path}",
-            "fire": False,
-            "confidence": 0.0
-        }
-        print(json.dumps(result))
-        sys.exit(1)
+    if (args.threads or args.interop_threads) and not (args.mock or args.brightness):
+        # Before the first model load imports torch
+        from model_backends import configure_threads
+        threads = configure_threads(args.threads, args.interop_threads)
+        if args.debug:
+            print(f"[DEBUG] Inference threads: {json.dumps(threads)}", file=sys.stderr)
     
-    # Run detection
-    if args.mock or not YOLO_AVAILABLE:
-        result = detect_fire_mock(args.image_path, args.conf)
-    else:
-        result = detect_fire_yolo(args.image_path, args.model, args.conf, args.debug)
+    if args.serve:
+        serve(args)
+        sys.exit(0)
+    
+    if not args.image_path:
+        parser.error('image_path is required unless --serve is given')
+    
+    # Run detection ("-" reads the encoded image from stdin, no file needed)
+    image = sys.stdin.buffer.read() if args.image_path == '-' else args.image_path
+    result = detect_cached(args.cache, image, args.model, args.conf, args.mock, args.debug,
+                           args.brightness_reduce, args.brightness, args.backend, args.imgsz,
+                           args.tiled, args.tile_reduce, args.full_decode)
     
     # Output JSON
     print(json.dumps(result))
+    if "error" in result:
+        sys.exit(1)
     sys.exit(0 if result["fire"] else 0)  # Always exit 0 for valid JSON output
 
 
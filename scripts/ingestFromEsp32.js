@@ -13,7 +13,7 @@ import { getAuth, signInAnonymously } from 'firebase/auth'
 import { fileURLToPath } from 'url'
 import { dirname, join } from 'path'
 import { mkdir, appendFile, access } from 'fs/promises'
-import { exec as _exec } from 'child_process'
+import { exec as _exec, spawn } from 'child_process'
 import { promisify } from 'util'
 import * as dotenv from 'dotenv'
 import { GCSUploader } from './gcsUploader.js'
@@ -57,6 +57,11 @@ const WEBCAM_CMD = process.env.WEBCAM_CMD ||
 const YOLO_CMD = process.env.YOLO_CMD || 
   `python3 ${join(__dirname, '../ai/yolo_fire_wrapper.py')}`
 
+// Keep one YOLO wrapper process running (--serve) instead of spawning per image
+const YOLO_SERVE = process.env.YOLO_SERVE === '1'
+// Give up on a --serve request that gets no response within this time
+const YOLO_SERVE_TIMEOUT_MS = Number(process.env.YOLO_SERVE_TIMEOUT_MS || '30000')
+
 // Google Cloud Storage configuration
 const GCS_ENABLED = process.env.GCS_ENABLED === '1' || USE_WEBCAM
 const GCS_BUCKET = process.env.GCS_BUCKET || 'household-fire-images'
@@ -269,6 +274,86 @@ async function captureWebcam() {
   }
 }
 
+let yoloServer = null
+
+/**
+ * Start (once) a long-lived `YOLO_CMD --serve` process.
+ * Requests are NDJSON lines on stdin tagged with an `id`; each response
+ * echoes it back and resolves the matching request. Stdout lines that are
+ * not JSON, or carry an unknown id, are logged and skipped. A request with
+ * no response within YOLO_SERVE_TIMEOUT_MS is rejected; if the process dies
+ * or its pipes fail, every pending request is rejected and the next call
+ * starts a new server.
+ */
+function getYoloServer() {
+  if (yoloServer) return yoloServer
+
+  const child = spawn(`${YOLO_CMD} --serve`, { shell: true, stdio: ['pipe', 'pipe', 'inherit'] })
+  const pending = new Map()
+  let nextId = 1
+  let buffered = ''
+
+  child.stdout.setEncoding('utf-8')
+  child.stdout.on('data', (chunk) => {
+    buffered += chunk
+    let newline
+    while ((newline = buffered.indexOf('\n')) >= 0) {
+      const line = buffered.slice(0, newline).trim()
+      buffered = buffered.slice(newline + 1)
+      if (!line) continue
+      let response
+      try {
+        response = JSON.parse(line)
+      } catch {
+        console.error(`⚠️  Ignoring non-JSON YOLO server output: ${line.slice(0, 200)}`)
+        continue
+      }
+      const entry = response && pending.get(response.id)
+      if (!entry) {
+        console.error(`⚠️  Ignoring YOLO server response with unknown id: ${line.slice(0, 200)}`)
+        continue
+      }
+      pending.delete(response.id)
+      clearTimeout(entry.timer)
+      entry.resolve(response)
+    }
+  })
+
+  const server = {}
+  const fail = (error) => {
+    if (yoloServer === server) yoloServer = null
+    for (const entry of pending.values()) {
+      clearTimeout(entry.timer)
+      entry.reject(error)
+    }
+    pending.clear()
+  }
+  child.on('error', (error) => {
+    console.error(`⚠️  YOLO server failed: ${error.message}`)
+    fail(new Error(`YOLO server failed: ${error.message}`))
+  })
+  child.stdin.on('error', (error) => {
+    console.error(`⚠️  YOLO server stdin failed: ${error.message}`)
+    fail(new Error(`YOLO server stdin failed: ${error.message}`))
+  })
+  child.on('exit', (code) => {
+    console.error(`⚠️  YOLO server exited (code ${code})`)
+    fail(new Error('YOLO server exited'))
+  })
+
+  server.request = (imagePath) => new Promise((resolve, reject) => {
+    const id = nextId++
+    const timer = setTimeout(() => {
+      pending.delete(id)
+      reject(new Error(`YOLO server timed out after ${YOLO_SERVE_TIMEOUT_MS}ms`))
+    }, YOLO_SERVE_TIMEOUT_MS)
+    pending.set(id, { resolve, reject, timer })
+    child.stdin.write(`${JSON.stringify({ id, image_path: imagePath })}\n`)
+  })
+  yoloServer = server
+  return yoloServer
+}
+
 /**
  * Run YOLO (or any classifier) on the captured image.
  * Expect YOLO_CMD to output JSON like: {"fire":true,"confidence":0.87}
@@ -276,8 +361,10 @@ async function captureWebcam() {
 async function runYoloOnImage(imagePath) {
   if (!YOLO_CMD) return { fire: false, confidence: 0 }
   try {
-    const { stdout } = await exec(`${YOLO_CMD} "${imagePath}"`)
-    const parsed = JSON.parse(stdout.trim())
+    const parsed = YOLO_SERVE
+      ? await getYoloServer().request(imagePath)
+      : JSON.parse((await exec(`${YOLO_CMD} "${imagePath}"`)).stdout.trim())
+    if (parsed.error) console.error('YOLO error:', parsed.error)
     return {
       fire: !!parsed.fire,
       confidence: Number(parsed.confidence) || 0,